@@ -0,0 +1 @@
+"""Offline benchmarks for the Obi EnergyTracker integration."""
@@ -0,0 +1,240 @@
+"""Benchmark the API client against the fake backend.
+
+Measures the latency of the login, meter and hourly requests, the throughput
+of concurrent requests for all devices, the connections opened by the
+integration's transport compared to a new session per request, and the
+memory allocated while fetching and parsing the hourly history, parsed at
+once and while it streams in.
+
+    python -m benchmarks.bench_api --days 30 --devices 4 --output api.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+import time
+from typing import Any
+
+from aiohttp import ClientSession
+
+from .fake_backend import BRIDGE_ID, FakeObiBackend
+from .hass_harness import patched_backend
+from .results import BenchmarkResults, async_trace_memory, summarize
+
+# isort: split
+# custom_components is importable once hass_harness extended sys.path
+from custom_components.obi_energy_tracker.api import (
+    RESPONSE_CACHE_TTL,
+    ObiEnergyTrackerAPI,
+)
+from custom_components.obi_energy_tracker.models import (
+    HourlySeries,
+    ObiDevice,
+    parse_hourly_records,
+)
+from custom_components.obi_energy_tracker.transport import (
+    ObiTransport,
+    TransportMetrics,
+)
+
+
+async def _async_sample(
+    rounds: int, target: Callable[[], Awaitable[Any]]
+) -> tuple[list[float], int]:
+    """Await target() rounds times, return the durations and the failures."""
+    samples: list[float] = []
+    failures = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        if await target() in (None, False):
+            failures += 1
+        samples.append(time.perf_counter() - start)
+    return samples, failures
+
+
+async def async_main(args: argparse.Namespace) -> BenchmarkResults:
+    """Run the benchmark."""
+    backend = FakeObiBackend(
+        latency=args.latency,
+        history_days=max(args.days, *args.memory_days),
+        devices=args.devices,
+        error_rate=args.error_rate,
+    )
+    results = BenchmarkResults("bench_api", vars(args) | {"output": None})
+    await backend.start()
+    try:
+        with patched_backend(backend):
+            async with ClientSession() as session:
+                await _async_run(args, backend, session, results)
+    finally:
+        await backend.stop()
+    return results
+
+
+async def _async_run(
+    args: argparse.Namespace,
+    backend: FakeObiBackend,
+    session: ClientSession,
+    results: BenchmarkResults,
+) -> None:
+    """Run the scenarios."""
+    api = ObiEnergyTrackerAPI(
+        session,
+        "bench@example.com",
+        "secret",
+        max_connections=args.max_connections,
+    )
+    # Every sample is sent to the backend, the cache is only used for the
+    # burst of identical requests
+    api.response_cache.ttl = 0
+    devices = [ObiDevice(BRIDGE_ID, device_id) for device_id in backend.device_ids]
+    end = datetime.now(UTC)
+    start = end - timedelta(days=args.days)
+
+    async def login() -> bool:
+        api.token = None
+        return await api.async_login()
+
+    samples, failures = await _async_sample(args.rounds, login)
+    results.add("login", latency=summarize(samples), failures=failures)
+
+    for name, target in (
+        ("meter", lambda: api.async_get_meter_data(devices[0])),
+        (
+            f"hourly_{args.days}d",
+            lambda: api.async_get_hourly_range(start, end, devices[0]),
+        ),
+    ):
+        backend.reset_counters()
+        samples, failures = await _async_sample(args.rounds, target)
+        results.add(
+            name,
+            latency=summarize(samples),
+            failures=failures,
+            response_kib=round(backend.bytes_sent / args.rounds / 1024, 1),
+        )
+
+    async def fetch_and_parse(start: datetime) -> HourlySeries | None:
+        if (
+            payload := await api.async_get_hourly_range(start, end, devices[0])
+        ) is None:
+            return None
+        return HourlySeries.from_records(parse_hourly_records(payload))
+
+    async def fetch_streamed(start: datetime) -> HourlySeries | None:
+        return await api.async_get_hourly_series(start, end, devices[0])
+
+    # The whole response parsed at once vs. parsed while it streams in
+    for days in sorted({args.days, *args.memory_days}):
+        for name, target in (("full", fetch_and_parse), ("streamed", fetch_streamed)):
+            async with async_trace_memory() as usage:
+                series = await target(end - timedelta(days=days))
+            results.add(
+                f"hourly_{days}d_{name}",
+                memory=usage.as_dict(),
+                records=len(series) if series is not None else None,
+            )
+
+    # Login and a meter request, e.g. a config flow submit: on a new session
+    # every time vs. on the transport keeping its connections alive
+    transport = ObiTransport()
+    adhoc_metrics = TransportMetrics()
+
+    async def on_new_session() -> bool:
+        async with ClientSession(
+            trace_configs=[adhoc_metrics.trace_config()]
+        ) as new_session:
+            return await _async_login_and_fetch(new_session, devices[0])
+
+    async def on_transport() -> bool:
+        return await _async_login_and_fetch(transport.session, devices[0])
+
+    try:
+        for name, target, metrics in (
+            ("new_session", on_new_session, adhoc_metrics),
+            ("transport", on_transport, transport.metrics),
+        ):
+            samples, failures = await _async_sample(args.rounds, target)
+            results.add(
+                f"connections_{name}",
+                latency=summarize(samples),
+                failures=failures,
+                **metrics.as_dict(),
+            )
+    finally:
+        await transport.async_close()
+
+    # Meter and the last day of hourly data of every device, all at once and
+    # twice in a row: identical requests share one backend request, the
+    # repeated burst is answered from the response cache
+    api.response_cache.ttl = RESPONSE_CACHE_TTL
+    day_start = end - timedelta(days=1)
+    for name in ("concurrent", "concurrent_repeated"):
+        backend.reset_counters()
+        cache = api.response_cache.as_dict()
+        batch_start = time.perf_counter()
+        responses = await asyncio.gather(
+            *(
+                request
+                for _ in range(args.rounds)
+                for device in devices
+                for request in (
+                    api.async_get_meter_data(device),
+                    api.async_get_hourly_range(day_start, end, device),
+                )
+            )
+        )
+        elapsed = time.perf_counter() - batch_start
+        results.add(
+            name,
+            requests=len(responses),
+            failures=sum(response is None for response in responses),
+            backend_requests=len(backend.requests),
+            backend_errors=backend.errors,
+            coalesced=api.response_cache.coalesced - cache["coalesced"],
+            cache_hits=api.response_cache.hits - cache["hits"],
+            seconds=round(elapsed, 3),
+            requests_per_second=round(len(responses) / elapsed, 1),
+            circuit_breaker=api.circuit_breaker.state,
+        )
+
+
+async def _async_login_and_fetch(session: ClientSession, device: ObiDevice) -> bool:
+    """Log in with a new client and fetch the meter data of a device."""
+    api = ObiEnergyTrackerAPI(session, "bench@example.com", "secret")
+    return await api.async_login() and (
+        await api.async_get_meter_data(device) is not None
+    )
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--devices", type=int, default=1)
+    parser.add_argument(
+        "--memory-days",
+        type=int,
+        nargs="+",
+        default=[7, 90, 365],
+        help="days of history fetched while tracing memory",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-connections", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--output", type=Path, help="write JSON results here")
+    args = parser.parse_args()
+
+    results = asyncio.run(async_main(args))
+    results.print()
+    if args.output:
+        results.write(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Benchmark the fleet poller against the fake backend.
+
+Polls many accounts once with the headless fleet poller, first with an
+empty state (login, device lookup, meter and hourly history) and then
+again with the tokens and devices known, writing to a SQLite database and
+to a JSON lines file. Reports the throughput in accounts per minute, the
+requests and connections it took and how long the rate limits held
+requests back.
+
+    python -m benchmarks.bench_fleet --accounts 200 --rate 50 --output fleet.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import timedelta
+from pathlib import Path
+import shutil
+import tempfile
+import time
+
+from .fake_backend import FakeObiBackend
+from .hass_harness import patched_backend
+from .results import BenchmarkResults
+
+# isort: split
+# custom_components is importable once hass_harness extended sys.path
+from custom_components.obi_energy_tracker.transport import ObiTransport
+from fleet.accounts import FleetAccount
+from fleet.poller import DEFAULT_ACCOUNT_RATE, DEFAULT_RATE, FleetPoller
+from fleet.sinks import open_sink
+
+SINKS = {"sqlite": "fleet.sqlite", "jsonl": "fleet.jsonl"}
+
+
+async def _async_poll(
+    results: BenchmarkResults,
+    scenario: str,
+    poller: FleetPoller,
+    backend: FakeObiBackend,
+) -> None:
+    """Poll all accounts once and add the throughput to the results."""
+    backend.reset_counters()
+    requests_before = poller.as_dict()["requests"]
+    waited_before = poller.limiter.waited
+    start = time.perf_counter()
+    polled = await poller.async_poll_once()
+    elapsed = time.perf_counter() - start
+    state = poller.as_dict()
+    results.add(
+        scenario,
+        accounts=len(poller.accounts),
+        polled=polled,
+        duration_s=round(elapsed, 3),
+        accounts_per_minute=round(len(poller.accounts) / elapsed * 60, 1),
+        requests=state["requests"] - requests_before,
+        backend_requests=len(backend.requests),
+        rate_limit_waited_s=round(poller.limiter.waited - waited_before, 3),
+        connections_created=state["transport"]["connections_created"],
+    )
+
+
+async def async_main(args: argparse.Namespace) -> BenchmarkResults:
+    """Run the benchmark."""
+    backend = FakeObiBackend(
+        latency=args.latency,
+        history_days=args.days,
+        devices=args.devices,
+        error_rate=args.error_rate,
+    )
+    results = BenchmarkResults("bench_fleet", vars(args) | {"output": None})
+    accounts = [
+        FleetAccount(f"account{index}@example.com", "secret")
+        for index in range(args.accounts)
+    ]
+    await backend.start()
+    sink_dir = Path(tempfile.mkdtemp(prefix="obi-bench-"))
+    try:
+        with patched_backend(backend):
+            for sink_name, file_name in SINKS.items():
+                sink = open_sink(sink_dir / file_name)
+                transport = ObiTransport(
+                    limit=args.connections, limit_per_host=args.connections
+                )
+                poller = FleetPoller(
+                    accounts,
+                    sink,
+                    transport,
+                    rate=args.rate,
+                    account_rate=args.account_rate,
+                    history=timedelta(hours=args.history_hours),
+                )
+                try:
+                    await _async_poll(
+                        results, f"first_poll_{sink_name}", poller, backend
+                    )
+                    await _async_poll(
+                        results, f"next_poll_{sink_name}", poller, backend
+                    )
+                finally:
+                    await sink.async_close()
+                    await transport.async_close()
+                results.add(
+                    f"next_poll_{sink_name}",
+                    hourly_rows=sink.hourly_rows,
+                    meter_rows=sink.meter_rows,
+                    file_kib=round((sink_dir / file_name).stat().st_size / 1024, 1),
+                )
+    finally:
+        await backend.stop()
+        shutil.rmtree(sink_dir, ignore_errors=True)
+    return results
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE)
+    parser.add_argument("--account-rate", type=float, default=DEFAULT_ACCOUNT_RATE)
+    parser.add_argument("--connections", type=int, default=20)
+    parser.add_argument("--history-hours", type=int, default=24)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--devices", type=int, default=1)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--output", type=Path, help="write JSON results here")
+    args = parser.parse_args()
+
+    results = asyncio.run(async_main(args))
+    results.print()
+    if args.output:
+        results.write(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Benchmark the import time of the integration.
+
+Imports the integration in fresh interpreters with ``-X importtime``, after
+the Home Assistant modules a running instance has loaded anyway, and
+reports the time of the integration package and of the modules it pulls
+in on top.
+
+    python -m benchmarks.bench_import --rounds 10 --output import.json
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import defaultdict
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+
+from .results import BenchmarkResults, summarize
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "custom_components.obi_energy_tracker"
+
+# Loaded by Home Assistant before it sets up a config entry of the integration
+PRELOADED = (
+    "homeassistant.config_entries",
+    "homeassistant.helpers.aiohttp_client",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.components.recorder",
+    "homeassistant.components.recorder.statistics",
+    "homeassistant.components.sensor",
+    "homeassistant.components.button",
+)
+
+# Modules reported individually, by cumulative import time
+TOP_MODULES = 10
+
+
+def _import_times(preload: bool) -> dict[str, tuple[int, int]]:
+    """Import the integration once, return self and cumulative µs by module."""
+    code = f"import {PACKAGE}"
+    if preload:
+        code = f"import {', '.join(PRELOADED)}\n{code}"
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        cwd=REPO_ROOT,
+        text=True,
+    ).stderr
+
+    # The package is listed after everything it imported, at the outermost
+    # level; collect the lines from the last outermost module before it
+    lines = [
+        line.removeprefix("import time:").split("|")
+        for line in stderr.splitlines()
+        if line.startswith("import time:") and "self [us]" not in line
+    ]
+    end = next(index for index, line in enumerate(lines) if line[2].strip() == PACKAGE)
+    start = end
+    while start > 0 and lines[start - 1][2].startswith("  "):
+        start -= 1
+    return {
+        line[2].strip(): (int(line[0]), int(line[1])) for line in lines[start : end + 1]
+    }
+
+
+def _measure(rounds: int, preload: bool) -> dict[str, object]:
+    """Return the import time statistics of a scenario."""
+    total: list[float] = []
+    own: list[float] = []
+    modules: dict[str, list[int]] = defaultdict(list)
+    for _ in range(rounds):
+        times = _import_times(preload)
+        total.append(times[PACKAGE][1] / 1e6)
+        own.append(
+            sum(
+                self_us
+                for name, (self_us, _) in times.items()
+                if name.startswith(PACKAGE)
+            )
+            / 1e6
+        )
+        for name, (_, cumulative) in times.items():
+            if name != PACKAGE:
+                modules[name].append(cumulative)
+
+    top = sorted(
+        modules.items(), key=lambda item: statistics.median(item[1]), reverse=True
+    )[:TOP_MODULES]
+    return {
+        "total": summarize(total),
+        "integration_modules": summarize(own),
+        "modules_imported": len(modules),
+        "slowest_ms": {
+            name: round(statistics.median(samples) / 1000, 2) for name, samples in top
+        },
+    }
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="write JSON results here")
+    args = parser.parse_args()
+
+    results = BenchmarkResults("bench_import", {"rounds": args.rounds})
+    # Without Home Assistant loaded, the integration pays for its imports
+    results.add("cold", **_measure(args.rounds, preload=False))
+    results.add("hass_loaded", **_measure(args.rounds, preload=True))
+    results.print()
+    if args.output:
+        results.write(args.output)
+
+
+if __name__ == "__main__":
+    main()
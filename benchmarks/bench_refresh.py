@@ -0,0 +1,182 @@
+"""Benchmark coordinator refreshes against the fake backend.
+
+Measures the initial refresh of the hourly history (nothing held yet, the
+whole retained history is fetched for every device), the incremental
+refreshes that follow and the much more frequent refreshes of the meter
+readings, including the requests and bytes they cost and the memory they
+allocate.
+
+    python -m benchmarks.bench_refresh --devices 4 --days 30 --output refresh.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+import shutil
+import tempfile
+import time
+
+from aiohttp import ClientSession
+
+from homeassistant.core import HomeAssistant
+
+from .fake_backend import FakeObiBackend
+from .hass_harness import async_running_hass, make_config_entry, patched_backend
+from .results import BenchmarkResults, async_trace_memory, summarize
+
+# isort: split
+# custom_components is importable once hass_harness extended sys.path
+from custom_components.obi_energy_tracker.api import ObiEnergyTrackerAPI
+from custom_components.obi_energy_tracker.coordinator import (
+    ObiEnergyTrackerCoordinator,
+    ObiMeterCoordinator,
+    ObiTierCoordinator,
+)
+from custom_components.obi_energy_tracker.models import ObiDevice
+
+
+def _make_coordinator(
+    hass: HomeAssistant, session: ClientSession, args: argparse.Namespace
+) -> ObiEnergyTrackerCoordinator:
+    """Return an hourly coordinator for the fake account without any data."""
+    entry = make_config_entry(device_count=args.devices)
+    api = ObiEnergyTrackerAPI(
+        session,
+        entry.data["email"],
+        entry.data["password"],
+        max_connections=args.max_connections,
+    )
+    # Refreshes follow each other much faster than real polls, they must not
+    # be answered from the response cache
+    api.response_cache.ttl = 0
+    devices = [ObiDevice.from_dict(device) for device in entry.data["devices"]]
+    return ObiEnergyTrackerCoordinator(hass, api, entry, devices)
+
+
+async def _async_refresh(
+    hass: HomeAssistant,
+    coordinator: ObiTierCoordinator,
+    backend: FakeObiBackend,
+) -> tuple[float, int, int]:
+    """Run one refresh.
+
+    Returns how long it took in seconds and the requests and bytes the
+    backend served for it. The statistics import started by the refresh runs
+    in the background and is waited for outside of the measurement.
+    """
+    backend.reset_counters()
+    start = time.perf_counter()
+    await coordinator._async_update_data()  # noqa: SLF001
+    elapsed = time.perf_counter() - start
+    requests, bytes_sent = len(backend.requests), backend.bytes_sent
+    await hass.async_block_till_done(wait_background_tasks=True)
+    return elapsed, requests, bytes_sent
+
+
+def _add_refreshes(
+    results: BenchmarkResults,
+    scenario: str,
+    refreshes: list[tuple[float, int, int]],
+) -> None:
+    """Add the latency and traffic of refreshes to the results."""
+    results.add(
+        scenario,
+        latency=summarize([refresh[0] for refresh in refreshes]),
+        requests=sum(refresh[1] for refresh in refreshes) / len(refreshes),
+        response_kib=round(
+            sum(refresh[2] for refresh in refreshes) / len(refreshes) / 1024, 1
+        ),
+    )
+
+
+async def async_main(args: argparse.Namespace) -> BenchmarkResults:
+    """Run the benchmark."""
+    backend = FakeObiBackend(
+        latency=args.latency,
+        history_days=args.days,
+        devices=args.devices,
+        error_rate=args.error_rate,
+    )
+    results = BenchmarkResults("bench_refresh", vars(args) | {"output": None})
+    await backend.start()
+    config_dir = Path(tempfile.mkdtemp(prefix="obi-bench-"))
+    try:
+        with patched_backend(backend):
+            async with (
+                async_running_hass(config_dir) as hass,
+                ClientSession() as session,
+            ):
+                await _async_run(hass, session, args, backend, results)
+    finally:
+        await backend.stop()
+        shutil.rmtree(config_dir, ignore_errors=True)
+    return results
+
+
+async def _async_run(
+    hass: HomeAssistant,
+    session: ClientSession,
+    args: argparse.Namespace,
+    backend: FakeObiBackend,
+    results: BenchmarkResults,
+) -> None:
+    """Run the scenarios."""
+    initial = []
+    for _ in range(args.rounds):
+        coordinator = _make_coordinator(hass, session, args)
+        await coordinator.api.async_login()
+        initial.append(await _async_refresh(hass, coordinator, backend))
+    _add_refreshes(results, "initial_refresh", initial)
+
+    coordinator = _make_coordinator(hass, session, args)
+    await coordinator.api.async_login()
+    async with async_trace_memory() as usage:
+        await coordinator._async_update_data()  # noqa: SLF001
+    await hass.async_block_till_done(wait_background_tasks=True)
+    results.add(
+        "initial_refresh",
+        hourly_records=sum(len(data.hourly) for data in coordinator.devices.values()),
+        memory=usage.as_dict(),
+    )
+
+    incremental = [
+        await _async_refresh(hass, coordinator, backend) for _ in range(args.rounds)
+    ]
+    _add_refreshes(results, "incremental_refresh", incremental)
+    async with async_trace_memory() as usage:
+        await coordinator._async_update_data()  # noqa: SLF001
+    results.add("incremental_refresh", memory=usage.as_dict())
+
+    meter_coordinator = ObiMeterCoordinator(hass, coordinator)
+    meter = [
+        await _async_refresh(hass, meter_coordinator, backend)
+        for _ in range(args.rounds)
+    ]
+    _add_refreshes(results, "meter_refresh", meter)
+    async with async_trace_memory() as usage:
+        await meter_coordinator._async_update_data()  # noqa: SLF001
+    results.add("meter_refresh", memory=usage.as_dict())
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--devices", type=int, default=1)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-connections", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="write JSON results here")
+    args = parser.parse_args()
+
+    results = asyncio.run(async_main(args))
+    results.print()
+    if args.output:
+        results.write(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Replay a recorded cassette through the meter and hourly coordinators.
+
+Reproduces the traffic of a real installation offline: the cassette is
+recorded by configuring the integration with
+
+    obi_energy_tracker:
+      cassette:
+        path: obi_cassette.json
+
+and replayed at the given speed (recorded response times divided by it,
+0 answers right away):
+
+    python -m benchmarks.bench_replay obi_cassette.json --speed 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+import shutil
+import tempfile
+import time
+from typing import cast
+
+from aiohttp import ClientSession
+
+from .hass_harness import async_running_hass, make_config_entry
+from .results import BenchmarkResults, async_trace_memory, summarize
+
+# isort: split
+# custom_components is importable once hass_harness extended sys.path
+from custom_components.obi_energy_tracker.api import ObiEnergyTrackerAPI
+from custom_components.obi_energy_tracker.cassette import ReplaySession
+from custom_components.obi_energy_tracker.const import CONF_DEVICES
+from custom_components.obi_energy_tracker.coordinator import (
+    ObiEnergyTrackerCoordinator,
+    ObiMeterCoordinator,
+)
+
+
+async def async_main(args: argparse.Namespace) -> BenchmarkResults:
+    """Run the benchmark."""
+    results = BenchmarkResults(
+        "bench_replay", vars(args) | {"cassette": str(args.cassette), "output": None}
+    )
+    session = cast(ClientSession, ReplaySession.load(args.cassette, args.speed))
+    config_dir = Path(tempfile.mkdtemp(prefix="obi-bench-"))
+    try:
+        async with async_running_hass(config_dir) as hass:
+            api = ObiEnergyTrackerAPI(session, "replay", "replay")
+            # Refreshes follow each other much faster than real polls, they
+            # must not be answered from the response cache
+            api.response_cache.ttl = 0
+            if not (devices := await api.async_get_devices()):
+                raise SystemExit("The cassette holds no user info with devices")
+            entry = make_config_entry(
+                **{CONF_DEVICES: [device.as_dict() for device in devices]}
+            )
+            coordinator = ObiEnergyTrackerCoordinator(hass, api, entry, devices)
+            meter_coordinator = ObiMeterCoordinator(hass, coordinator)
+
+            samples: list[float] = []
+            for _ in range(args.refreshes):
+                start = time.perf_counter()
+                await asyncio.gather(
+                    coordinator._async_update_data(),  # noqa: SLF001
+                    meter_coordinator._async_update_data(),  # noqa: SLF001
+                )
+                samples.append(time.perf_counter() - start)
+                await hass.async_block_till_done(wait_background_tasks=True)
+            async with async_trace_memory() as usage:
+                await asyncio.gather(
+                    coordinator._async_update_data(),  # noqa: SLF001
+                    meter_coordinator._async_update_data(),  # noqa: SLF001
+                )
+            await hass.async_block_till_done(wait_background_tasks=True)
+    finally:
+        shutil.rmtree(config_dir, ignore_errors=True)
+
+    results.add(
+        "refresh",
+        devices=len(devices),
+        latency=summarize(samples),
+        hourly_records=sum(len(data.hourly) for data in coordinator.devices.values()),
+        memory=usage.as_dict(),
+    )
+    return results
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cassette", type=Path)
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--refreshes", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="write JSON results here")
+    args = parser.parse_args()
+
+    results = asyncio.run(async_main(args))
+    results.print()
+    if args.output:
+        results.write(args.output)
+
+
+if __name__ == "__main__":
+    main()
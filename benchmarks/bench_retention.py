@@ -0,0 +1,124 @@
+"""Benchmark the tiered retention of the energy history.
+
+Feeds years of hourly records into the history of a device, one day per
+step as the coordinator would, and reports after every simulated year how
+many records the tiers hold and whether the totals of the current periods
+still match the sum of their hours, and in the end the memory retained.
+
+    python -m benchmarks.bench_retention --years 5 --output retention.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import UTC, datetime, timedelta
+import math
+from pathlib import Path
+import random
+import time
+
+from homeassistant.util import dt as dt_util
+
+from . import hass_harness  # noqa: F401
+from .results import BenchmarkResults, async_trace_memory, summarize
+
+# isort: split
+# custom_components is importable once hass_harness extended sys.path
+from custom_components.obi_energy_tracker.const import (
+    DEFAULT_DAILY_RETENTION,
+    DEFAULT_HOURLY_RETENTION,
+    DEFAULT_MONTHLY_RETENTION,
+)
+from custom_components.obi_energy_tracker.consumption import period_starts
+from custom_components.obi_energy_tracker.retention import (
+    EnergyHistory,
+    RetentionPolicy,
+)
+
+
+# Covers the longest of the current periods, the month
+CHECKED_DAYS = timedelta(days=32)
+
+
+def _day_records(
+    day_start: datetime, rng: random.Random
+) -> dict[datetime, dict[str, float]]:
+    """Return the hourly records of a day."""
+    return {
+        day_start + timedelta(hours=hour): {
+            "energy": rng.uniform(50, 500),
+            "negative_energy": rng.uniform(0, 50) if 8 <= hour <= 16 else 0.0,
+        }
+        for hour in range(24)
+    }
+
+
+async def async_main(args: argparse.Namespace) -> BenchmarkResults:
+    """Run the benchmark."""
+    dt_util.set_default_time_zone(dt_util.get_time_zone("Europe/Berlin"))
+    policy = RetentionPolicy(args.hourly_days, args.daily_days, args.months)
+    results = BenchmarkResults("bench_retention", vars(args) | {"output": None})
+    rng = random.Random(0)
+    start = datetime(2020, 1, 1, tzinfo=UTC)
+    history = EnergyHistory()
+    # Energy of the hours of the last weeks, to check the period totals
+    energy: dict[datetime, float] = {}
+
+    async with async_trace_memory() as usage:
+        for year in range(1, args.years + 1):
+            samples: list[float] = []
+            for day in range((year - 1) * 365, year * 365):
+                day_start = start + timedelta(days=day)
+                records = _day_records(day_start, rng)
+                energy.update(
+                    (hour, measures["energy"]) for hour, measures in records.items()
+                )
+                now = day_start + timedelta(days=1)
+                for hour in [hour for hour in energy if hour < now - CHECKED_DAYS]:
+                    del energy[hour]
+                step_start = time.perf_counter()
+                history.merge(records)
+                history.roll_up(now, policy)
+                samples.append(time.perf_counter() - step_start)
+
+            error = max(
+                abs(
+                    history.sum_between(period_start)["energy"]
+                    - math.fsum(
+                        value for hour, value in energy.items() if hour >= period_start
+                    )
+                )
+                for period_start in period_starts(now).values()
+            )
+            results.add(
+                f"year_{year}",
+                records=len(history),
+                hourly=len(history.hourly),
+                daily=len(history.daily),
+                monthly=len(history.monthly),
+                day_step=summarize(samples),
+                period_total_error=error,
+            )
+    results.add("memory", **usage.as_dict())
+    return results
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--hourly-days", type=int, default=DEFAULT_HOURLY_RETENTION)
+    parser.add_argument("--daily-days", type=int, default=DEFAULT_DAILY_RETENTION)
+    parser.add_argument("--months", type=int, default=DEFAULT_MONTHLY_RETENTION)
+    parser.add_argument("--output", type=Path, help="write JSON results here")
+    args = parser.parse_args()
+
+    results = asyncio.run(async_main(args))
+    results.print()
+    if args.output:
+        results.write(args.output)
+
+
+if __name__ == "__main__":
+    main()
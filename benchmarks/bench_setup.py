@@ -0,0 +1,129 @@
+"""Benchmark config entry setup time with a slow backend.
+
+Compares a cold start (nothing stored yet, setup waits for login and the
+first refresh) with a warm start (state restored from storage, the cloud
+is contacted in the background), and the backend requests setup waited for.
+With --profile, the first cold and warm setups are profiled and the
+integration's hot spots printed.
+
+    python -m benchmarks.bench_setup --latency 0.5 --profile setup.prof
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import cProfile
+from pathlib import Path
+import pstats
+import shutil
+import tempfile
+import time
+
+from .fake_backend import FakeObiBackend
+from .hass_harness import async_running_hass, make_config_entry, patched_backend
+from .results import BenchmarkResults, summarize
+
+
+# Functions of the integration printed from a profile
+PROFILE_LINES = 15
+
+
+async def _async_time_setup(
+    config_dir: Path, backend: FakeObiBackend, profile: cProfile.Profile | None
+) -> tuple[float, int]:
+    """Add the config entry.
+
+    Returns how long setup took in seconds and the backend requests sent
+    while it ran.
+    """
+    async with async_running_hass(config_dir) as hass:
+        entry = make_config_entry()
+        backend.reset_counters()
+        if profile:
+            profile.enable()
+        start = time.perf_counter()
+        await hass.config_entries.async_add(entry)
+        elapsed = time.perf_counter() - start
+        if profile:
+            profile.disable()
+        requests = len(backend.requests)
+        # Let the background refresh finish and the store be written
+        await hass.async_block_till_done(wait_background_tasks=True)
+    # Keep the integration store, drop the registered entry for the next run
+    (config_dir / ".storage" / "core.config_entries").unlink(missing_ok=True)
+    return elapsed, requests
+
+
+def _print_profile(name: str, profile: cProfile.Profile, path: Path) -> None:
+    """Write a profile and print the integration's functions in it."""
+    profile.dump_stats(path)
+    print(f"{name} setup profile, written to {path}:")
+    stats = pstats.Stats(profile)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE)
+    stats.print_stats("obi_energy_tracker", PROFILE_LINES)
+
+
+async def async_main(
+    latency: float, rounds: int, profile_path: Path | None = None
+) -> BenchmarkResults:
+    """Run the benchmark."""
+    backend = FakeObiBackend(latency=latency)
+    await backend.start()
+    config_dir = Path(tempfile.mkdtemp(prefix="obi-bench-"))
+    try:
+        with patched_backend(backend):
+            cold: list[float] = []
+            warm: list[float] = []
+            requests = {"cold": 0, "warm": 0}
+            profiles = (
+                {"cold": cProfile.Profile(), "warm": cProfile.Profile()}
+                if profile_path
+                else {}
+            )
+            for round_ in range(rounds):
+                shutil.rmtree(config_dir / ".storage", ignore_errors=True)
+                for name, samples in (("cold", cold), ("warm", warm)):
+                    elapsed, requests[name] = await _async_time_setup(
+                        config_dir,
+                        backend,
+                        profiles.get(name) if round_ == 0 else None,
+                    )
+                    samples.append(elapsed)
+    finally:
+        await backend.stop()
+        shutil.rmtree(config_dir, ignore_errors=True)
+
+    print(f"backend latency: {latency * 1000:.0f} ms per request")
+    print(f"cold setup: {min(cold) * 1000:8.1f} ms (best of {rounds})")
+    print(f"warm setup: {min(warm) * 1000:8.1f} ms (best of {rounds})")
+    print(f"requests during setup: cold {requests['cold']}, warm {requests['warm']}")
+    for name, profile in profiles.items():
+        assert profile_path
+        _print_profile(
+            name, profile, profile_path.with_stem(f"{profile_path.stem}_{name}")
+        )
+
+    results = BenchmarkResults("bench_setup", {"latency": latency, "rounds": rounds})
+    results.add("cold_setup", latency=summarize(cold), requests=requests["cold"])
+    results.add("warm_setup", latency=summarize(warm), requests=requests["warm"])
+    return results
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument(
+        "--profile", type=Path, help="write cProfile stats of setup here"
+    )
+    parser.add_argument("--output", type=Path, help="write JSON results here")
+    args = parser.parse_args()
+    results = asyncio.run(async_main(args.latency, args.rounds, args.profile))
+    if args.output:
+        results.write(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Compare two benchmark result files.
+
+python -m benchmarks.compare before.json after.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any
+
+
+def _flatten(data: dict[str, Any], prefix: str = "") -> dict[str, float]:
+    """Return the numeric metrics as dotted names."""
+    flat: dict[str, float] = {}
+    for name, value in data.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[f"{prefix}{name}"] = value
+    return flat
+
+
+def compare(before: dict[str, Any], after: dict[str, Any]) -> list[str]:
+    """Return a table of the metrics present in both results."""
+    if before["benchmark"] != after["benchmark"]:
+        raise ValueError(
+            f"Results of different benchmarks: {before['benchmark']}, "
+            f"{after['benchmark']}"
+        )
+    if before["parameters"] != after["parameters"]:
+        print("Warning: the runs used different parameters")
+
+    old = _flatten(before["scenarios"])
+    new = _flatten(after["scenarios"])
+    lines = [f"{'metric':<44} {'before':>12} {'after':>12} {'change':>8}"]
+    for name in old.keys() & new.keys():
+        change = (
+            f"{(new[name] - old[name]) / old[name]:+8.1%}" if old[name] else "       -"
+        )
+        lines.append(f"{name:<44} {old[name]:>12.2f} {new[name]:>12.2f} {change}")
+    lines[1:] = sorted(lines[1:])
+    return lines
+
+
+def main() -> None:
+    """Parse arguments and print the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("before", type=Path)
+    parser.add_argument("after", type=Path)
+    args = parser.parse_args()
+    before = json.loads(args.before.read_text())
+    after = json.loads(args.after.read_text())
+    print("\n".join(compare(before, after)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Local stand-in for the OBI login and energy tracking backends."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+from itertools import islice
+import json
+import random
+import re
+from typing import Any
+
+from aiohttp import web
+
+ACCOUNT_ID = "bench-account"
+BRIDGE_ID = "bench-bridge"
+DEVICE_ID = "bench-device"
+
+# Hourly records written to a streamed response at once
+STREAM_BATCH = 500
+
+DURATION_RE = re.compile(r"^(?P<start>[^/]+?)Z?/PT(?P<hours>\d+)H$")
+
+
+def device_ids(count: int) -> list[str]:
+    """Return the sensor IDs of a fake account with count devices."""
+    return [DEVICE_ID, *(f"{DEVICE_ID}-{index}" for index in range(2, count + 1))]
+
+
+def _b64(raw: bytes) -> str:
+    """Encode a JWT segment."""
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _b64_json(data: dict[str, Any]) -> str:
+    """Encode a JSON JWT segment."""
+    return _b64(json.dumps(data, separators=(",", ":")).encode())
+
+
+def make_token(account_id: str = ACCOUNT_ID, lifetime: int = 3600) -> str:
+    """Return an unsigned JWT carrying the claims the integration reads."""
+    exp = int(datetime.now(UTC).timestamp()) + lifetime
+    header = _b64_json({"alg": "HS256", "typ": "JWT"})
+    payload = _b64_json({"accountId": account_id, "exp": exp})
+    return f"{header}.{payload}.{_b64(b'not-signed')}"
+
+
+class FakeObiBackend:
+    """aiohttp application serving the endpoints used by the integration."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        history_days: int = 30,
+        devices: int = 1,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the fake backend.
+
+        Args:
+            latency: Seconds every request is delayed before answering
+            history_days: Days of hourly history the devices have recorded
+            devices: Number of sensors on the account's bridge
+            error_rate: Share of data requests answered with a 503
+            seed: Seed of the random errors, for reproducible runs
+        """
+        self.latency = latency
+        self.history_days = history_days
+        self.device_ids = device_ids(devices)
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self.requests: list[str] = []
+        self.errors = 0
+        self.bytes_sent = 0
+        self.app = web.Application()
+        self.app.router.add_post("/login", self._login)
+        self.app.router.add_get("/users/{user_id}", self._user)
+        self.app.router.add_get(
+            "/historical-data/{bridge_id}/{device_id}/hourly", self._hourly
+        )
+        self.app.router.add_get(
+            "/historical-data/{bridge_id}/{device_id}/meter", self._meter
+        )
+        self._runner: web.AppRunner | None = None
+        self.base_url = ""
+
+    async def start(self) -> str:
+        """Start serving on a free local port and return the base URL."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @property
+    def login_url(self) -> str:
+        """Return the URL of the login endpoint."""
+        return f"{self.base_url}/login"
+
+    def reset_counters(self) -> None:
+        """Forget the requests served so far."""
+        self.requests.clear()
+        self.errors = 0
+        self.bytes_sent = 0
+
+    async def _async_begin(self, name: str) -> web.Response | None:
+        """Record the request and wait for the configured latency.
+
+        Requests other than the login fail with the configured error rate,
+        the error response is returned then.
+        """
+        self.requests.append(name)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if name != "login" and self._random.random() < self.error_rate:
+            self.errors += 1
+            return web.Response(status=503, headers={"Retry-After": "0"})
+        return None
+
+    async def _respond(self, name: str, payload: Any) -> web.Response:
+        """Answer with a JSON payload."""
+        if error := await self._async_begin(name):
+            return error
+        body = json.dumps(payload).encode()
+        self.bytes_sent += len(body)
+        return web.Response(body=body, content_type="application/json")
+
+    async def _respond_records(
+        self, name: str, request: web.Request, records: Iterator[dict[str, Any]]
+    ) -> web.StreamResponse:
+        """Answer with a JSON list, streamed in batches of records.
+
+        The records are generated while the response is written, so the
+        memory of the backend does not grow with the length of the list.
+        """
+        if error := await self._async_begin(name):
+            return error
+        response = web.StreamResponse(headers={"Content-Type": "application/json"})
+        await response.prepare(request)
+        separator = b"["
+        while batch := list(islice(records, STREAM_BATCH)):
+            body = separator + b",".join(
+                json.dumps(record).encode() for record in batch
+            )
+            separator = b","
+            self.bytes_sent += len(body)
+            await response.write(body)
+        end = b"]" if separator == b"," else b"[]"
+        self.bytes_sent += len(end)
+        await response.write(end)
+        await response.write_eof()
+        return response
+
+    async def _login(self, request: web.Request) -> web.Response:
+        return await self._respond("login", {"token": make_token()})
+
+    async def _user(self, request: web.Request) -> web.Response:
+        return await self._respond(
+            "user",
+            {
+                "bridge": {
+                    "id": BRIDGE_ID,
+                    "sensors": [{"id": device_id} for device_id in self.device_ids],
+                }
+            },
+        )
+
+    async def _hourly(self, request: web.Request) -> web.StreamResponse:
+        start, hours = _parse_duration(request.query.get("duration", ""))
+        return await self._respond_records(
+            "hourly", request, self._hourly_records(start, hours)
+        )
+
+    def _hourly_records(self, start: datetime, hours: int) -> Iterator[dict[str, Any]]:
+        """Generate the hourly records of the recorded history in a window."""
+        now = datetime.now(UTC)
+        first = now - timedelta(days=self.history_days)
+        for offset in range(hours):
+            hour = start + timedelta(hours=offset)
+            if hour > now:
+                break
+            if hour < first:
+                continue
+            yield {
+                "timestamp": hour.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "energy": float(200 + hour.hour * 10),
+                "negative_energy": float(max(0, 12 - abs(hour.hour - 12)) * 5),
+            }
+
+    async def _meter(self, request: web.Request) -> web.Response:
+        now = datetime.now(UTC)
+        total = now.timestamp() / 36
+        records = [
+            {
+                "timestamp": (now - timedelta(minutes=15 * step)).isoformat(),
+                "energy": round(total - step * 25, 1),
+            }
+            for step in range(24, -1, -1)
+        ]
+        return await self._respond("meter", records)
+
+
+def _parse_duration(duration: str) -> tuple[datetime, int]:
+    """Parse the ISO 8601 interval used by the historical-data endpoints."""
+    if not (match := DURATION_RE.match(duration)):
+        return datetime.now(UTC), 0
+    start = datetime.fromisoformat(match["start"]).replace(tzinfo=UTC)
+    return start, int(match["hours"])
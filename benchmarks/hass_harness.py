@@ -0,0 +1,131 @@
+"""Minimal Home Assistant instance for running the integration offline."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+import sys
+from types import MappingProxyType
+from typing import Any
+from unittest.mock import patch
+
+from aiohttp.resolver import ThreadedResolver
+
+from homeassistant import config_entries, loader
+from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.helpers import (
+    aiohttp_client,
+    area_registry as ar,
+    category_registry as cr,
+    device_registry as dr,
+    entity,
+    entity_registry as er,
+    floor_registry as fr,
+    issue_registry as ir,
+    label_registry as lr,
+    recorder,
+    translation,
+)
+from homeassistant.setup import async_setup_component
+
+from .fake_backend import BRIDGE_ID, DEVICE_ID, FakeObiBackend, device_ids
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    # Make custom_components importable for the integration loader
+    sys.path.insert(0, str(REPO_ROOT))
+
+from custom_components.obi_energy_tracker import api  # noqa: E402
+from custom_components.obi_energy_tracker.const import (  # noqa: E402
+    CONF_DEVICES,
+    DOMAIN,
+)
+
+ENTRY_ID = "bench-entry"
+
+
+class _LocalResolver(ThreadedResolver):
+    """Resolver with the close hook Home Assistant expects."""
+
+    async def real_close(self) -> None:
+        """Close the resolver."""
+        await self.close()
+
+
+@asynccontextmanager
+async def async_running_hass(config_dir: Path) -> AsyncIterator[HomeAssistant]:
+    """Start a bare Home Assistant instance that can load config entries."""
+    # The shared client session resolves through zeroconf, which needs the
+    # network integration; a plain resolver is enough for a local backend
+    resolver_patch = patch.object(
+        aiohttp_client, "_async_make_resolver", lambda hass: _LocalResolver()
+    )
+    resolver_patch.start()
+    hass = HomeAssistant(str(config_dir))
+    hass.config.skip_pip = True
+    await hass.config.async_set_time_zone("Europe/Berlin")
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    entity.async_setup(hass)
+    loader.async_setup(hass)
+    translation.async_setup(hass)
+    for registry in (ar, cr, dr, er, fr, ir, lr):
+        await registry.async_load(hass)
+    await hass.config_entries.async_initialize()
+    # Statistics are imported through the recorder
+    recorder.async_initialize_recorder(hass)
+    await async_setup_component(hass, "recorder", {"recorder": {}})
+    hass.set_state(CoreState.running)
+    try:
+        yield hass
+    finally:
+        await hass.async_stop(force=True)
+        resolver_patch.stop()
+
+
+@contextmanager
+def patched_backend(backend: FakeObiBackend) -> Iterator[None]:
+    """Point the API client at the fake backend."""
+    with (
+        patch.object(api, "LOGIN_URL", backend.login_url),
+        patch.object(api, "ENERGY_TRACKING_URL", backend.base_url),
+    ):
+        yield
+
+
+def make_config_entry(
+    device_count: int | None = None, **data: Any
+) -> config_entries.ConfigEntry:
+    """Return a config entry for the fake account.
+
+    With device_count given, the entry lists that many devices as set up by
+    the config flow; otherwise they are discovered on the first refresh.
+    """
+    if device_count is not None:
+        data.setdefault(
+            CONF_DEVICES,
+            [
+                {"bridge_id": BRIDGE_ID, "device_id": device_id, "name": None}
+                for device_id in device_ids(device_count)
+            ],
+        )
+    return config_entries.ConfigEntry(
+        data={
+            "email": "bench@example.com",
+            "password": "secret",
+            "country": "DE",
+            "bridge_id": BRIDGE_ID,
+            "device_id": DEVICE_ID,
+            **data,
+        },
+        discovery_keys=MappingProxyType({}),
+        domain=DOMAIN,
+        entry_id=ENTRY_ID,
+        minor_version=1,
+        options={},
+        source=config_entries.SOURCE_USER,
+        subentries_data=None,
+        title="bench@example.com",
+        unique_id="bench@example.com",
+        version=1,
+    )
@@ -0,0 +1,157 @@
+"""Measurement helpers and machine-readable benchmark results."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+import json
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+import sys
+import tracemalloc
+from typing import Any
+
+RESULTS_VERSION = 1
+
+# Frames deep enough to tell client from server allocations
+TRACEMALLOC_FRAMES = 32
+# The fake backend runs in the same process, its allocations are not counted
+SERVER_FRAMES = (
+    tracemalloc.Filter(False, "*/benchmarks/fake_backend.py", all_frames=True),
+    tracemalloc.Filter(False, "*/aiohttp/web_*.py", all_frames=True),
+)
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Return the summary statistics of latency samples in milliseconds."""
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "min_ms": ordered[0] * 1000,
+        "median_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[max(0, round(0.95 * len(ordered)) - 1)] * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+    }
+
+
+@dataclass(slots=True)
+class MemoryUsage:
+    """Allocations made while a block ran, as seen by tracemalloc."""
+
+    allocations: int = 0
+    allocated_bytes: int = 0
+    peak_bytes: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the usage for the results file."""
+        return {
+            "allocations": self.allocations,
+            "allocated_kib": round(self.allocated_bytes / 1024),
+            "peak_kib": round(self.peak_bytes / 1024),
+        }
+
+
+@asynccontextmanager
+async def async_trace_memory() -> AsyncIterator[MemoryUsage]:
+    """Trace the allocations of the enclosed block.
+
+    Counts the memory blocks allocated and still alive at the end, and the
+    peak of traced memory above the level when the block started. The peak
+    includes the allocations of the fake backend.
+    """
+    usage = MemoryUsage()
+    tracemalloc.start(TRACEMALLOC_FRAMES)
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        yield usage
+        usage.peak_bytes = tracemalloc.get_traced_memory()[1] - baseline
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    before = before.filter_traces(SERVER_FRAMES)
+    after = after.filter_traces(SERVER_FRAMES)
+    for stat in after.compare_to(before, "filename"):
+        if stat.count_diff > 0:
+            usage.allocations += stat.count_diff
+            usage.allocated_bytes += max(0, stat.size_diff)
+
+
+@dataclass(slots=True)
+class BenchmarkResults:
+    """Results of one benchmark run, written as JSON."""
+
+    benchmark: str
+    parameters: dict[str, Any]
+    scenarios: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    def add(self, scenario: str, **metrics: Any) -> None:
+        """Add the metrics of a scenario."""
+        self.scenarios.setdefault(scenario, {}).update(metrics)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the results together with information about the run."""
+        return {
+            "version": RESULTS_VERSION,
+            "benchmark": self.benchmark,
+            "created": datetime.now(UTC).isoformat(timespec="seconds"),
+            "environment": _environment(),
+            "parameters": self.parameters,
+            "scenarios": self.scenarios,
+        }
+
+    def write(self, path: Path) -> None:
+        """Write the results to a JSON file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.as_dict(), indent=2) + "\n")
+
+    def print(self) -> None:
+        """Print the scenarios as a table."""
+        for scenario, metrics in self.scenarios.items():
+            print(f"{scenario}:")
+            for name, value in _flatten(metrics):
+                if isinstance(value, float):
+                    value = f"{value:.2f}"
+                print(f"  {name:<28} {value}")
+
+
+def _flatten(metrics: dict[str, Any], prefix: str = "") -> list[tuple[str, Any]]:
+    """Return nested metrics as dotted names."""
+    flat: list[tuple[str, Any]] = []
+    for name, value in metrics.items():
+        if isinstance(value, dict):
+            flat.extend(_flatten(value, f"{prefix}{name}."))
+        else:
+            flat.append((f"{prefix}{name}", value))
+    return flat
+
+
+def _environment() -> dict[str, str | None]:
+    """Return what the results depend on besides the parameters."""
+    try:
+        from homeassistant.const import __version__ as ha_version  # noqa: PLC0415
+    except ImportError:
+        ha_version = None
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            cwd=Path(__file__).parent,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "home_assistant": ha_version,
+        "commit": commit,
+    }
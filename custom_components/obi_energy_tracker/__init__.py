@@ -2,52 +2,169 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from pathlib import Path
+from typing import Any, cast
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_EMAIL, CONF_PASSWORD, Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from aiohttp import ClientSession
+import voluptuous as vol
 
-from .api import ObiEnergyTrackerAPI
-from .const import CONF_BRIDGE_ID, CONF_COUNTRY, CONF_DEVICE_ID, DOMAIN
-from .coordinator import ObiEnergyTrackerCoordinator
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    CONF_EMAIL,
+    CONF_MODE,
+    CONF_PASSWORD,
+    CONF_PATH,
+    EVENT_HOMEASSISTANT_STOP,
+    Platform,
+)
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import (
+    config_validation as cv,
+    device_registry as dr,
+    entity_registry as er,
+)
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util.hass_dict import HassKey
+
+from .accounts import async_get_accounts
+from .const import (
+    CONF_BRIDGE_ID,
+    CONF_CASSETTE,
+    CONF_COUNTRY,
+    CONF_DEVICE_ID,
+    CONF_DEVICES,
+    CONF_MAX_CONNECTIONS,
+    CONF_MAX_RETRIES,
+    CONF_SPEED,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_RETRIES,
+    DOMAIN,
+    MODE_RECORD,
+    MODE_REPLAY,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
+from .coordinator import (
+    ObiEnergyTrackerCoordinator,
+    ObiMeterCoordinator,
+    ObiRuntimeData,
+)
+from .models import ObiDevice
+from .services import async_setup_services
+from .transport import async_get_transport
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.SENSOR]
-
-
-type ObiEnergyTrackerConfigEntry = ConfigEntry[ObiEnergyTrackerCoordinator]
+PLATFORMS: list[Platform] = [Platform.BUTTON, Platform.SENSOR]
+
+# Recording or replaying the backend traffic is only configured in YAML,
+# it is a debugging aid and not meant for regular use
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.Schema(
+            {
+                vol.Optional(CONF_CASSETTE): vol.Schema(
+                    {
+                        vol.Required(CONF_PATH): cv.string,
+                        vol.Optional(CONF_MODE, default=MODE_RECORD): vol.In(
+                            [MODE_RECORD, MODE_REPLAY]
+                        ),
+                        vol.Optional(CONF_SPEED, default=1.0): vol.All(
+                            vol.Coerce(float), vol.Range(min=0)
+                        ),
+                    }
+                )
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+DATA_CASSETTE: HassKey[dict[str, Any]] = HassKey(f"{DOMAIN}_{CONF_CASSETTE}")
+
+
+type ObiEnergyTrackerConfigEntry = ConfigEntry[ObiRuntimeData]
+
+# Identifiers used before entities were created per device
+LEGACY_DEVICE_IDENTIFIER = (DOMAIN, "obi_energy_tracker")
+LEGACY_UNIQUE_IDS = {"obi_meter_reading": "meter_reading"}
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the integration."""
+    async_setup_services(hass)
+    if cassette := config.get(DOMAIN, {}).get(CONF_CASSETTE):
+        hass.data[DATA_CASSETTE] = cassette
+    return True
 
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ObiEnergyTrackerConfigEntry
 ) -> bool:
     """Set up obienergytracker from a config entry."""
-    hass.data.setdefault(DOMAIN, {})
-
-    # Create API client
-    session = async_get_clientsession(hass)
-    api = ObiEnergyTrackerAPI(
+    # Get the API client, shared with other users of the same account
+    session = async_get_transport(hass).session
+    if cassette := hass.data.get(DATA_CASSETTE):
+        session = await _async_cassette_session(hass, entry, session, cassette)
+    accounts = async_get_accounts(hass)
+    api = accounts.async_acquire(
+        entry.entry_id,
         session=session,
         email=entry.data[CONF_EMAIL],
         password=entry.data[CONF_PASSWORD],
         country=entry.data.get(CONF_COUNTRY, "DE"),
         bridge_id=entry.data.get(CONF_BRIDGE_ID),
         device_id=entry.data.get(CONF_DEVICE_ID),
+        max_connections=entry.options.get(
+            CONF_MAX_CONNECTIONS, DEFAULT_MAX_CONNECTIONS
+        ),
+        max_retries=entry.options.get(CONF_MAX_RETRIES, DEFAULT_MAX_RETRIES),
     )
-
-    # Authenticate
-    if not await api.async_login():
+    entry.async_on_unload(lambda: accounts.async_release(entry.entry_id, api))
+
+    devices = [
+        ObiDevice.from_dict(device) for device in entry.data.get(CONF_DEVICES, [])
+    ]
+    if not devices and (legacy_device := api.default_device):
+        devices = [legacy_device]
+        await _async_migrate_legacy_identifiers(hass, entry, legacy_device)
+
+    # The meter readings and the hourly history are polled on separate
+    # schedules, both through the same client and token
+    coordinator = ObiEnergyTrackerCoordinator(hass, api, entry, devices)
+    meter_coordinator = ObiMeterCoordinator(hass, coordinator)
+    entry.runtime_data = ObiRuntimeData(coordinator, meter_coordinator)
+
+    # Warm start: entities restore the stored state right away, while
+    # login and the first refreshes run in the background
+    if await coordinator.async_restore():
+        meter_coordinator.async_restore()
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN}_initial_hourly_refresh"
+        )
+        entry.async_create_background_task(
+            hass, meter_coordinator.async_refresh(), f"{DOMAIN}_initial_meter_refresh"
+        )
+        return True
+
+    # Authenticate, a token of the shared client is reused
+    if not await api.async_ensure_token():
         _LOGGER.error("Failed to authenticate with Obi EnergyTracker")
         return False
 
-    # Create coordinator
-    coordinator = ObiEnergyTrackerCoordinator(hass, api, entry)
-    await coordinator.async_config_entry_first_refresh()
-
-    entry.runtime_data = coordinator
+    if coordinator.devices:
+        await asyncio.gather(
+            coordinator.async_config_entry_first_refresh(),
+            meter_coordinator.async_config_entry_first_refresh(),
+        )
+    else:
+        # The hourly coordinator discovers the devices first
+        await coordinator.async_config_entry_first_refresh()
+        await meter_coordinator.async_config_entry_first_refresh()
 
     # Forward entry setup to platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -55,11 +172,67 @@ async def async_setup_entry(
     return True
 
 
+async def _async_cassette_session(
+    hass: HomeAssistant,
+    entry: ObiEnergyTrackerConfigEntry,
+    session: ClientSession,
+    cassette: dict[str, Any],
+) -> ClientSession:
+    """Return a session recording to or replaying from a cassette."""
+    # Only imported when configured, it is not needed for regular use
+    from .cassette import RecordingSession, ReplaySession  # noqa: PLC0415
+
+    path = Path(hass.config.path(cassette[CONF_PATH]))
+    if cassette[CONF_MODE] == MODE_REPLAY:
+        _LOGGER.warning("Replaying Obi EnergyTracker traffic from %s", path)
+        replay = await hass.async_add_executor_job(
+            ReplaySession.load, path, cassette[CONF_SPEED]
+        )
+        return cast(ClientSession, replay)
+
+    _LOGGER.warning("Recording Obi EnergyTracker traffic to %s", path)
+    recording = RecordingSession(session, path)
+
+    async def _async_save(event: Event | None = None) -> None:
+        await recording.async_save()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_save)
+    )
+    entry.async_on_unload(_async_save)
+    return cast(ClientSession, recording)
+
+
+async def _async_migrate_legacy_identifiers(
+    hass: HomeAssistant, entry: ObiEnergyTrackerConfigEntry, device: ObiDevice
+) -> None:
+    """Move the single device and its entities to per device identifiers."""
+    device_registry = dr.async_get(hass)
+    if legacy := device_registry.async_get_device(
+        identifiers={LEGACY_DEVICE_IDENTIFIER}
+    ):
+        device_registry.async_update_device(
+            legacy.id, new_identifiers={(DOMAIN, device.device_id)}
+        )
+
+    @callback
+    def _migrate_unique_id(entity_entry: er.RegistryEntry) -> dict[str, str] | None:
+        if (key := LEGACY_UNIQUE_IDS.get(entity_entry.unique_id)) is None:
+            return None
+        return {"new_unique_id": f"{device.device_id}_{key}"}
+
+    await er.async_migrate_entries(hass, entry.entry_id, _migrate_unique_id)
+
+
 async def async_unload_entry(
     hass: HomeAssistant, entry: ObiEnergyTrackerConfigEntry
 ) -> bool:
     """Unload a config entry."""
-    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
-    return unload_ok
+
+async def async_remove_entry(
+    hass: HomeAssistant, entry: ObiEnergyTrackerConfigEntry
+) -> None:
+    """Remove the stored state of a config entry."""
+    await Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry.entry_id}").async_remove()
@@ -0,0 +1,142 @@
+"""API clients shared by everything using the same Obi account."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import logging
+
+from aiohttp import ClientSession
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util.hass_dict import HassKey
+
+from .api import ObiEnergyTrackerAPI
+from .const import DEFAULT_MAX_CONNECTIONS, DEFAULT_MAX_RETRIES, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Keep an unused client this long, so a reload or a config entry created by
+# the config flow picks up its token instead of logging in again
+ACCOUNT_RELEASE_DELAY = timedelta(seconds=60)
+
+type AccountKey = tuple[ClientSession, str, str, str]
+
+
+@dataclass(slots=True)
+class _SharedAccount:
+    """A shared API client and who is using it."""
+
+    api: ObiEnergyTrackerAPI
+    users: set[str] = field(default_factory=set)
+    cancel_release: CALLBACK_TYPE | None = None
+
+
+class ObiAccounts:
+    """Reference counted API clients, one per account.
+
+    Clients are keyed by session, email, country and password: a client is
+    only shared with someone holding the same credentials, a flow checking a
+    different password never reuses the token of a logged in client. A
+    config entry recording to or replaying from a cassette passes its own
+    session and therefore never picks up a client talking to the backend.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the registry."""
+        self.hass = hass
+        self._accounts: dict[AccountKey, _SharedAccount] = {}
+
+    def __len__(self) -> int:
+        """Return the number of accounts with a client."""
+        return len(self._accounts)
+
+    @callback
+    def async_acquire(
+        self,
+        user: str,
+        session: ClientSession,
+        email: str,
+        password: str,
+        country: str = "DE",
+        bridge_id: str | None = None,
+        device_id: str | None = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+    ) -> ObiEnergyTrackerAPI:
+        """Return the client of an account for user, creating it if needed.
+
+        user identifies the holder of the reference, e.g. a config entry or
+        flow ID; it must release the client when done with it.
+        """
+        key = (session, email.casefold(), country.upper(), password)
+        if (account := self._accounts.get(key)) is None:
+            account = self._accounts[key] = _SharedAccount(
+                ObiEnergyTrackerAPI(
+                    session,
+                    email=email,
+                    password=password,
+                    country=country,
+                    bridge_id=bridge_id,
+                    device_id=device_id,
+                    max_connections=max_connections,
+                    max_retries=max_retries,
+                )
+            )
+        else:
+            if account.cancel_release is not None:
+                account.cancel_release()
+                account.cancel_release = None
+            api = account.api
+            if not api.bridge_id and not api.device_id:
+                api.bridge_id = bridge_id
+                api.device_id = device_id
+            if not account.users:
+                # Nobody else uses the client, the new limits apply
+                api.configure(max_connections, max_retries)
+            _LOGGER.debug(
+                "Sharing the client of %s with %s, token valid: %s",
+                email,
+                user,
+                api.token_valid,
+            )
+
+        account.users.add(user)
+        return account.api
+
+    @callback
+    def async_release(self, user: str, api: ObiEnergyTrackerAPI) -> None:
+        """Drop the reference of user, the client is removed when unused."""
+        key = next(
+            (key for key, account in self._accounts.items() if account.api is api),
+            None,
+        )
+        if key is None:
+            return
+        account = self._accounts[key]
+
+        account.users.discard(user)
+        if account.users or account.cancel_release is not None:
+            return
+
+        @callback
+        def _async_remove(now: datetime) -> None:
+            if self._accounts.get(key) is account and not account.users:
+                del self._accounts[key]
+                _LOGGER.debug("Removed the unused client of %s", api.email)
+
+        account.cancel_release = async_call_later(
+            self.hass, ACCOUNT_RELEASE_DELAY, _async_remove
+        )
+
+
+DATA_ACCOUNTS: HassKey[ObiAccounts] = HassKey(DOMAIN)
+
+
+@callback
+def async_get_accounts(hass: HomeAssistant) -> ObiAccounts:
+    """Return the account registry, creating it on first use."""
+    if (accounts := hass.data.get(DATA_ACCOUNTS)) is None:
+        accounts = hass.data[DATA_ACCOUNTS] = ObiAccounts(hass)
+    return accounts
@@ -2,12 +2,26 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+import asyncio
+import base64
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from email.utils import parsedate_to_datetime
+import json
 import logging
+import math
+import random
+import time
 from typing import Any
 
-from aiohttp import ClientError, ClientSession
-import jwt
+from aiohttp import ClientError, ClientResponse, ClientSession, ClientTimeout
+from aiohttp.hdrs import ETAG, IF_MODIFIED_SINCE, IF_NONE_MATCH, LAST_MODIFIED
+
+from .const import DEFAULT_MAX_CONNECTIONS, DEFAULT_MAX_RETRIES
+from .metrics import ApiMetrics
+from .models import HourlySeries, HourlyStreamParser, ObiDevice, parse_devices
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -15,6 +29,281 @@ _LOGGER = logging.getLogger(__name__)
 LOGIN_URL = "https://www.obi.de/regi/auth/api/public/login"
 ENERGY_TRACKING_URL = "https://energy-tracking-backend.prod-eks.dbs.obi.solutions"
 
+# Accept headers of the energy tracking backend
+ACCEPT_USER = "application/vnd.obi.companion.energy-tracking.user.v1+json"
+ACCEPT_HISTORICAL_RECORD = (
+    "application/vnd.obi.companion.energy-tracking.historical-record.v1+json"
+)
+
+# Log in again this long before the token expires
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+# Timeouts of a single request: in total, for getting a connection and
+# between two reads of the response
+REQUEST_TIMEOUT = ClientTimeout(total=30, connect=10, sock_read=20)
+# Responses that are retried with backoff
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Backoff before the n-th retry: a random delay up to base * 2**n, capped
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+# Size of the chunks a streamed response body is read in
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Seconds a response answers identical requests without asking the backend;
+# shorter than the minimum poll interval, so every poll reaches the backend
+RESPONSE_CACHE_TTL = 10.0
+# Responses kept for revalidation, the least recently used are dropped
+RESPONSE_CACHE_SIZE = 32
+
+# Time a connectivity probe may take
+PROBE_TIMEOUT = 10.0
+
+# Consecutive failed requests that open the circuit
+CIRCUIT_FAILURE_THRESHOLD = 5
+# Time the circuit stays open before a trial request is let through
+CIRCUIT_RESET_TIMEOUT = timedelta(minutes=5)
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+def decode_token_claims(token: str) -> dict[str, Any]:
+    """Return the claims of a JWT without verifying its signature.
+
+    The signature can't be verified with the client's knowledge anyway, the
+    claims are only read to learn the account ID and the expiry, and the
+    token itself comes straight from the login response over TLS.
+    """
+    parts = token.split(".")
+    if len(parts) != 3:
+        raise ValueError(f"Expected 3 token segments, got {len(parts)}")
+    payload = parts[1]
+    try:
+        claims = json.loads(
+            base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        )
+    except (ValueError, UnicodeDecodeError) as err:
+        raise ValueError(f"Invalid token payload: {err}") from err
+    if not isinstance(claims, dict):
+        raise TypeError("Token payload is not a JSON object")
+    return claims
+
+
+class CircuitBreaker:
+    """Stop sending requests after repeated failures.
+
+    After CIRCUIT_FAILURE_THRESHOLD consecutive failures the circuit opens and
+    requests are refused until the reset timeout has passed. Then a single
+    trial request is let through: its success closes the circuit again, its
+    failure reopens it for another reset timeout.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: timedelta = CIRCUIT_RESET_TIMEOUT,
+    ) -> None:
+        """Initialize the circuit breaker."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout.total_seconds()
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        """Return the state of the circuit."""
+        if self.opened_at is None:
+            return CIRCUIT_CLOSED
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return CIRCUIT_OPEN
+        return CIRCUIT_HALF_OPEN
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until requests are let through again."""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent."""
+        state = self.state
+        if state == CIRCUIT_CLOSED:
+            return True
+        if state == CIRCUIT_HALF_OPEN and not self._trial_running:
+            self._trial_running = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        if self.opened_at is not None:
+            _LOGGER.info("Obi EnergyTracker backend is reachable again")
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        """Count a failed request and open the circuit if needed."""
+        self.failures += 1
+        if self._trial_running or (
+            self.opened_at is None and self.failures >= self.failure_threshold
+        ):
+            _LOGGER.warning(
+                "Obi EnergyTracker backend failed %d times in a row, "
+                "pausing requests for %s",
+                self.failures,
+                timedelta(seconds=self.reset_timeout),
+            )
+            self.opened_at = time.monotonic()
+        self._trial_running = False
+
+    def record_cancelled(self) -> None:
+        """Let another trial request through after a cancelled request.
+
+        A cancelled request neither succeeded nor failed, so the state of the
+        circuit stays as it is. Without this a cancelled trial request would
+        keep the circuit half open and refuse every request for good.
+        """
+        self._trial_running = False
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state for diagnostics."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_in": round(self.retry_in, 1),
+        }
+
+
+def _retry_after(response: ClientResponse) -> float | None:
+    """Return the delay requested by a Retry-After header in seconds."""
+    if (value := response.headers.get("Retry-After")) is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max(0.0, (retry_at - datetime.now(UTC)).total_seconds())
+
+
+type BodyReader = Callable[[ClientResponse], Awaitable[tuple[Any, int]]]
+
+
+async def _async_read_json(response: ClientResponse) -> tuple[Any, int]:
+    """Read and decode the whole JSON body, return it and its size."""
+    body = await response.read()
+    return json.loads(body), len(body)
+
+
+async def _async_read_hourly_series(
+    response: ClientResponse,
+) -> tuple[HourlySeries, int]:
+    """Parse the hourly records of a body while it arrives."""
+    parser = HourlyStreamParser()
+    async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+        parser.feed(chunk)
+    return parser.close(), parser.size
+
+
+type RequestKey = tuple[str, tuple[tuple[str, str], ...], str, BodyReader]
+
+
+@dataclass(slots=True)
+class _CachedResponse:
+    """A decoded response body and the validators the backend sent with it."""
+
+    data: Any
+    fresh_until: float
+    etag: str | None
+    last_modified: str | None
+
+
+class ResponseCache:
+    """Recently received responses, revalidated with the backend when stale.
+
+    A response answers identical requests for RESPONSE_CACHE_TTL seconds.
+    After that it is only kept if the backend sent an ETag or Last-Modified
+    header: the next request asks whether it changed, and a 304 answer
+    reuses the decoded body instead of transferring and parsing it again.
+    """
+
+    def __init__(
+        self, ttl: float = RESPONSE_CACHE_TTL, max_size: int = RESPONSE_CACHE_SIZE
+    ) -> None:
+        """Initialize an empty cache."""
+        self.ttl = ttl
+        self.max_size = max_size
+        self._responses: OrderedDict[RequestKey, _CachedResponse] = OrderedDict()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached responses."""
+        return len(self._responses)
+
+    def get(self, key: RequestKey) -> _CachedResponse | None:
+        """Return the cached response of a request, fresh or revalidatable."""
+        if (response := self._responses.get(key)) is None:
+            return None
+        if response.fresh_until <= time.monotonic() and not (
+            response.etag or response.last_modified
+        ):
+            del self._responses[key]
+            return None
+        self._responses.move_to_end(key)
+        return response
+
+    def put(
+        self,
+        key: RequestKey,
+        data: Any,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Cache a response."""
+        self._responses[key] = _CachedResponse(
+            data, time.monotonic() + self.ttl, etag, last_modified
+        )
+        self._responses.move_to_end(key)
+        while len(self._responses) > self.max_size:
+            self._responses.popitem(last=False)
+
+    def refresh(self, response: _CachedResponse) -> None:
+        """Make a response fresh again, the backend confirmed it is unchanged."""
+        response.fresh_until = time.monotonic() + self.ttl
+        self.revalidated += 1
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the cache state for diagnostics."""
+        return {
+            "responses": len(self._responses),
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
+
+
+class _RetryableError(Exception):
+    """A request failed in a way that may succeed when retried."""
+
+    def __init__(self, reason: str, retry_after: float | None = None) -> None:
+        """Initialize the error."""
+        super().__init__(reason)
+        self.retry_after = retry_after
+
 
 class ObiEnergyTrackerAPI:
     """API client for Obi EnergyTracker."""
@@ -27,206 +316,499 @@ class ObiEnergyTrackerAPI:
         country: str = "DE",
         bridge_id: str | None = None,
         device_id: str | None = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        throttle: Callable[[], Awaitable[None]] | None = None,
     ) -> None:
-        """Initialize the API client."""
+        """Initialize the API client.
+
+        bridge_id and device_id select the device used when a request does not
+        name one; max_connections limits the concurrent backend requests and
+        max_retries the retries of a request failing with a temporary error.
+        throttle is awaited before every request sent, e.g. to apply rate
+        limits shared with other clients.
+        """
         self.session = session
         self.email = email
         self.password = password
         self.country = country
         self.token: str | None = None
+        self.token_expires_at: datetime | None = None
+        self.token_obtained_at: datetime | None = None
+        self.account_id: str | None = None
         self.bridge_id = bridge_id
         self.device_id = device_id
+        self._login_task: asyncio.Task[bool] | None = None
+        self.max_connections = max_connections
+        self._request_semaphore = asyncio.Semaphore(max_connections)
+        self.max_retries = max_retries
+        self.throttle = throttle
+        self.circuit_breaker = CircuitBreaker()
+        self.metrics = ApiMetrics()
+        self.response_cache = ResponseCache()
+        self._pending_gets: dict[RequestKey, asyncio.Task[Any | None]] = {}
+
+    def configure(self, max_connections: int, max_retries: int) -> None:
+        """Change the request limits, requests already waiting keep the old ones."""
+        if max_connections != self.max_connections:
+            self.max_connections = max_connections
+            self._request_semaphore = asyncio.Semaphore(max_connections)
+        self.max_retries = max_retries
+
+    @property
+    def default_device(self) -> ObiDevice | None:
+        """Return the device used when a request does not name one."""
+        if not self.bridge_id or not self.device_id:
+            return None
+        return ObiDevice(self.bridge_id, self.device_id)
+
+    @property
+    def token_valid(self) -> bool:
+        """Return True if a token is present and not about to expire."""
+        if not self.token:
+            return False
+        if self.token_expires_at is None:
+            return True
+        return datetime.now(UTC) < self.token_expires_at - TOKEN_REFRESH_MARGIN
 
     async def async_login(self) -> bool:
-        """Authenticate with the Obi EnergyTracker API."""
-        try:
-            payload = {
-                "email": self.email,
-                "password": self.password,
-                "country": self.country,
-            }
-
-            headers = {
-                "Accept-Encoding": "gzip",
-                "Connection": "Keep-Alive",
-                "Content-Type": "application/json",
-                "x-app-type": "b2c",
-                "x-obi-locale": "de-DE",
-                "User-Agent": "heyOBI APP / Android Phone 30",
-            }
-
-            async with self.session.post(
-                LOGIN_URL, json=payload, headers=headers
-            ) as response:
-                if response.status != 200:
-                    _LOGGER.error(
-                        "Login failed with status %d",
-                        response.status,
-                    )
-                    return False
+        """Authenticate with the Obi EnergyTracker API.
+
+        Concurrent callers share a single in-flight login request.
+        """
+        if self._login_task is None or self._login_task.done():
+            self._login_task = asyncio.get_running_loop().create_task(
+                self._async_login()
+            )
+        # Shielded so a cancelled caller does not abort the login for the others
+        return await asyncio.shield(self._login_task)
+
+    async def async_ensure_token(self) -> bool:
+        """Make sure a token is available, logging in shortly before expiry."""
+        if self.token_valid:
+            return True
+        if self.token:
+            _LOGGER.debug(
+                "Token expires at %s, logging in again", self.token_expires_at
+            )
+        return await self.async_login()
+
+    async def _async_login(self) -> bool:
+        """Send the login request and store the received token."""
+        payload = {
+            "email": self.email,
+            "password": self.password,
+            "country": self.country,
+        }
+
+        headers = {
+            "Accept-Encoding": "gzip",
+            "Connection": "Keep-Alive",
+            "Content-Type": "application/json",
+            "x-app-type": "b2c",
+            "x-obi-locale": "de-DE",
+            "User-Agent": "heyOBI APP / Android Phone 30",
+        }
 
-                data = await response.json()
-                self.token = data.get("token")
+        if (
+            result := await self._async_request(
+                "POST", LOGIN_URL, description="login", json=payload, headers=headers
+            )
+        ) is None:
+            return False
 
-                if not self.token:
-                    _LOGGER.error("No token received from login response")
-                    return False
+        status, data = result
+        if status != 200:
+            _LOGGER.error("Login failed with status %d", status)
+            return False
 
-                _LOGGER.debug("Successfully authenticated with Obi EnergyTracker")
-                return True
-        except (OSError, ClientError) as err:
-            _LOGGER.error("Login error: %s", err)
+        token = data.get("token") if isinstance(data, dict) else None
+        if not token:
+            _LOGGER.error("No token received from login response")
             return False
 
-    async def async_get_bridge_info(self) -> dict[str, str] | None:
-        """Get bridge and device IDs from user profile."""
-        if not self.token:
-            return None
+        self._set_token(token)
+        self.metrics.record_login()
+        _LOGGER.debug("Successfully authenticated with Obi EnergyTracker")
+        return True
+
+    def _set_token(self, token: str) -> None:
+        """Store the token together with the claims read from it."""
+        self.token = token
+        self.token_expires_at = None
+        self.token_obtained_at = datetime.now(UTC)
+        self.account_id = None
+        try:
+            claims = decode_token_claims(token)
+        except (ValueError, TypeError) as err:
+            _LOGGER.warning("Could not decode token claims: %s", err)
+            return
+
+        self.account_id = claims.get("accountId")
+        if isinstance(exp := claims.get("exp"), (int, float)):
+            self.token_expires_at = datetime.fromtimestamp(exp, UTC)
+
+    async def _async_relogin(self, rejected_token: str | None) -> bool:
+        """Log in again after the backend rejected a token."""
+        if self.token != rejected_token and self.token_valid:
+            # Another caller already replaced the rejected token
+            return True
+        self.token = None
+        return await self.async_login()
+
+    async def async_probe(self, timeout: float = PROBE_TIMEOUT) -> dict[str, Any]:
+        """Check whether the backend answers requests with the current token.
+
+        Sends a single request for the user info, without logging in,
+        retrying or involving the circuit breaker, and gives up after timeout
+        seconds.
+        """
+        result: dict[str, Any] = {
+            "time": datetime.now(UTC).isoformat(),
+            "reachable": False,
+            "status": None,
+            "latency_ms": None,
+            "error": None,
+        }
+        if not self.token or not self.account_id:
+            result["error"] = "not logged in"
+            return result
 
+        start = time.monotonic()
         try:
-            # Decode JWT to get userId
-            decoded_token = jwt.decode(self.token, options={"verify_signature": False})
-            user_id = decoded_token.get("accountId")
+            async with (
+                asyncio.timeout(timeout),
+                self.session.get(
+                    f"{ENERGY_TRACKING_URL}/users/{self.account_id}",
+                    headers=self._get_auth_headers(ACCEPT_USER),
+                ) as response,
+            ):
+                result["status"] = response.status
+                result["reachable"] = True
+        except TimeoutError:
+            result["error"] = f"no answer within {timeout:.0f}s"
+        except (OSError, ClientError) as err:
+            result["error"] = str(err) or type(err).__name__
+        result["latency_ms"] = round((time.monotonic() - start) * 1000, 1)
+        return result
 
-            if not user_id:
-                _LOGGER.error("No accountId found in token")
-                return None
+    async def async_get_devices(self) -> list[ObiDevice] | None:
+        """Get all sensors of all bridges from the user profile."""
+        if not await self.async_ensure_token():
+            return None
 
-            url = f"{ENERGY_TRACKING_URL}/users/{user_id}"
-            headers = {
-                "Accept": "application/vnd.obi.companion.energy-tracking.user.v1+json",
-                "Accept-Encoding": "gzip",
-                "User-Agent": "app_client",
-                "Authorization": f"Bearer {self.token}",
-                "Connection": "Keep-Alive",
-            }
-
-            async with self.session.get(url, headers=headers) as response:
-                if response.status != 200:
-                    _LOGGER.error("Failed to get user info: %d", response.status)
-                    return None
-
-                data = await response.json()
-                bridge = data.get("bridge")
-                if not bridge:
-                    _LOGGER.error("No bridge found in user info")
-                    return None
-
-                self.bridge_id = bridge.get("id")
-                sensors = bridge.get("sensors", [])
-                if sensors:
-                    self.device_id = sensors[0].get("id")
-
-                if not self.bridge_id or not self.device_id:
-                    _LOGGER.error("Could not find bridge_id or device_id")
-                    return None
-
-                return {
-                    "bridge_id": self.bridge_id,
-                    "device_id": self.device_id,
-                }
-        except (jwt.DecodeError, OSError, ClientError) as err:
-            _LOGGER.error("Error getting bridge info: %s", err)
+        if not self.account_id:
+            _LOGGER.error("No accountId found in token")
             return None
 
-    async def async_get_hourly_data(
-        self,
-        start_date: datetime | None = None,
-        num_days: int = 1,
+        data = await self._async_authorized_get(
+            f"{ENERGY_TRACKING_URL}/users/{self.account_id}",
+            accept=ACCEPT_USER,
+            description="user info",
+        )
+        if data is None:
+            return None
+
+        devices = parse_devices(data)
+        if not devices:
+            _LOGGER.error("No bridge with sensors found in user info")
+            return None
+
+        return devices
+
+    async def async_get_hourly_range(
+        self, start: datetime, end: datetime, device: ObiDevice | None = None
     ) -> dict[str, Any] | None:
-        """Get hourly energy data for multiple days.
+        """Get hourly energy data for the hours between start and end.
 
         Args:
-            start_date: Start date for data retrieval (defaults to today)
-            num_days: Number of days to fetch (default 1)
+            start: First hour to fetch, truncated to the full hour
+            end: End of the window (exclusive), rounded up to the full hour
+            device: Device to fetch (defaults to the configured device)
 
         Returns:
             Dictionary containing hourly energy data
         """
-        if not self.token or not self.bridge_id or not self.device_id:
-            return None
+        start_utc = start.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+        hours = max(1, math.ceil((end - start_utc).total_seconds() / 3600))
 
-        try:
-            if start_date is None:
-                start_date = datetime.now()
-
-            # Format as ISO 8601 datetime with Z suffix for UTC
-            # The API expects: start_dateT23:00:00Z/PT{days}H format
-            # So we use start_date at 23:00 UTC of previous day for 24-hour window
-            duration_start = start_date.replace(
-                hour=23, minute=0, second=0, microsecond=0
-            )
-            duration_hours = num_days * 24
+        return await self._async_fetch_hourly(
+            f"{start_utc.strftime('%Y-%m-%dT%H:%M:%S')}Z/PT{hours}H", device
+        )
 
-            duration_str = f"{duration_start.isoformat()}Z/PT{duration_hours}H"
+    async def async_get_hourly_series(
+        self, start: datetime, end: datetime, device: ObiDevice | None = None
+    ) -> HourlySeries | None:
+        """Get the hourly energy data between start and end as a series.
 
-            url = (
-                f"{ENERGY_TRACKING_URL}/historical-data/"
-                f"{self.bridge_id}/{self.device_id}/hourly"
-            )
+        The response is parsed while it is received, memory use does not
+        grow with the length of the range beyond the compact series.
+        """
+        start_utc = start.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+        hours = max(1, math.ceil((end - start_utc).total_seconds() / 3600))
 
-            params = {
+        return await self._async_fetch_hourly(
+            f"{start_utc.strftime('%Y-%m-%dT%H:%M:%S')}Z/PT{hours}H",
+            device,
+            reader=_async_read_hourly_series,
+        )
+
+    async def _async_fetch_hourly(
+        self,
+        duration_str: str,
+        device: ObiDevice | None,
+        reader: BodyReader = _async_read_json,
+    ) -> Any | None:
+        """Fetch hourly energy data for an ISO 8601 duration string."""
+        if (device := device or self.default_device) is None:
+            return None
+
+        return await self._async_authorized_get(
+            f"{ENERGY_TRACKING_URL}/historical-data/"
+            f"{device.bridge_id}/{device.device_id}/hourly",
+            params={
                 "duration": duration_str,
                 "measures": "energy,negative_energy",
-            }
+            },
+            description="hourly data",
+            reader=reader,
+        )
 
-            headers = self._get_auth_headers()
+    async def async_get_meter_data(
+        self, device: ObiDevice | None = None
+    ) -> dict[str, Any] | None:
+        """Get meter reading data (Zählerstand).
 
-            async with self.session.get(
-                url, params=params, headers=headers
-            ) as response:
-                if response.status == 200:
-                    return await response.json()
-                _LOGGER.error("Failed to get hourly data: %d", response.status)
-                return None
-        except OSError as err:
-            _LOGGER.error("Error getting hourly data: %s", err)
+        Args:
+            device: Device to fetch (defaults to the configured device)
+        """
+        if (device := device or self.default_device) is None:
             return None
 
-    async def async_get_meter_data(self) -> dict[str, Any] | None:
-        """Get meter reading data (Zählerstand)."""
-        if not self.token or not self.bridge_id or not self.device_id:
-            return None
+        # Dynamic duration: a 6-hour window ending now
+        # Meter readings represent the total state at points in time
+        now = datetime.now()
+        # Starting on the full minute, requests sent moments apart are
+        # identical and answered by a single backend request; the window
+        # reaches past now, so the newest reading is never cut off
+        start_time = (now - timedelta(hours=6)).replace(second=0, microsecond=0)
+        # Format: 2026-01-18T08:55:00.000Z
+        start_time_str = start_time.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+        duration_str = f"{start_time_str}/PT7H"
+
+        return await self._async_authorized_get(
+            f"{ENERGY_TRACKING_URL}/historical-data/"
+            f"{device.bridge_id}/{device.device_id}/meter",
+            params={
+                "duration": duration_str,
+                "measures": "energy",
+            },
+            description="meter data",
+        )
 
-        try:
-            # Dynamic duration: a 6-hour window ending now
-            # Meter readings represent the total state at points in time
-            now = datetime.now()
-            start_time = now - timedelta(hours=6)
-            # Format: 2026-01-18T08:55:11.896Z
-            start_time_str = start_time.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
-            duration_str = f"{start_time_str}/PT6H"
-
-            url = (
-                f"{ENERGY_TRACKING_URL}/historical-data/"
-                f"{self.bridge_id}/{self.device_id}/meter"
+    async def _async_authorized_get(
+        self,
+        url: str,
+        *,
+        params: dict[str, str] | None = None,
+        accept: str = ACCEPT_HISTORICAL_RECORD,
+        description: str,
+        reader: BodyReader = _async_read_json,
+    ) -> Any | None:
+        """Send an authorized GET request and return the decoded JSON body.
+
+        Identical requests share a single request in flight, and a response
+        received moments ago is returned from the response cache. Callers
+        must not modify the returned body, it may be shared.
+        """
+        key = (url, tuple(sorted((params or {}).items())), accept, reader)
+        cache = self.response_cache
+        cached = cache.get(key)
+        if cached is not None and cached.fresh_until > time.monotonic():
+            cache.hits += 1
+            return cached.data
+
+        if (task := self._pending_gets.get(key)) is None:
+            task = self._pending_gets[key] = asyncio.get_running_loop().create_task(
+                self._async_get(key, url, params, accept, description, reader, cached)
             )
+            task.add_done_callback(lambda _: self._pending_gets.pop(key, None))
+        else:
+            cache.coalesced += 1
+        # Shielded so a cancelled caller does not abort the request for others
+        return await asyncio.shield(task)
 
-            params = {
-                "duration": duration_str,
-                "measures": "energy",
-            }
+    async def _async_get(
+        self,
+        key: RequestKey,
+        url: str,
+        params: dict[str, str] | None,
+        accept: str,
+        description: str,
+        reader: BodyReader,
+        cached: _CachedResponse | None,
+    ) -> Any | None:
+        """Send an authorized GET request, revalidating a cached response.
+
+        The token is refreshed before it expires; if the backend still
+        rejects it with a 401, one new login is attempted and the request
+        is retried once.
+        """
+        if not await self.async_ensure_token():
+            return None
+
+        async def read_with_validators(
+            response: ClientResponse,
+        ) -> tuple[tuple[Any, str | None, str | None], int]:
+            data, size = await reader(response)
+            headers = response.headers
+            return (data, headers.get(ETAG), headers.get(LAST_MODIFIED)), size
+
+        for attempt in range(2):
+            token = self.token
+            headers = self._get_auth_headers(accept)
+            if cached is not None:
+                if cached.etag:
+                    headers[IF_NONE_MATCH] = cached.etag
+                if cached.last_modified:
+                    headers[IF_MODIFIED_SINCE] = cached.last_modified
+            if (
+                result := await self._async_request(
+                    "GET",
+                    url,
+                    description=description,
+                    params=params,
+                    headers=headers,
+                    reader=read_with_validators,
+                )
+            ) is None:
+                return None
 
-            headers = self._get_auth_headers()
+            status, body = result
+            if status == 200:
+                data, etag, last_modified = body
+                self.response_cache.misses += 1
+                self.response_cache.put(key, data, etag, last_modified)
+                return data
+            if status == 304 and cached is not None:
+                self.response_cache.refresh(cached)
+                return cached.data
+            if status != 401 or attempt:
+                _LOGGER.error("Failed to get %s: %d", description, status)
+                return None
 
-            async with self.session.get(
-                url, params=params, headers=headers
-            ) as response:
-                if response.status == 200:
-                    return await response.json()
-                _LOGGER.error("Failed to get meter data: %d", response.status)
+            _LOGGER.debug("Token rejected while getting %s, logging in", description)
+            if not await self._async_relogin(token):
                 return None
-        except OSError as err:
-            _LOGGER.error("Error getting meter data: %s", err)
+
+        return None
+
+    async def _async_request(
+        self,
+        method: str,
+        url: str,
+        *,
+        description: str,
+        reader: BodyReader = _async_read_json,
+        **kwargs: Any,
+    ) -> tuple[int, Any] | None:
+        """Send a request, retrying temporary failures with backoff.
+
+        Timeouts, connection errors and responses with a status of
+        RETRY_STATUSES are retried up to max_retries times, waiting a random
+        delay with exponential growth or as long as the backend asks for with
+        Retry-After. Returns the status and the decoded JSON body (None for
+        unsuccessful responses), or None if the request failed or the circuit
+        breaker is open.
+        """
+        if not self.circuit_breaker.allow_request():
+            _LOGGER.debug(
+                "Not getting %s, backend unavailable for another %.0fs",
+                description,
+                self.circuit_breaker.retry_in,
+            )
             return None
 
-    def _get_auth_headers(self) -> dict[str, str]:
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    result = await self._async_send(
+                        method, url, description, reader, **kwargs
+                    )
+                except _RetryableError as err:
+                    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt)
+                    delay = random.uniform(0, delay)
+                    if err.retry_after is not None:
+                        delay = err.retry_after
+                    if attempt == self.max_retries or delay > RETRY_MAX_DELAY:
+                        _LOGGER.error("Error getting %s: %s", description, err)
+                        break
+                    _LOGGER.debug(
+                        "Error getting %s: %s, retrying in %.1fs",
+                        description,
+                        err,
+                        delay,
+                    )
+                    await asyncio.sleep(delay)
+                else:
+                    self.circuit_breaker.record_success()
+                    return result
+        except asyncio.CancelledError:
+            self.circuit_breaker.record_cancelled()
+            raise
+
+        self.circuit_breaker.record_failure()
+        return None
+
+    async def _async_send(
+        self,
+        method: str,
+        url: str,
+        description: str,
+        reader: BodyReader = _async_read_json,
+        **kwargs: Any,
+    ) -> tuple[int, Any]:
+        """Send a single request and return the status and the body read by reader."""
+        async with self._request_semaphore:
+            if self.throttle is not None:
+                await self.throttle()
+            start = time.monotonic()
+            status: int | str = "error"
+            size = 0
+            try:
+                async with self.session.request(
+                    method, url, timeout=REQUEST_TIMEOUT, **kwargs
+                ) as response:
+                    status = response.status
+                    if status in RETRY_STATUSES:
+                        raise _RetryableError(
+                            f"status {status}", _retry_after(response)
+                        )
+                    if status != 200:
+                        return status, None
+                    try:
+                        data, size = await reader(response)
+                    except ValueError as err:
+                        status = "invalid_response"
+                        raise _RetryableError("invalid JSON response") from err
+                    return status, data
+            except TimeoutError as err:
+                status = "timeout"
+                raise _RetryableError("timeout") from err
+            except (OSError, ClientError) as err:
+                status = "connection_error"
+                raise _RetryableError(str(err) or type(err).__name__) from err
+            finally:
+                self.metrics.record_request(
+                    description, time.monotonic() - start, status, size
+                )
+
+    def _get_auth_headers(
+        self, accept: str = ACCEPT_HISTORICAL_RECORD
+    ) -> dict[str, str]:
         """Get headers with authorization token."""
-        accept_header = (
-            "application/vnd.obi.companion.energy-tracking.historical-record.v1+json"
-        )
         return {
-            "Accept": accept_header,
+            "Accept": accept,
             "Accept-Encoding": "gzip",
             "User-Agent": "app_client",
             "Authorization": f"Bearer {self.token}",
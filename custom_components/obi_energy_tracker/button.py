@@ -0,0 +1,48 @@
+"""Button platform for Obi EnergyTracker."""
+
+from __future__ import annotations
+
+from homeassistant.components.button import ButtonEntity
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from . import ObiEnergyTrackerConfigEntry
+from .coordinator import ObiEnergyTrackerCoordinator
+from .entity import ObiEntity
+
+PARALLEL_UPDATES = 1
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ObiEnergyTrackerConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up buttons from a config entry."""
+    coordinator = config_entry.runtime_data.hourly
+    if not coordinator.devices:
+        return
+
+    # The probe checks the account's connection, it is attached to its first device
+    first_device = next(iter(coordinator.devices.values())).device
+    async_add_entities([ObiProbeButton(coordinator, first_device)])
+
+
+class ObiProbeButton(ObiEntity[ObiEnergyTrackerCoordinator], ButtonEntity):
+    """Button checking the connection to the OBI cloud.
+
+    The result is shown in the diagnostics of the config entry.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_translation_key = "probe_connection"
+
+    @property
+    def available(self) -> bool:
+        """Return True, probing is most useful while refreshes fail."""
+        return True
+
+    async def async_press(self) -> None:
+        """Probe the connection."""
+        await self.coordinator.async_probe()
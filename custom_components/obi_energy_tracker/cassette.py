@@ -0,0 +1,339 @@
+"""Record and replay the backend traffic of the API client.
+
+A recording session wraps the real client session and writes every
+exchange to a cassette file; a replay session answers the same requests
+from a cassette without network access. Both plug in where the API client
+expects its aiohttp session, so everything above it behaves as usual.
+
+Credentials never reach the cassette: request headers and bodies are not
+recorded, login tokens are replaced and the account ID is substituted by a
+placeholder. On replay, a login answers with an unsigned token carrying the
+placeholder account.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import asyncio
+import base64
+from collections import defaultdict, deque
+from collections.abc import AsyncIterator, Awaitable, Generator
+from datetime import UTC, datetime, timedelta
+import json
+import logging
+from pathlib import Path
+import time
+from types import TracebackType
+from typing import Any, Self
+from urllib.parse import urlsplit
+
+from aiohttp import ClientSession
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from .api import decode_token_claims
+
+_LOGGER = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+
+REDACTED = "**REDACTED**"
+ACCOUNT_PLACEHOLDER = "cassette-account"
+# Response headers worth keeping, everything else is dropped
+RECORDED_HEADERS = (
+    "Cache-Control",
+    "Content-Type",
+    "ETag",
+    "Last-Modified",
+    "Retry-After",
+)
+# Personal data that may appear in responses
+REDACTED_KEYS = frozenset(
+    {"email", "firstName", "lastName", "password", "phone", "token"}
+)
+# Write a recording at most this often while requests keep coming in
+SAVE_INTERVAL = timedelta(seconds=30)
+
+
+class _CassetteContent:
+    """Reader over a captured body, a subset of aiohttp's StreamReader."""
+
+    def __init__(self, body: bytes) -> None:
+        """Initialize the reader."""
+        self._body = body
+
+    async def iter_chunked(self, size: int) -> AsyncIterator[bytes]:
+        """Yield the body in chunks of up to size bytes."""
+        for start in range(0, len(self._body), size):
+            yield self._body[start : start + size]
+
+
+class CassetteResponse:
+    """A response captured into or replayed from a cassette."""
+
+    def __init__(
+        self, method: str, url: str, status: int, headers: dict[str, str], body: bytes
+    ) -> None:
+        """Initialize the response."""
+        self.method = method
+        self.url = url
+        self.status = status
+        self.headers = CIMultiDictProxy(CIMultiDict(headers))
+        self.content = _CassetteContent(body)
+        self._body = body
+
+    async def read(self) -> bytes:
+        """Return the body."""
+        return self._body
+
+    async def text(self, encoding: str = "utf-8") -> str:
+        """Return the body as text."""
+        return self._body.decode(encoding)
+
+    async def json(self, **kwargs: Any) -> Any:
+        """Return the decoded JSON body."""
+        return json.loads(self._body) if self._body else None
+
+    def release(self) -> None:
+        """Release the response, nothing to do for a captured body."""
+
+    async def __aenter__(self) -> Self:
+        """Enter the response context."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Exit the response context."""
+
+
+class _RequestContext:
+    """Awaitable and async context manager around a pending response."""
+
+    def __init__(self, response: Awaitable[CassetteResponse]) -> None:
+        """Initialize the context."""
+        self._response = response
+
+    def __await__(self) -> Generator[Any, None, CassetteResponse]:
+        """Wait for the response."""
+        return self._response.__await__()
+
+    async def __aenter__(self) -> CassetteResponse:
+        """Wait for the response."""
+        return await self._response
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Exit the request context."""
+
+
+class _CassetteSession(ABC):
+    """Common interface of the cassette sessions, a subset of ClientSession."""
+
+    def request(self, method: str, url: str, **kwargs: Any) -> _RequestContext:
+        """Send a request."""
+        return _RequestContext(self._async_request(method, url, **kwargs))
+
+    def get(self, url: str, **kwargs: Any) -> _RequestContext:
+        """Send a GET request."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> _RequestContext:
+        """Send a POST request."""
+        return self.request("POST", url, **kwargs)
+
+    @abstractmethod
+    async def _async_request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> CassetteResponse:
+        """Return the response to a request."""
+
+
+def _account_id(token: str) -> str | None:
+    """Return the account ID from the claims of a JWT."""
+    try:
+        claims = decode_token_claims(token)
+    except (ValueError, TypeError):
+        return None
+    return claims.get("accountId")
+
+
+def _redact(data: Any) -> Any:
+    """Replace personal data in a decoded JSON body."""
+    if isinstance(data, dict):
+        return {
+            key: REDACTED if key in REDACTED_KEYS else _redact(value)
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [_redact(item) for item in data]
+    return data
+
+
+def _request_key(method: str, url: str) -> str:
+    """Return the key requests are matched by on replay."""
+    return f"{method.upper()} {urlsplit(url).path}"
+
+
+class RecordingSession(_CassetteSession):
+    """Session recording the exchanges of a real session to a cassette."""
+
+    def __init__(self, session: ClientSession, path: Path) -> None:
+        """Initialize the recording session."""
+        self.session = session
+        self.path = path
+        self.interactions: list[dict[str, Any]] = []
+        self._account_ids: set[str] = set()
+        self._last_save = time.monotonic()
+        self._save_task: asyncio.Task[None] | None = None
+
+    async def _async_request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> CassetteResponse:
+        """Send the request through the real session and record it."""
+        start = time.monotonic()
+        async with self.session.request(method, url, **kwargs) as response:
+            body = await response.read()
+            status = response.status
+            headers = {
+                name: response.headers[name]
+                for name in RECORDED_HEADERS
+                if name in response.headers
+            }
+            final_url = str(response.url)
+        elapsed = time.monotonic() - start
+
+        self._record(
+            method, final_url, kwargs.get("params"), status, headers, body, elapsed
+        )
+        return CassetteResponse(method, final_url, status, headers, body)
+
+    def _record(
+        self,
+        method: str,
+        url: str,
+        params: dict[str, str] | None,
+        status: int,
+        headers: dict[str, str],
+        body: bytes,
+        elapsed: float,
+    ) -> None:
+        """Add a redacted exchange to the cassette."""
+        text = body.decode("utf-8", errors="replace")
+        try:
+            data = json.loads(text)
+        except ValueError:
+            data = None
+        if (
+            isinstance(data, dict)
+            and isinstance(token := data.get("token"), str)
+            and (account_id := _account_id(token))
+        ):
+            self._account_ids.add(account_id)
+        if data is not None:
+            text = json.dumps(_redact(data), separators=(",", ":"))
+        for account_id in self._account_ids:
+            url = url.replace(account_id, ACCOUNT_PLACEHOLDER)
+            text = text.replace(account_id, ACCOUNT_PLACEHOLDER)
+
+        self.interactions.append(
+            {
+                "method": method.upper(),
+                "url": url.split("?", 1)[0],
+                "params": params,
+                "status": status,
+                "headers": headers,
+                "elapsed": round(elapsed, 4),
+                "body": text,
+            }
+        )
+        if time.monotonic() - self._last_save > SAVE_INTERVAL.total_seconds() and (
+            self._save_task is None or self._save_task.done()
+        ):
+            self._save_task = asyncio.get_running_loop().create_task(self.async_save())
+
+    async def async_save(self) -> None:
+        """Write the cassette."""
+        self._last_save = time.monotonic()
+        data = json.dumps(
+            {"version": CASSETTE_VERSION, "interactions": self.interactions},
+            indent=1,
+        )
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.path.write_text, data
+        )
+        _LOGGER.debug(
+            "Wrote %d interactions to cassette %s", len(self.interactions), self.path
+        )
+
+
+class ReplaySession(_CassetteSession):
+    """Session answering requests from a recorded cassette.
+
+    Requests are matched by method and URL path, in the recorded order; when
+    the recorded answers to a request are used up, they are replayed again
+    from the first. Requests without a recorded answer get a 404. Every
+    answer is delayed by its recorded duration divided by speed, a speed of
+    0 answers right away.
+    """
+
+    def __init__(self, interactions: list[dict[str, Any]], speed: float = 1.0) -> None:
+        """Initialize the replay session."""
+        self.speed = speed
+        self._recorded: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for interaction in interactions:
+            key = _request_key(interaction["method"], interaction["url"])
+            self._recorded[key].append(interaction)
+        self._pending: dict[str, deque[dict[str, Any]]] = {}
+
+    @classmethod
+    def load(cls, path: Path, speed: float = 1.0) -> ReplaySession:
+        """Load a cassette file; blocking."""
+        data = json.loads(path.read_text())
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version {data.get('version')}")
+        return cls(data["interactions"], speed)
+
+    async def _async_request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> CassetteResponse:
+        """Replay the next recorded answer to the request."""
+        key = _request_key(method, url)
+        if not (recorded := self._recorded.get(key)):
+            # Answered like an unknown resource, retrying would not help
+            _LOGGER.debug("No recorded answer to %s", key)
+            return CassetteResponse(method, url, 404, {}, b"")
+        pending = self._pending.get(key)
+        if not pending:
+            pending = self._pending[key] = deque(recorded)
+        interaction = pending.popleft()
+
+        if self.speed > 0 and interaction["elapsed"]:
+            await asyncio.sleep(interaction["elapsed"] / self.speed)
+
+        body = interaction["body"]
+        if interaction["status"] == 200 and key.endswith("/login"):
+            body = json.dumps({"token": _make_token()})
+        return CassetteResponse(
+            method, url, interaction["status"], interaction["headers"], body.encode()
+        )
+
+
+def _make_token() -> str:
+    """Return an unsigned JWT for the placeholder account, valid for an hour."""
+
+    def encode(data: dict[str, Any]) -> str:
+        raw = json.dumps(data, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    exp = int((datetime.now(UTC) + timedelta(hours=1)).timestamp())
+    header = encode({"alg": "none", "typ": "JWT"})
+    payload = encode({"accountId": ACCOUNT_PLACEHOLDER, "exp": exp})
+    signature = base64.urlsafe_b64encode(b"cassette").rstrip(b"=").decode()
+    return f"{header}.{payload}.{signature}"
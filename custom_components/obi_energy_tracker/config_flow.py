@@ -11,13 +11,36 @@ from homeassistant.config_entries import (
     ConfigEntry,
     ConfigFlow,
     ConfigFlowResult,
-    OptionsFlow,
+    OptionsFlowWithReload,
 )
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
-
-from .api import ObiEnergyTrackerAPI
-from .const import CONF_BRIDGE_ID, CONF_COUNTRY, CONF_DEVICE_ID, DOMAIN
+from homeassistant.core import callback
+
+from .accounts import async_get_accounts
+from .const import (
+    CONF_BRIDGE_ID,
+    CONF_COUNTRY,
+    CONF_DAILY_RETENTION,
+    CONF_DEVICE_ID,
+    CONF_DEVICES,
+    CONF_HOURLY_RETENTION,
+    CONF_HOURLY_SCAN_INTERVAL,
+    CONF_MAX_CONNECTIONS,
+    CONF_MAX_RETRIES,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MONTHLY_RETENTION,
+    DEFAULT_DAILY_RETENTION,
+    DEFAULT_HOURLY_RETENTION,
+    DEFAULT_HOURLY_SCAN_INTERVAL,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_MONTHLY_RETENTION,
+    DOMAIN,
+)
+from .transport import async_get_transport
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -43,6 +66,14 @@ class ObiEnergyTrackerConfigFlow(ConfigFlow, domain=DOMAIN):
         """Return options flow support for this handler."""
         return True
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: ConfigEntry,
+    ) -> ObiEnergyTrackerOptionsFlow:
+        """Create the options flow."""
+        return ObiEnergyTrackerOptionsFlow()
+
     async def async_step_discovery(  # pylint: disable=unused-argument
         self, discovery_info: dict[str, Any]
     ) -> ConfigFlowResult:
@@ -56,30 +87,44 @@ class ObiEnergyTrackerConfigFlow(ConfigFlow, domain=DOMAIN):
         errors: dict[str, str] = {}
 
         if user_input is not None:
-            # Check for duplicate entries
+            # Check for duplicate entries; an account is configured only once,
+            # so its data is polled and stored by a single coordinator
+            email = user_input[CONF_EMAIL].casefold()
+            if any(
+                entry.data[CONF_EMAIL].casefold() == email
+                for entry in self._async_current_entries(include_ignore=False)
+            ):
+                return self.async_abort(reason="already_configured")
             await self.async_set_unique_id(user_input[CONF_EMAIL])
             self._abort_if_unique_id_configured()
 
-            # Test the connection
-            session = async_create_clientsession(self.hass)
-            api = ObiEnergyTrackerAPI(
-                session,
+            # Test the connection; the client is kept for a moment after
+            # the flow, so the new entry reuses its token
+            accounts = async_get_accounts(self.hass)
+            api = accounts.async_acquire(
+                self.flow_id,
+                session=async_get_transport(self.hass).session,
                 email=user_input[CONF_EMAIL],
                 password=user_input[CONF_PASSWORD],
                 country=user_input.get(CONF_COUNTRY, "DE"),
             )
-
-            if await api.async_login():
-                if info := await api.async_get_bridge_info():
-                    user_input[CONF_BRIDGE_ID] = info["bridge_id"]
-                    user_input[CONF_DEVICE_ID] = info["device_id"]
-                    return self.async_create_entry(
-                        title=user_input[CONF_EMAIL],
-                        data=user_input,
-                    )
-                errors["base"] = "no_devices"
-            else:
-                errors["base"] = "invalid_auth"
+            try:
+                if await api.async_ensure_token():
+                    if devices := await api.async_get_devices():
+                        user_input[CONF_BRIDGE_ID] = devices[0].bridge_id
+                        user_input[CONF_DEVICE_ID] = devices[0].device_id
+                        user_input[CONF_DEVICES] = [
+                            device.as_dict() for device in devices
+                        ]
+                        return self.async_create_entry(
+                            title=user_input[CONF_EMAIL],
+                            data=user_input,
+                        )
+                    errors["base"] = "no_devices"
+                else:
+                    errors["base"] = "invalid_auth"
+            finally:
+                accounts.async_release(self.flow_id, api)
 
         return self.async_show_form(
             step_id="user",
@@ -88,11 +133,76 @@ class ObiEnergyTrackerConfigFlow(ConfigFlow, domain=DOMAIN):
         )
 
 
-class ObiEnergyTrackerOptionsFlow(OptionsFlow):
+class ObiEnergyTrackerOptionsFlow(OptionsFlowWithReload):
     """Handle options flow for Obi EnergyTracker."""
 
-    async def async_step_init(  # pylint: disable=unused-argument
+    async def async_step_init(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Manage the options."""
-        return self.async_show_form(step_id="init")
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            if user_input[CONF_MIN_SCAN_INTERVAL] > min(
+                user_input[CONF_MAX_SCAN_INTERVAL],
+                user_input[CONF_HOURLY_SCAN_INTERVAL],
+            ):
+                errors["base"] = "invalid_scan_interval"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        options = user_input or self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_MIN_SCAN_INTERVAL,
+                        default=options.get(
+                            CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=30, max=3600)),
+                    vol.Optional(
+                        CONF_MAX_SCAN_INTERVAL,
+                        default=options.get(
+                            CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=60, max=86400)),
+                    vol.Optional(
+                        CONF_HOURLY_SCAN_INTERVAL,
+                        default=options.get(
+                            CONF_HOURLY_SCAN_INTERVAL, DEFAULT_HOURLY_SCAN_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=300, max=86400)),
+                    vol.Optional(
+                        CONF_MAX_CONNECTIONS,
+                        default=options.get(
+                            CONF_MAX_CONNECTIONS, DEFAULT_MAX_CONNECTIONS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
+                    vol.Optional(
+                        CONF_MAX_RETRIES,
+                        default=options.get(CONF_MAX_RETRIES, DEFAULT_MAX_RETRIES),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=10)),
+                    vol.Optional(
+                        CONF_HOURLY_RETENTION,
+                        default=options.get(
+                            CONF_HOURLY_RETENTION, DEFAULT_HOURLY_RETENTION
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=2, max=93)),
+                    vol.Optional(
+                        CONF_DAILY_RETENTION,
+                        default=options.get(
+                            CONF_DAILY_RETENTION, DEFAULT_DAILY_RETENTION
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=31, max=1830)),
+                    vol.Optional(
+                        CONF_MONTHLY_RETENTION,
+                        default=options.get(
+                            CONF_MONTHLY_RETENTION, DEFAULT_MONTHLY_RETENTION
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=600)),
+                }
+            ),
+            errors=errors,
+        )
@@ -1,15 +1,48 @@
 """Constants for the obienergytracker integration."""
 
+from datetime import timedelta
+
 DOMAIN = "obi_energy_tracker"
 
 # Config constants
 CONF_COUNTRY = "country"
 CONF_BRIDGE_ID = "bridge_id"
 CONF_DEVICE_ID = "device_id"
+CONF_DEVICES = "devices"
+CONF_MAX_CONNECTIONS = "max_connections"
+CONF_MAX_RETRIES = "max_retries"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+CONF_HOURLY_SCAN_INTERVAL = "hourly_scan_interval"
+CONF_HOURLY_RETENTION = "hourly_retention_days"
+CONF_DAILY_RETENTION = "daily_retention_days"
+CONF_MONTHLY_RETENTION = "monthly_retention_months"
+CONF_CASSETTE = "cassette"
+CONF_SPEED = "speed"
+
+# Cassette modes
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
 
 # Default values
 DEFAULT_COUNTRY = "DE"
-DEFAULT_SCAN_INTERVAL = 300  # 5 minutes
+DEFAULT_SCAN_INTERVAL = 60  # 1 minute
+DEFAULT_MIN_SCAN_INTERVAL = 60  # 1 minute
+DEFAULT_MAX_SCAN_INTERVAL = 1800  # 30 minutes
+DEFAULT_HOURLY_SCAN_INTERVAL = 3600  # 1 hour
+DEFAULT_MAX_CONNECTIONS = 4
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_HOURLY_RETENTION = 7  # days
+DEFAULT_DAILY_RETENTION = 400  # days
+DEFAULT_MONTHLY_RETENTION = 120  # months
+
+# Hours that ended less than this long ago may still be revised by the backend
+HOURLY_FINALIZATION_DELAY = timedelta(hours=1)
+
+# Storage
+STORAGE_KEY = DOMAIN
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 30  # seconds
 
 # Data attributes
 ATTR_BRIDGE_ID = "bridge_id"
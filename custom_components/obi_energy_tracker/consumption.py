@@ -0,0 +1,66 @@
+"""Running consumption totals of the current day, week and month."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+
+from homeassistant.util import dt as dt_util
+
+from .retention import EnergyHistory
+
+PERIOD_DAY = "day"
+PERIOD_WEEK = "week"
+PERIOD_MONTH = "month"
+PERIODS = (PERIOD_DAY, PERIOD_WEEK, PERIOD_MONTH)
+
+
+def period_starts(now: datetime) -> dict[str, datetime]:
+    """Return the (UTC) start of the current day, week and month.
+
+    Periods follow the local time zone; weeks start on Monday.
+    """
+    today = dt_util.as_local(now).date()
+    return {
+        PERIOD_DAY: dt_util.as_utc(dt_util.start_of_local_day(today)),
+        PERIOD_WEEK: dt_util.as_utc(
+            dt_util.start_of_local_day(today - timedelta(days=today.weekday()))
+        ),
+        PERIOD_MONTH: dt_util.as_utc(dt_util.start_of_local_day(today.replace(day=1))),
+    }
+
+
+class PeriodTotals:
+    """Import and export totals of the current periods, kept incrementally.
+
+    Changed hours are added to the running sums of the periods they fall in;
+    the history is only summed up again when a new period begins.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the totals."""
+        self.starts: dict[str, datetime] = {}
+        self.totals: dict[str, dict[str, float]] = {}
+
+    def apply(self, changes: Mapping[datetime, Mapping[str, float]]) -> None:
+        """Add the changes of merged hours to the running sums."""
+        for period, start in self.starts.items():
+            totals = self.totals[period]
+            for hour, deltas in changes.items():
+                if hour < start:
+                    continue
+                for measure, delta in deltas.items():
+                    totals[measure] += delta
+
+    def roll(self, history: EnergyHistory, now: datetime) -> None:
+        """Start new periods, summing up their history held so far."""
+        for period, start in period_starts(now).items():
+            if self.starts.get(period) != start:
+                self.starts[period] = start
+                self.totals[period] = history.sum_between(start)
+
+    def get(self, period: str, measure: str) -> float | None:
+        """Return the total of a measure in the current period."""
+        if (totals := self.totals.get(period)) is None:
+            return None
+        return totals.get(measure)
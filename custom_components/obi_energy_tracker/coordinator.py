@@ -2,72 +2,766 @@
 
 from __future__ import annotations
 
+from abc import ABC, abstractmethod
+import asyncio
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from itertools import pairwise
 import logging
-from typing import Any
+import time
+from typing import Any, override
 
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .api import ObiEnergyTrackerAPI
-from .const import DOMAIN
+from .const import (
+    CONF_DEVICES,
+    CONF_HOURLY_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    DEFAULT_HOURLY_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    HOURLY_FINALIZATION_DELAY,
+    STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .consumption import PeriodTotals, period_starts
+from .gaps import GapTracker, gap_windows
+from .history import (
+    DayRecords,
+    HistoryCache,
+    chunk_indexes,
+    day_starts,
+    split_days,
+)
+from .metrics import RefreshMetrics
+from .models import (
+    HourlySeries,
+    MeterSeries,
+    ObiDevice,
+    parse_meter_series,
+)
+from .retention import EnergyHistory, HistoryRecord, RetentionPolicy
+from .scheduler import AdaptivePollScheduler
+from .statistics import ObiStatisticsImporter
 
 _LOGGER = logging.getLogger(__name__)
 
-SCAN_INTERVAL = timedelta(minutes=5)
-DAYS_OF_HISTORY = 7
+# Meter readings are polled this often until their cadence is learned
+SCAN_INTERVAL = timedelta(seconds=DEFAULT_SCAN_INTERVAL)
 
 
-class ObiEnergyTrackerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
-    """Data update coordinator for Obi EnergyTracker."""
+@dataclass(slots=True)
+class ObiDeviceData:
+    """Data held for one energy tracker device."""
+
+    device: ObiDevice
+    meter: MeterSeries = field(default_factory=MeterSeries)
+    # Recent hourly measures, older ones rolled up into daily and monthly sums
+    history: EnergyHistory = field(default_factory=EnergyHistory)
+    # Hours before this point are final and are not fetched again
+    finalized_until: datetime | None = None
+    # Start of the hours fetched so far, older hours were never requested
+    history_from: datetime | None = None
+    # Running totals of the current day, week and month
+    totals: PeriodTotals = field(default_factory=PeriodTotals)
+    # Hours missing from the finalized history
+    gaps: GapTracker = field(default_factory=GapTracker)
+    # Earliest finalized hour filled in since the last statistics import
+    refilled_from: datetime | None = None
+
+    @property
+    def hourly(self) -> HourlySeries:
+        """Return the hourly measures keyed by the (UTC) start of the hour."""
+        return self.history.hourly
+
+    def meter_fingerprint(self) -> tuple[Any, ...]:
+        """Return a summary that changes whenever a value of the meter does."""
+        meter = self.meter
+        return (meter.latest_time, meter.latest_value, meter.power)
+
+    def totals_fingerprint(self) -> tuple[Any, ...]:
+        """Return a summary that changes whenever a period total does."""
+        return (
+            tuple(self.totals.starts.values()),
+            tuple(tuple(totals.values()) for totals in self.totals.totals.values()),
+        )
+
+
+def _interval(options: Mapping[str, Any], key: str, default: int) -> timedelta:
+    """Return an interval configured in seconds in the options."""
+    return timedelta(seconds=options.get(key, default))
+
+
+class ObiTierCoordinator(DataUpdateCoordinator[dict[str, ObiDeviceData]], ABC):
+    """Base of the coordinators refreshing one tier of the device data.
+
+    The meter readings and the hourly history are polled on their own
+    schedules by separate coordinators. Both update the same device data and
+    use the same API client, sharing its token, circuit breaker and
+    connections; entities listen to the coordinator of the data they show.
+    """
+
+    config_entry: ConfigEntry
+    # Name of the tier, part of the coordinator name and the refresh signal
+    tier: str
 
     def __init__(
         self,
         hass: HomeAssistant,
         api: ObiEnergyTrackerAPI,
         config_entry: Any,
+        devices: dict[str, ObiDeviceData],
+        scheduler: AdaptivePollScheduler,
     ) -> None:
         """Initialize the coordinator."""
         super().__init__(
             hass,
             _LOGGER,
-            name=DOMAIN,
-            update_interval=SCAN_INTERVAL,
+            name=f"{DOMAIN}_{self.tier}",
+            update_interval=scheduler.default_interval,
             config_entry=config_entry,
         )
         self.api = api
+        self.devices = devices
+        self.scheduler = scheduler
+        # Duration in seconds of the parts of the last refresh, keyed by
+        # "<device_id>/<tier>" and "total"
+        self.fetch_timings: dict[str, float] = {}
+        self.refresh_metrics = RefreshMetrics()
+        # Fingerprints of the tier's device data after the last refresh,
+        # listeners are only updated when they or the availability changed
+        self.fingerprints: dict[str, tuple[Any, ...]] = {}
+        self._notified_state: tuple[bool, dict[str, tuple[Any, ...]]] | None = None
+        # Sent after every refresh, for entities showing refresh metrics
+        self.refresh_signal = (
+            f"{DOMAIN}_{config_entry.entry_id}_{self.tier}_refresh_finished"
+        )
+
+    @abstractmethod
+    def _fingerprint(self, data: ObiDeviceData) -> tuple[Any, ...]:
+        """Return a summary of the device data shown by the tier's entities."""
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data from API.
+    def _update_fingerprints(self) -> None:
+        """Take the fingerprints of all devices."""
+        self.fingerprints = {
+            device_id: self._fingerprint(data)
+            for device_id, data in self.devices.items()
+        }
+
+    @override
+    @callback
+    def _async_refresh_finished(self) -> None:
+        """Tell the entities showing refresh metrics that a refresh finished.
 
-        Retrieves:
-        - Meter reading (Zählerstand) for the device
-        - Hourly energy data for the past 7 days
+        DataUpdateCoordinator calls this after every refresh of the tier,
+        successful or not, before it updates the listeners.
         """
+        async_dispatcher_send(self.hass, self.refresh_signal)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners, unless neither data nor availability changed."""
+        state = (self.last_update_success, self.fingerprints)
+        if state == self._notified_state:
+            _LOGGER.debug("Unchanged %s data, not updating the entities", self.tier)
+            return
+        self._notified_state = state
+        super().async_update_listeners()
+
+    async def _async_update_data(self) -> dict[str, ObiDeviceData]:
+        """Fetch data from API, recording the duration of the refresh."""
+        start = time.monotonic()
+        success = False
         try:
-            meter = await self.api.async_get_meter_data()
-            _LOGGER.debug("Meter data: %s", meter)
-
-            # Fetch hourly data for past days (default 7 days)
-            end_date = datetime.now()
-            hourly_data = await self.api.async_get_hourly_data(
-                start_date=end_date,
-                num_days=DAYS_OF_HISTORY,
+            data = await self._async_update_devices()
+            success = True
+        finally:
+            self.refresh_metrics.record(time.monotonic() - start, success)
+        return data
+
+    @abstractmethod
+    async def _async_update_devices(self) -> dict[str, ObiDeviceData]:
+        """Fetch the tier's data of all devices."""
+
+    async def _async_ensure_backend(self) -> None:
+        """Raise UpdateFailed unless the backend may be tried and logged in to."""
+        if (retry_in := self.api.circuit_breaker.retry_in) > 0:
+            # Check back as soon as the backend may be tried again
+            self.update_interval = max(
+                self.scheduler.min_interval, timedelta(seconds=retry_in)
             )
-            _LOGGER.debug(
-                "Hourly data fetched: %s", "available" if hourly_data else "none"
+            raise UpdateFailed(
+                f"Obi EnergyTracker unavailable, retrying in {self.update_interval}"
             )
 
-            _LOGGER.info(
-                "Successfully fetched data: meter=%s, hourly_days=%d",
-                "available" if meter else "none",
-                DAYS_OF_HISTORY,
+        if not await self.api.async_ensure_token():
+            raise UpdateFailed("Failed to authenticate with Obi EnergyTracker")
+
+    async def _async_fetch_devices[T](
+        self, fetch: Callable[[ObiDeviceData], Awaitable[T | None]]
+    ) -> dict[str, T | None]:
+        """Run fetch for all devices concurrently, timing it per device.
+
+        Returns the results by device ID; a fetch that raised is logged and
+        returned as None like a failed one, it does not affect the other
+        devices. Devices discovered meanwhile are left for the next refresh.
+        """
+        devices = list(self.devices.items())
+        start = time.monotonic()
+        results = await asyncio.gather(
+            *(
+                self._async_timed(f"{device_id}/{self.tier}", fetch(data))
+                for device_id, data in devices
+            ),
+            return_exceptions=True,
+        )
+        self.fetch_timings["total"] = time.monotonic() - start
+
+        fetched: dict[str, T | None] = {}
+        for (device_id, _), result in zip(devices, results, strict=True):
+            if isinstance(result, BaseException):
+                _LOGGER.warning(
+                    "Failed to update %s data of %s: %s", self.tier, device_id, result
+                )
+                result = None
+            _LOGGER.debug(
+                "Fetched %s data of %s: %s (%.3fs)",
+                self.tier,
+                device_id,
+                "failed" if result is None else "available",
+                self.fetch_timings[f"{device_id}/{self.tier}"],
             )
-        except OSError as err:
-            _LOGGER.error("Failed to update data: %s", err)
-            raise UpdateFailed(f"Failed to update data: {err}") from err
+            fetched[device_id] = result
+        return fetched
+
+    async def _async_timed[T](self, name: str, target: Awaitable[T]) -> T:
+        """Await target and record how long it took."""
+        start = time.monotonic()
+        try:
+            return await target
+        finally:
+            self.fetch_timings[name] = time.monotonic() - start
+
 
+class ObiEnergyTrackerCoordinator(ObiTierCoordinator):
+    """Coordinator of the hourly history of all devices of an account.
+
+    It owns the device data: it discovers the devices, restores and saves
+    their data, keeps the period totals and imports the statistics. The
+    meter readings are polled by ObiMeterCoordinator.
+    """
+
+    tier = "hourly"
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: ObiEnergyTrackerAPI,
+        config_entry: Any,
+        devices: list[ObiDevice] | None = None,
+    ) -> None:
+        """Initialize the coordinator."""
+        options = config_entry.options
+        hourly_interval = _interval(
+            options, CONF_HOURLY_SCAN_INTERVAL, DEFAULT_HOURLY_SCAN_INTERVAL
+        )
+        super().__init__(
+            hass,
+            api,
+            config_entry,
+            {device.device_id: ObiDeviceData(device) for device in devices or []},
+            AdaptivePollScheduler(
+                min_interval=_interval(
+                    options, CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL
+                ),
+                max_interval=hourly_interval,
+                default_interval=hourly_interval,
+            ),
+        )
+        self.retention = RetentionPolicy.from_options(options)
+        self._store = Store[dict[str, Any]](
+            hass, STORAGE_VERSION, f"{STORAGE_KEY}.{config_entry.entry_id}"
+        )
+        # Result of the last connectivity probe, run on request only
+        self.last_probe: dict[str, Any] | None = None
+        # Finished days fetched for history queries
+        self.history_cache = HistoryCache()
+        self._statistics: dict[str, ObiStatisticsImporter] = {}
+        self._statistics_task: asyncio.Task[None] | None = None
+        self._discovery_task: asyncio.Task[None] | None = None
+
+    async def async_restore(self) -> bool:
+        """Restore the last known state from storage.
+
+        Returns True if stored data was found for all devices, the entities
+        can then be set up before the first refresh against the cloud.
+        """
+        if not (stored := await self._store.async_load()):
+            return False
+
+        stored_devices: dict[str, Any] = stored.get("devices", {})
+        for device_id, device_data in stored_devices.items():
+            if device_id not in self.devices:
+                if self.devices:
+                    # Removed from the config entry since it was stored
+                    continue
+                self.devices[device_id] = ObiDeviceData(
+                    ObiDevice(device_data["bridge_id"], device_id)
+                )
+            data = self.devices[device_id]
+            data.meter = parse_meter_series(device_data.get("meter"))
+            history = data.history
+            for tier in ("hourly", "daily", "monthly"):
+                setattr(
+                    history,
+                    tier,
+                    HourlySeries.from_records(
+                        {
+                            start: measures
+                            for timestamp, measures in device_data.get(tier, {}).items()
+                            if (start := dt_util.parse_datetime(timestamp)) is not None
+                        }
+                    ),
+                )
+            if rolled_until := device_data.get("rolled_until"):
+                history.rolled_until = dt_util.parse_datetime(rolled_until)
+            if finalized_until := device_data.get("finalized_until"):
+                data.finalized_until = dt_util.parse_datetime(finalized_until)
+            if history_from := device_data.get("history_from"):
+                data.history_from = dt_util.parse_datetime(history_from)
+            data.totals.roll(data.history, dt_util.utcnow())
+
+        if not self.devices or not self.devices.keys() <= stored_devices.keys():
+            return False
+
+        self.data = self.devices
+        self._update_fingerprints()
+        _LOGGER.debug("Restored %d devices from storage", len(self.devices))
+        return True
+
+    @callback
+    def _data_to_store(self) -> dict[str, Any]:
+        """Return the state to persist between restarts."""
         return {
-            "hourly": hourly_data,
-            "meter": meter,
+            "devices": {
+                device_id: {
+                    "bridge_id": data.device.bridge_id,
+                    "meter": data.meter.as_records(),
+                    **{
+                        tier: {
+                            start.isoformat(): measures
+                            for start, measures in series.items()
+                        }
+                        for tier, series in (
+                            ("hourly", data.history.hourly),
+                            ("daily", data.history.daily),
+                            ("monthly", data.history.monthly),
+                        )
+                    },
+                    "rolled_until": (
+                        data.history.rolled_until.isoformat()
+                        if data.history.rolled_until
+                        else None
+                    ),
+                    "finalized_until": (
+                        data.finalized_until.isoformat()
+                        if data.finalized_until
+                        else None
+                    ),
+                    "history_from": (
+                        data.history_from.isoformat() if data.history_from else None
+                    ),
+                }
+                for device_id, data in self.devices.items()
+            }
         }
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Save the data of all devices after a delay."""
+        self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+
+    def _fingerprint(self, data: ObiDeviceData) -> tuple[Any, ...]:
+        """Return a summary of the period totals."""
+        return data.totals_fingerprint()
+
+    async def async_probe(self) -> dict[str, Any]:
+        """Check the connection to the backend and remember the result."""
+        self.last_probe = await self.api.async_probe()
+        _LOGGER.debug("Connectivity probe: %s", self.last_probe)
+        return self.last_probe
+
+    async def async_get_history(
+        self, device_id: str, start: datetime, end: datetime
+    ) -> DayRecords | None:
+        """Return the hourly records of a device from start up to end.
+
+        The range is split into local days. Days within the retained hours
+        are answered from memory and finished days from the history cache;
+        the others are fetched in concurrent chunks of consecutive days.
+        Returns None if a request failed.
+        """
+        data = self.devices[device_id]
+        days = day_starts(start, end)
+        # Days ending before this will not change anymore and may be cached
+        final_until = (
+            dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+            - HOURLY_FINALIZATION_DELAY
+        )
+        retained_from = data.history_from
+        if retained_from is not None and (rolled_until := data.history.rolled_until):
+            # Older days are only held as daily sums
+            retained_from = max(retained_from, rolled_until)
+        retained_until = data.finalized_until
+
+        records: DayRecords = {}
+        missing: list[int] = []
+        for index, day in enumerate(days[:-1]):
+            day_end = days[index + 1]
+            if (
+                retained_from is not None
+                and retained_until is not None
+                and retained_from <= day
+                and day_end <= retained_until
+            ):
+                records.update(data.hourly.items_between(day, day_end))
+            elif (
+                day_end <= final_until
+                and (cached := self.history_cache.get(device_id, day)) is not None
+            ):
+                records.update(cached)
+            else:
+                missing.append(index)
+
+        chunks = chunk_indexes(missing)
+        results = await asyncio.gather(
+            *(
+                self.api.async_get_hourly_series(
+                    days[chunk.start], days[chunk.stop], data.device
+                )
+                for chunk in chunks
+            )
+        )
+        for chunk, series in zip(chunks, results, strict=True):
+            if series is None:
+                return None
+            chunk_days = days[chunk.start : chunk.stop + 1]
+            by_day = split_days(series, chunk_days)
+            for day, day_end in pairwise(chunk_days):
+                records.update(by_day[day])
+                if day_end <= final_until:
+                    self.history_cache.put(device_id, day, by_day[day])
+
+        _LOGGER.debug(
+            "History of %s from %s to %s: %d days, %d fetched in %d requests",
+            device_id,
+            start,
+            end,
+            len(days) - 1,
+            len(missing),
+            len(chunks),
+        )
+        return {hour: records[hour] for hour in sorted(records) if start <= hour < end}
+
+    def get_history_sums(
+        self, device_id: str, start: datetime, end: datetime, resolution: str
+    ) -> list[HistoryRecord]:
+        """Return the sums of a device per local day or month from start up to end.
+
+        Answered from the tiers of the retained history without requests, so
+        the range is limited by the retention, not by HISTORY_MAX_RANGE.
+        """
+        return self.devices[device_id].history.resample(start, end, resolution)
+
+    def _async_schedule_discovery(self) -> None:
+        """Look up the devices of the account without delaying the refresh."""
+        if self._discovery_task and not self._discovery_task.done():
+            return
+        self._discovery_task = self.config_entry.async_create_background_task(
+            self.hass, self._async_discover_devices(), f"{DOMAIN}_discover_devices"
+        )
+
+    async def _async_discover_devices(self) -> None:
+        """Look up all devices of the account and remember them."""
+        if (devices := await self.api.async_get_devices()) is None:
+            return
+
+        _LOGGER.debug("Discovered devices: %s", devices)
+        added = False
+        for device in devices:
+            if device.device_id not in self.devices:
+                self.devices[device.device_id] = ObiDeviceData(device)
+                added = True
+
+        self.hass.config_entries.async_update_entry(
+            self.config_entry,
+            data={
+                **self.config_entry.data,
+                CONF_DEVICES: [device.as_dict() for device in devices],
+            },
+        )
+        if added and self.data is not None:
+            # Entities were set up already, add the new devices' entities
+            self.hass.config_entries.async_schedule_reload(self.config_entry.entry_id)
+
+    async def _async_update_devices(self) -> dict[str, ObiDeviceData]:
+        """Fetch the hourly data of all devices.
+
+        Retrieves concurrently for every device the hourly energy data since
+        the last finalized hour and merges it into the tiered history (hours
+        of the hourly tier, older days and months as sums).
+
+        A failing request keeps the last good data of its device; the
+        update only fails if nothing could be fetched at all.
+        """
+        await self._async_ensure_backend()
+
+        if CONF_DEVICES not in self.config_entry.data:
+            if self.devices:
+                # The device IDs stored by an older version are enough to
+                # start, the rest of the account is looked up in the background
+                self._async_schedule_discovery()
+            else:
+                await self._async_discover_devices()
+        if not self.devices:
+            raise UpdateFailed("No Obi EnergyTracker devices found")
+
+        results = await self._async_fetch_devices(self._async_update_hourly)
+        if all(result is None for result in results.values()):
+            raise UpdateFailed("Failed to update hourly data")
+
+        self._async_schedule_statistics_import()
+        self.async_schedule_save()
+
+        now = dt_util.utcnow()
+        for device_id, data in self.devices.items():
+            # Start new periods even if the hourly data could not be fetched
+            data.totals.roll(data.history, now)
+            self.scheduler.record(f"{device_id}/hourly", data.hourly.latest_time, now)
+        self.update_interval = self.scheduler.next_interval(now)
+        self._update_fingerprints()
+
+        _LOGGER.debug(
+            "Fetched hourly data of %d devices in %.3fs, next poll in %s",
+            len(self.devices),
+            self.fetch_timings["total"],
+            self.update_interval,
+        )
+
+        return self.devices
+
+    @callback
+    def _async_schedule_statistics_import(self) -> None:
+        """Import newly finalized hours into the long-term statistics."""
+        if self._statistics_task and not self._statistics_task.done():
+            # A backfill is still running, it picks up the new hours next time
+            return
+        self._statistics_task = self.config_entry.async_create_background_task(
+            self.hass,
+            self._async_import_statistics(),
+            f"{DOMAIN}_statistics_import",
+        )
+
+    async def _async_import_statistics(self) -> None:
+        """Import the statistics of all devices one after another."""
+        for device_id, data in self.devices.items():
+            if data.finalized_until is None:
+                continue
+            if (importer := self._statistics.get(device_id)) is None:
+                importer = self._statistics[device_id] = ObiStatisticsImporter(
+                    self.hass, self.api, data.device
+                )
+            if data.refilled_from is not None:
+                importer.invalidate(data.refilled_from)
+                data.refilled_from = None
+            await importer.async_sync(data.hourly, data.finalized_until)
+
+    async def _async_update_hourly(self, data: ObiDeviceData) -> int | None:
+        """Fetch the not yet finalized hours and merge them into the history.
+
+        Returns the number of hourly records received, None if the request
+        failed.
+        """
+        now = dt_util.utcnow()
+        current_hour = now.replace(minute=0, second=0, microsecond=0)
+        # Fetch at least the current month for the period totals
+        history_start = min(
+            current_hour - timedelta(days=self.retention.hourly_days),
+            *period_starts(now).values(),
+        )
+
+        if data.history_from is None or data.history_from > history_start:
+            start = history_start
+        else:
+            start = max(data.finalized_until or history_start, history_start)
+
+        records = await self.api.async_get_hourly_series(
+            start, current_hour + timedelta(hours=1), data.device
+        )
+        if records is None:
+            # Keep the window open so the missed hours are fetched next time
+            return None
+
+        history = data.history
+        data.totals.apply(history.merge(records))
+        data.totals.roll(history, now)
+        history.roll_up(now, self.retention)
+        if data.history_from is None or data.history_from > start:
+            data.history_from = start
+
+        # Never finalize past the newest record, the backend may publish late
+        finalized_until = current_hour - HOURLY_FINALIZATION_DELAY
+        if (latest := history.hourly.latest_time) is not None:
+            finalized_until = min(finalized_until, latest + timedelta(hours=1))
+        else:
+            finalized_until = start
+        data.finalized_until = max(finalized_until, start)
+
+        return len(records) + await self._async_fill_gaps(data, now)
+
+    async def _async_fill_gaps(self, data: ObiDeviceData, now: datetime) -> int:
+        """Re-fetch the hours missing from the finalized history.
+
+        Hours after finalized_until are fetched with every poll anyway. The
+        others are requested again with their own backoff, neighbouring
+        hours in a common window; the statistics are imported again from the
+        earliest filled hour. Returns the number of records received.
+        """
+        hourly = data.hourly
+        if (first := hourly.first_time) is None or data.finalized_until is None:
+            return 0
+        hours = data.gaps.due(hourly.missing_hours(first, data.finalized_until), now)
+        if not hours:
+            return 0
+
+        windows = gap_windows(hours)
+        data.gaps.record_attempt(hours, now)
+        results = await asyncio.gather(
+            *(
+                self.api.async_get_hourly_series(start, end, data.device)
+                for start, end in windows
+            )
+        )
+        received = 0
+        for (start, end), series in zip(windows, results, strict=True):
+            if series is None:
+                continue
+            records = dict(series.items_between(start, end))
+            received += len(records)
+            changes = data.history.merge(records)
+            data.totals.apply(changes)
+            if changes and (
+                data.refilled_from is None or min(changes) < data.refilled_from
+            ):
+                # The statistics imported these hours without the new values
+                data.refilled_from = min(changes)
+
+        _LOGGER.debug(
+            "Re-fetched %d missing hours of %s in %d requests, received %d",
+            len(hours),
+            data.device.device_id,
+            len(windows),
+            received,
+        )
+        return received
+
+
+class ObiMeterCoordinator(ObiTierCoordinator):
+    """Coordinator of the meter readings of all devices of an account.
+
+    The meter window is one small request per device, so it is polled much
+    more often than the hourly history. The devices and the storage of
+    their data belong to the hourly coordinator.
+    """
+
+    tier = "meter"
+
+    def __init__(
+        self, hass: HomeAssistant, hourly: ObiEnergyTrackerCoordinator
+    ) -> None:
+        """Initialize the coordinator."""
+        options = hourly.config_entry.options
+        super().__init__(
+            hass,
+            hourly.api,
+            hourly.config_entry,
+            hourly.devices,
+            AdaptivePollScheduler(
+                min_interval=_interval(
+                    options, CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL
+                ),
+                max_interval=_interval(
+                    options, CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL
+                ),
+                default_interval=SCAN_INTERVAL,
+            ),
+        )
+        self._hourly = hourly
+
+    @callback
+    def async_restore(self) -> None:
+        """Use the device data the hourly coordinator restored from storage."""
+        self.data = self.devices
+        self._update_fingerprints()
+
+    def _fingerprint(self, data: ObiDeviceData) -> tuple[Any, ...]:
+        """Return a summary of the meter readings."""
+        return data.meter_fingerprint()
+
+    async def _async_update_devices(self) -> dict[str, ObiDeviceData]:
+        """Fetch the meter readings (Zählerstand) of all devices.
+
+        A failing request keeps the last good readings of its device; the
+        update only fails if no readings could be fetched at all.
+        """
+        await self._async_ensure_backend()
+        if not self.devices:
+            # Devices are discovered by the hourly coordinator
+            raise UpdateFailed("No Obi EnergyTracker devices found")
+
+        results = await self._async_fetch_devices(
+            lambda data: self.api.async_get_meter_data(data.device)
+        )
+        if all(result is None for result in results.values()):
+            raise UpdateFailed("Failed to update meter data")
+
+        now = dt_util.utcnow()
+        for device_id, meter in results.items():
+            data = self.devices[device_id]
+            if meter is not None and (meter_series := parse_meter_series(meter)):
+                data.meter = meter_series
+            self.scheduler.record(f"{device_id}/meter", data.meter.latest_time, now)
+        self.update_interval = self.scheduler.next_interval(now)
+        previous = self.fingerprints
+        self._update_fingerprints()
+        if self.fingerprints != previous:
+            # Saving writes the whole history, not worth it for unchanged readings
+            self._hourly.async_schedule_save()
+
+        _LOGGER.debug(
+            "Fetched meter data of %d devices in %.3fs, next poll in %s",
+            len(self.devices),
+            self.fetch_timings["total"],
+            self.update_interval,
+        )
+
+        return self.devices
+
+
+@dataclass(slots=True)
+class ObiRuntimeData:
+    """Coordinators of a config entry, sharing one API client and its token."""
+
+    hourly: ObiEnergyTrackerCoordinator
+    meter: ObiMeterCoordinator
@@ -2,49 +2,92 @@
 
 from __future__ import annotations
 
-import logging
+from datetime import UTC, datetime
 from typing import Any
 
-from aiohttp import ClientError
-
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from . import ObiEnergyTrackerConfigEntry
-from .api import ObiEnergyTrackerAPI
-from .const import CONF_BRIDGE_ID, CONF_COUNTRY, CONF_DEVICE_ID
+from .coordinator import ObiTierCoordinator
+from .transport import async_get_transport
 
-_LOGGER = logging.getLogger(__name__)
+TO_REDACT = {CONF_EMAIL, CONF_PASSWORD}
 
 
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, config_entry: ObiEnergyTrackerConfigEntry
 ) -> dict[str, Any]:
-    """Return diagnostics for a config entry."""
-    # Create API client to test connection
-    session = async_get_clientsession(hass)
-    api = ObiEnergyTrackerAPI(
-        session=session,
-        email=config_entry.data.get("email", ""),
-        password=config_entry.data.get("password", ""),
-        country=config_entry.data.get(CONF_COUNTRY, "DE"),
-        bridge_id=config_entry.data.get(CONF_BRIDGE_ID),
-        device_id=config_entry.data.get(CONF_DEVICE_ID),
-    )
-
-    api_available = False
-    try:
-        api_available = await api.async_login()
-    except (OSError, ClientError) as err:
-        _LOGGER.debug("Diagnostics login failed: %s", err)
-        api_available = False
+    """Return diagnostics for a config entry.
+
+    Reports the state of the running coordinators without contacting the
+    backend; the connection is only checked on request, with the probe
+    button, and its last result is included.
+    """
+    coordinator = config_entry.runtime_data.hourly
+    tiers = (config_entry.runtime_data.meter, coordinator)
+    api = coordinator.api
+    now = datetime.now(UTC)
 
     return {
-        "config_entry_data": {
-            "email": config_entry.data.get("email", ""),
-            "country": config_entry.data.get(CONF_COUNTRY, "DE"),
-            "bridge_id": config_entry.data.get(CONF_BRIDGE_ID),
-            "device_id": config_entry.data.get(CONF_DEVICE_ID),
+        "config_entry_data": async_redact_data(config_entry.data, TO_REDACT),
+        "options": dict(config_entry.options),
+        "token": {
+            "present": api.token is not None,
+            "valid": api.token_valid,
+            "age_seconds": round((now - api.token_obtained_at).total_seconds())
+            if api.token_obtained_at
+            else None,
+            "expires_at": api.token_expires_at.isoformat()
+            if api.token_expires_at
+            else None,
+        },
+        "last_refresh": {tier.tier: _last_refresh(tier) for tier in tiers},
+        "devices": {
+            device_id: {
+                "meter_readings": len(data.meter),
+                "latest_meter_reading": data.meter.latest_time.isoformat()
+                if data.meter.latest_time
+                else None,
+                "hourly_records": len(data.hourly),
+                "first_hour": data.hourly.first_time.isoformat()
+                if data.hourly.first_time
+                else None,
+                "latest_hour": data.hourly.latest_time.isoformat()
+                if data.hourly.latest_time
+                else None,
+                "finalized_until": data.finalized_until.isoformat()
+                if data.finalized_until
+                else None,
+                "period_totals": data.totals.totals,
+                "gaps": data.gaps.as_dict(),
+                "retention": data.history.as_dict(),
+            }
+            for device_id, data in coordinator.devices.items()
+        },
+        "scheduler": {tier.tier: tier.scheduler.as_dict() for tier in tiers},
+        "circuit_breaker": api.circuit_breaker.as_dict(),
+        "transport": async_get_transport(hass).as_dict(),
+        "response_cache": api.response_cache.as_dict(),
+        "metrics": {
+            "api": api.metrics.as_dict(),
+            "refresh": {tier.tier: tier.refresh_metrics.as_dict() for tier in tiers},
         },
-        "api_available": api_available,
+        "last_probe": coordinator.last_probe,
+        "history_cache": coordinator.history_cache.as_dict(),
+    }
+
+
+def _last_refresh(coordinator: ObiTierCoordinator) -> dict[str, Any]:
+    """Return the outcome of the last refresh of a coordinator."""
+    return {
+        "success": coordinator.last_update_success,
+        "exception": repr(coordinator.last_exception)
+        if coordinator.last_exception
+        else None,
+        "update_interval_seconds": coordinator.update_interval.total_seconds()
+        if coordinator.update_interval
+        else None,
+        "fetch_timings": coordinator.fetch_timings,
     }
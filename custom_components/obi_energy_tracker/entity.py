@@ -0,0 +1,35 @@
+"""Base entity for Obi EnergyTracker."""
+
+from __future__ import annotations
+
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import ObiTierCoordinator
+from .models import ObiDevice
+
+
+class ObiEntity[CoordinatorT: ObiTierCoordinator](CoordinatorEntity[CoordinatorT]):
+    """Base class for the entities of an energy tracker device.
+
+    An entity listens to the coordinator of the tier of the data it shows.
+    """
+
+    _attr_has_entity_name = True
+    _attr_translation_key: str
+
+    def __init__(self, coordinator: CoordinatorT, device: ObiDevice) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self.device_id = device.device_id
+        self._attr_unique_id = f"{device.device_id}_{self._attr_translation_key}"
+        name = "Obi EnergyTracker"
+        if len(coordinator.devices) > 1:
+            name = f"{name} {device.label}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, device.device_id)},
+            name=name,
+            manufacturer="Obi",
+            serial_number=device.device_id,
+        )
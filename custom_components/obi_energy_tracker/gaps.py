@@ -0,0 +1,98 @@
+"""Re-fetching of missing hourly records for Obi EnergyTracker."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+ONE_HOUR = timedelta(hours=1)
+
+# Wait before the first re-fetch of a newly missing hour, the backend may
+# just publish late; the delay doubles with every attempt up to the maximum
+GAP_RETRY_DELAY = timedelta(minutes=15)
+GAP_MAX_RETRY_DELAY = timedelta(hours=12)
+# Attempts after which an hour is accepted as missing
+GAP_MAX_ATTEMPTS = 6
+# Missing hours this close to each other are fetched with a single request
+GAP_MERGE_DISTANCE = timedelta(hours=6)
+# Longest window of a single request
+GAP_MAX_WINDOW = timedelta(days=7)
+
+
+@dataclass(slots=True)
+class _MissingHour:
+    """Re-fetch state of a missing hour."""
+
+    next_attempt: datetime
+    attempts: int = 0
+
+
+class GapTracker:
+    """Back off re-fetching every missing hour independently.
+
+    An hour that stays missing is tried again after a doubling delay, up to
+    GAP_MAX_ATTEMPTS times, so a single hour the backend never publishes
+    does not cause a request on every poll.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the tracker."""
+        self._hours: dict[datetime, _MissingHour] = {}
+
+    def __len__(self) -> int:
+        """Return the number of missing hours."""
+        return len(self._hours)
+
+    def due(self, missing: list[datetime], now: datetime) -> list[datetime]:
+        """Return the missing hours to fetch now.
+
+        missing are the hours currently missing from the series; hours no
+        longer among them were filled and are forgotten.
+        """
+        known = self._hours
+        self._hours = {
+            hour: known.get(hour) or _MissingHour(now + GAP_RETRY_DELAY)
+            for hour in missing
+        }
+        return [
+            hour
+            for hour, state in self._hours.items()
+            if state.attempts < GAP_MAX_ATTEMPTS and state.next_attempt <= now
+        ]
+
+    def record_attempt(self, hours: list[datetime], now: datetime) -> None:
+        """Schedule the next attempt of hours that were just requested."""
+        for hour in hours:
+            state = self._hours[hour]
+            state.next_attempt = now + min(
+                GAP_RETRY_DELAY * 2**state.attempts, GAP_MAX_RETRY_DELAY
+            )
+            state.attempts += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the tracker state for diagnostics."""
+        pending = [
+            state for state in self._hours.values() if state.attempts < GAP_MAX_ATTEMPTS
+        ]
+        next_attempt = min((state.next_attempt for state in pending), default=None)
+        return {
+            "missing_hours": len(self._hours),
+            "given_up": len(self._hours) - len(pending),
+            "next_attempt": next_attempt.isoformat() if next_attempt else None,
+        }
+
+
+def gap_windows(hours: list[datetime]) -> list[tuple[datetime, datetime]]:
+    """Group ascending missing hours into as few request windows as possible."""
+    windows: list[tuple[datetime, datetime]] = []
+    for hour in hours:
+        if windows:
+            start, end = windows[-1]
+            if hour - end <= GAP_MERGE_DISTANCE and hour + ONE_HOUR - start <= (
+                GAP_MAX_WINDOW
+            ):
+                windows[-1] = (start, hour + ONE_HOUR)
+                continue
+        windows.append((hour, hour + ONE_HOUR))
+    return windows
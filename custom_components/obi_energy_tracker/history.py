@@ -0,0 +1,98 @@
+"""On-demand queries of the hourly history of Obi EnergyTracker devices."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+type DayRecords = dict[datetime, dict[str, float]]
+
+# Longest range a single query may cover
+HISTORY_MAX_RANGE = timedelta(days=366)
+# Consecutive days fetched with a single request
+HISTORY_CHUNK_DAYS = 7
+# Device days held in the cache, about 2.5 years of one device
+HISTORY_CACHE_DAYS = 1000
+
+
+def day_starts(start: datetime, end: datetime) -> list[datetime]:
+    """Return the starts of the local days overlapping start to end, in UTC.
+
+    The list ends with the start of the day after the last one, so every
+    day is the interval between two consecutive entries.
+    """
+    day = dt_util.start_of_local_day(dt_util.as_local(start))
+    days = [dt_util.as_utc(day)]
+    while days[-1] < end:
+        # Add a day in local time, days have 23 or 25 hours at DST changes
+        day = dt_util.start_of_local_day((day + timedelta(days=1, hours=12)).date())
+        days.append(dt_util.as_utc(day))
+    return days
+
+
+def split_days(
+    records: Mapping[datetime, dict[str, float]], days: list[datetime]
+) -> dict[datetime, DayRecords]:
+    """Split records by the days bounded by the entries of days."""
+    by_day: dict[datetime, DayRecords] = {day: {} for day in days[:-1]}
+    for hour, measures in records.items():
+        index = bisect_right(days, hour) - 1
+        if 0 <= index < len(days) - 1:
+            by_day[days[index]][hour] = measures
+    return by_day
+
+
+def chunk_indexes(indexes: Iterable[int]) -> list[range]:
+    """Group ascending day indexes into runs of up to HISTORY_CHUNK_DAYS."""
+    chunks: list[range] = []
+    for index in indexes:
+        if chunks and chunks[-1].stop == index and len(chunks[-1]) < HISTORY_CHUNK_DAYS:
+            chunks[-1] = range(chunks[-1].start, index + 1)
+        else:
+            chunks.append(range(index, index + 1))
+    return chunks
+
+
+class HistoryCache:
+    """Least recently used cache of the hourly records of finished days."""
+
+    def __init__(self, max_days: int = HISTORY_CACHE_DAYS) -> None:
+        """Initialize an empty cache holding up to max_days device days."""
+        self.max_days = max_days
+        self.hits = 0
+        self.misses = 0
+        self._days: OrderedDict[tuple[str, datetime], DayRecords] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached device days."""
+        return len(self._days)
+
+    def get(self, device_id: str, day: datetime) -> DayRecords | None:
+        """Return the records of a day, None if it is not cached."""
+        if (records := self._days.get((device_id, day))) is None:
+            self.misses += 1
+            return None
+        self._days.move_to_end((device_id, day))
+        self.hits += 1
+        return records
+
+    def put(self, device_id: str, day: datetime, records: DayRecords) -> None:
+        """Add the records of a finished day, evicting the least recently used."""
+        self._days[device_id, day] = records
+        self._days.move_to_end((device_id, day))
+        while len(self._days) > self.max_days:
+            self._days.popitem(last=False)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the cache state for diagnostics."""
+        return {
+            "days": len(self._days),
+            "max_days": self.max_days,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
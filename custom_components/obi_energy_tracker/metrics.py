@@ -0,0 +1,228 @@
+"""In-memory request and refresh metrics for Obi EnergyTracker.
+
+Everything is kept in fixed size structures: histograms with a fixed set of
+buckets and a ring buffer of the most recent requests, so memory use does
+not grow with uptime.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from homeassistant.util import dt as dt_util
+
+# Upper bounds of the latency histogram buckets in milliseconds, the last
+# bucket takes everything slower
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+# Requests kept in the ring buffer
+RECENT_REQUESTS = 100
+
+
+class LatencyHistogram:
+    """Histogram of durations with fixed buckets."""
+
+    __slots__ = ("count", "counts", "total")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = array("q", bytes(8 * (len(LATENCY_BUCKETS_MS) + 1)))
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Add a duration."""
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, seconds * 1000)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, quantile: float) -> float | None:
+        """Return the upper bound in ms of the bucket holding the quantile."""
+        if not self.count:
+            return None
+        rank = quantile * self.count
+        seen = 0
+        for bound, bucket_count in zip(
+            (*LATENCY_BUCKETS_MS, float("inf")), self.counts, strict=True
+        ):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram for diagnostics."""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 1) if self.count else None,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "buckets_ms": {
+                f"<={bound}": count
+                for bound, count in zip(LATENCY_BUCKETS_MS, self.counts, strict=False)
+            }
+            | {f">{LATENCY_BUCKETS_MS[-1]}": self.counts[-1]},
+        }
+
+
+class RequestSample(NamedTuple):
+    """One request in the ring buffer."""
+
+    time: datetime
+    endpoint: str
+    duration: float
+    status: int | str
+    size: int
+
+
+@dataclass(slots=True)
+class EndpointMetrics:
+    """Metrics of the requests to one endpoint."""
+
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    successes: int = 0
+    # Conditional requests answered with 304, the cached response is current
+    not_modified: int = 0
+    errors: dict[str, int] = field(default_factory=dict)
+    bytes_received: int = 0
+    last_size: int | None = None
+    last_success: datetime | None = None
+
+    @property
+    def error_count(self) -> int:
+        """Return the number of failed requests."""
+        return sum(self.errors.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        return {
+            "latency": self.latency.as_dict(),
+            "successes": self.successes,
+            "not_modified": self.not_modified,
+            "errors": dict(self.errors),
+            "bytes_received": self.bytes_received,
+            "last_size": self.last_size,
+            "last_success": self.last_success.isoformat()
+            if self.last_success
+            else None,
+        }
+
+
+class ApiMetrics:
+    """Metrics of the requests sent by the API client."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        self.recent: deque[RequestSample] = deque(maxlen=RECENT_REQUESTS)
+        self.logins = 0
+        self.token_refreshes = 0
+
+    def record_request(
+        self, endpoint: str, duration: float, status: int | str, size: int = 0
+    ) -> None:
+        """Record a request attempt.
+
+        status is the HTTP status, or the kind of error for requests that got
+        no response.
+        """
+        now = dt_util.utcnow()
+        metrics = self.endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self.endpoints[endpoint] = EndpointMetrics()
+        metrics.latency.observe(duration)
+        metrics.bytes_received += size
+        if status == 200:
+            metrics.successes += 1
+            metrics.last_size = size
+            metrics.last_success = now
+        elif status == 304:
+            metrics.not_modified += 1
+            metrics.last_success = now
+        else:
+            metrics.errors[str(status)] = metrics.errors.get(str(status), 0) + 1
+        self.recent.append(RequestSample(now, endpoint, duration, status, size))
+
+    def record_login(self) -> None:
+        """Count a successful login, every one after the first refreshed the token."""
+        if self.logins:
+            self.token_refreshes += 1
+        self.logins += 1
+
+    @property
+    def error_count(self) -> int:
+        """Return the number of failed requests of all endpoints."""
+        return sum(metrics.error_count for metrics in self.endpoints.values())
+
+    def recent_latency(self, quantile: float = 0.5) -> float | None:
+        """Return a quantile of the recent request durations in ms."""
+        if not self.recent:
+            return None
+        durations = sorted(sample.duration for sample in self.recent)
+        index = min(len(durations) - 1, int(quantile * len(durations)))
+        return durations[index] * 1000
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        return {
+            "logins": self.logins,
+            "token_refreshes": self.token_refreshes,
+            "endpoints": {
+                endpoint: metrics.as_dict()
+                for endpoint, metrics in self.endpoints.items()
+            },
+            "recent_requests": [
+                {
+                    "time": sample.time.isoformat(),
+                    "endpoint": sample.endpoint,
+                    "duration_ms": round(sample.duration * 1000, 1),
+                    "status": sample.status,
+                    "size": sample.size,
+                }
+                for sample in self.recent
+            ],
+        }
+
+
+@dataclass(slots=True)
+class RefreshMetrics:
+    """Metrics of the coordinator refreshes."""
+
+    duration: LatencyHistogram = field(default_factory=LatencyHistogram)
+    last_duration: float | None = None
+    successes: int = 0
+    failures: int = 0
+    last_success: datetime | None = None
+    last_failure: datetime | None = None
+
+    def record(self, duration: float, success: bool) -> None:
+        """Record a finished refresh."""
+        self.duration.observe(duration)
+        self.last_duration = duration
+        if success:
+            self.successes += 1
+            self.last_success = dt_util.utcnow()
+        else:
+            self.failures += 1
+            self.last_failure = dt_util.utcnow()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        return {
+            "duration": self.duration.as_dict(),
+            "last_duration_ms": round(self.last_duration * 1000, 1)
+            if self.last_duration is not None
+            else None,
+            "successes": self.successes,
+            "failures": self.failures,
+            "last_success": self.last_success.isoformat()
+            if self.last_success
+            else None,
+            "last_failure": self.last_failure.isoformat()
+            if self.last_failure
+            else None,
+        }
@@ -0,0 +1,562 @@
+"""Data models and response parsing for Obi EnergyTracker."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
+import codecs
+from datetime import datetime
+import json
+import math
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+HOURLY_MEASURES = ("energy", "negative_energy")
+TIMESTAMP_KEYS = ("timestamp", "time", "dateTime", "date", "from", "start")
+# Keys of a response object that may hold the list of records
+RECORD_LIST_KEYS = ("data", "records", "values", "items")
+
+
+@dataclass(frozen=True, slots=True)
+class ObiDevice:
+    """An energy tracker sensor connected to an OBI bridge."""
+
+    bridge_id: str
+    device_id: str
+    name: str | None = None
+
+    @property
+    def label(self) -> str:
+        """Return a human readable label for the device."""
+        return self.name or self.device_id
+
+    def as_dict(self) -> dict[str, str | None]:
+        """Return the device as stored in the config entry."""
+        return {
+            "bridge_id": self.bridge_id,
+            "device_id": self.device_id,
+            "name": self.name,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ObiDevice:
+        """Create a device from its config entry representation."""
+        return cls(data["bridge_id"], data["device_id"], data.get("name"))
+
+
+def parse_devices(user_info: dict[str, Any]) -> list[ObiDevice]:
+    """Return all sensors of all bridges listed in the user info."""
+    bridges = user_info.get("bridges")
+    if not isinstance(bridges, list):
+        bridges = [user_info["bridge"]] if user_info.get("bridge") else []
+
+    devices: list[ObiDevice] = []
+    for bridge in bridges:
+        if not isinstance(bridge, dict) or not (bridge_id := bridge.get("id")):
+            continue
+        for sensor in bridge.get("sensors") or []:
+            if isinstance(sensor, dict) and (device_id := sensor.get("id")):
+                devices.append(ObiDevice(bridge_id, device_id, sensor.get("name")))
+    return devices
+
+
+def parse_timestamp(value: Any) -> datetime | None:
+    """Parse a record timestamp into an aware UTC datetime."""
+    if isinstance(value, (int, float)):
+        # Epoch values in milliseconds are common in the backend responses
+        if value > 10**11:
+            value /= 1000
+        return dt_util.utc_from_timestamp(value)
+    if isinstance(value, str) and (parsed := dt_util.parse_datetime(value)):
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=dt_util.UTC)
+        return dt_util.as_utc(parsed)
+    return None
+
+
+def _record_timestamp(record: dict[str, Any]) -> datetime | None:
+    """Return the timestamp of a record, from the first key holding one."""
+    return next(
+        (
+            parsed
+            for key in TIMESTAMP_KEYS
+            if (parsed := parse_timestamp(record.get(key))) is not None
+        ),
+        None,
+    )
+
+
+def _iter_records(payload: Any) -> Iterator[tuple[datetime, dict[str, Any]]]:
+    """Yield the timestamped records of a historical-data response."""
+    if isinstance(payload, dict):
+        payload = next(
+            (
+                payload[key]
+                for key in RECORD_LIST_KEYS
+                if isinstance(payload.get(key), list)
+            ),
+            [],
+        )
+    if not isinstance(payload, list):
+        return
+
+    for record in payload:
+        if not isinstance(record, dict):
+            continue
+        if (timestamp := _record_timestamp(record)) is not None:
+            yield timestamp, record
+
+
+def _hourly_measures(record: dict[str, Any]) -> dict[str, float]:
+    """Return the hourly measures of a record."""
+    measures: dict[str, float] = {}
+    for measure in HOURLY_MEASURES:
+        if isinstance(value := record.get(measure), (int, float)):
+            measures[measure] = float(value)
+    if record.get("measure") in HOURLY_MEASURES and isinstance(
+        value := record.get("value"), (int, float)
+    ):
+        measures[record["measure"]] = float(value)
+    return measures
+
+
+def parse_hourly_records(payload: Any) -> dict[datetime, dict[str, float]]:
+    """Extract hourly measures keyed by the start of the hour.
+
+    Records either carry the measures as keys (``energy``, ``negative_energy``)
+    or as ``measure``/``value`` pairs; both layouts are merged per hour.
+    """
+    records: dict[datetime, dict[str, float]] = {}
+    for timestamp, record in _iter_records(payload):
+        hour = timestamp.replace(minute=0, second=0, microsecond=0)
+        records.setdefault(hour, {}).update(_hourly_measures(record))
+
+    return records
+
+
+def parse_meter_records(payload: Any) -> list[tuple[datetime, float]]:
+    """Extract the meter readings ordered by time."""
+    readings: list[tuple[datetime, float]] = []
+    for timestamp, record in _iter_records(payload):
+        value = record.get("energy")
+        if value is None and record.get("measure", "energy") == "energy":
+            value = record.get("value")
+        if isinstance(value, (int, float)):
+            readings.append((timestamp, float(value)))
+
+    readings.sort(key=lambda reading: reading[0])
+    return readings
+
+
+def _epoch(value: datetime) -> int:
+    """Return a datetime as epoch seconds."""
+    return int(value.timestamp())
+
+
+class _TimeSeries:
+    """Records ordered by time, stored as compact columns.
+
+    Timestamps are epoch seconds in an ``array('q')``, the values of each
+    measure are kept in a parallel ``array('d')`` with NaN marking a missing
+    value. The latest record is read in O(1), ranges are found by binary
+    search.
+    """
+
+    __slots__ = ("timestamps",)
+
+    def __init__(self) -> None:
+        """Initialize an empty series."""
+        self.timestamps = array("q")
+
+    def __len__(self) -> int:
+        """Return the number of records."""
+        return len(self.timestamps)
+
+    def __repr__(self) -> str:
+        """Return a summary of the series."""
+        return f"{type(self).__name__}(records={len(self)}, latest={self.latest_time})"
+
+    @property
+    def first_time(self) -> datetime | None:
+        """Return the timestamp of the oldest record."""
+        if not self.timestamps:
+            return None
+        return dt_util.utc_from_timestamp(self.timestamps[0])
+
+    @property
+    def latest_time(self) -> datetime | None:
+        """Return the timestamp of the newest record."""
+        if not self.timestamps:
+            return None
+        return dt_util.utc_from_timestamp(self.timestamps[-1])
+
+    def index_range(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> range:
+        """Return the indexes of the records from start up to (excluding) end."""
+        timestamps = self.timestamps
+        first = 0 if start is None else bisect_left(timestamps, _epoch(start))
+        last = len(timestamps) if end is None else bisect_left(timestamps, _epoch(end))
+        return range(first, max(first, last))
+
+    def _index(self, timestamp: datetime) -> int | None:
+        """Return the index of the record at timestamp."""
+        epoch = _epoch(timestamp)
+        index = bisect_left(self.timestamps, epoch)
+        if index < len(self.timestamps) and self.timestamps[index] == epoch:
+            return index
+        return None
+
+
+class HourlySeries(_TimeSeries, Mapping[datetime, dict[str, float]]):
+    """Hourly energy measures keyed by the (UTC) start of the hour."""
+
+    __slots__ = ("energy", "negative_energy")
+
+    def __init__(self) -> None:
+        """Initialize an empty series."""
+        super().__init__()
+        self.energy = array("d")
+        self.negative_energy = array("d")
+
+    @classmethod
+    def from_records(
+        cls, records: Mapping[datetime, Mapping[str, float]]
+    ) -> HourlySeries:
+        """Create a series from measures keyed by hour."""
+        series = cls()
+        series.merge(records)
+        return series
+
+    def _columns(self) -> tuple[array[float], ...]:
+        """Return the value columns in the order of HOURLY_MEASURES."""
+        return (self.energy, self.negative_energy)
+
+    def _record(self, index: int) -> dict[str, float]:
+        """Return the measures present at index."""
+        return {
+            measure: value
+            for measure, column in zip(HOURLY_MEASURES, self._columns(), strict=True)
+            if not math.isnan(value := column[index])
+        }
+
+    def __getitem__(self, hour: datetime) -> dict[str, float]:
+        """Return the measures of an hour."""
+        if (index := self._index(hour)) is None:
+            raise KeyError(hour)
+        return self._record(index)
+
+    def __iter__(self) -> Iterator[datetime]:
+        """Iterate over the hours in ascending order."""
+        return map(dt_util.utc_from_timestamp, self.timestamps)
+
+    def __contains__(self, hour: object) -> bool:
+        """Return True if there is a record for the hour."""
+        return isinstance(hour, datetime) and self._index(hour) is not None
+
+    def items_between(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> Iterator[tuple[datetime, dict[str, float]]]:
+        """Yield the hours from start up to (excluding) end with their measures."""
+        for index in self.index_range(start, end):
+            yield (
+                dt_util.utc_from_timestamp(self.timestamps[index]),
+                self._record(index),
+            )
+
+    def merge(
+        self, records: Mapping[datetime, Mapping[str, float]]
+    ) -> dict[datetime, dict[str, float]]:
+        """Merge measures into the series.
+
+        Measures missing from a record keep their previous value. Returns the
+        change of every measure that changed, keyed by hour.
+        """
+        changes: dict[datetime, dict[str, float]] = {}
+        for hour in sorted(records):
+            if hour_changes := self.merge_hour(hour, records[hour]):
+                changes[hour] = hour_changes
+        return changes
+
+    def merge_hour(
+        self, hour: datetime, measures: Mapping[str, float]
+    ) -> dict[str, float]:
+        """Merge the measures of one hour, returning the changed ones' deltas.
+
+        Appending hours in ascending order is cheap, the columns only have to
+        be shifted for an hour inserted before the newest one.
+        """
+        timestamps = self.timestamps
+        columns = self._columns()
+        epoch = _epoch(hour)
+        index = bisect_left(timestamps, epoch)
+        if index == len(timestamps) or timestamps[index] != epoch:
+            timestamps.insert(index, epoch)
+            for column in columns:
+                column.insert(index, math.nan)
+        changes: dict[str, float] = {}
+        for measure, column in zip(HOURLY_MEASURES, columns, strict=True):
+            if (value := measures.get(measure)) is None or column[index] == value:
+                continue
+            previous = column[index]
+            column[index] = value
+            changes[measure] = value - (0.0 if math.isnan(previous) else previous)
+        return changes
+
+    def sum_between(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> dict[str, float]:
+        """Return the sum of every measure from start up to (excluding) end."""
+        indexes = self.index_range(start, end)
+        return {
+            measure: math.fsum(
+                value
+                for value in column[indexes.start : indexes.stop]
+                if not math.isnan(value)
+            )
+            for measure, column in zip(HOURLY_MEASURES, self._columns(), strict=True)
+        }
+
+    def missing_hours(self, start: datetime, end: datetime) -> list[datetime]:
+        """Return the hours from start up to end that lack a record or a measure.
+
+        Only measures that the series holds for some hour are expected, a
+        tracker that never exported has no negative energy anywhere.
+        """
+        timestamps = self.timestamps
+        expected = [
+            column
+            for column in self._columns()
+            if any(not math.isnan(value) for value in column)
+        ]
+        missing: list[datetime] = []
+        index = bisect_left(timestamps, _epoch(start))
+        for epoch in range(_epoch(start), _epoch(end), 3600):
+            while index < len(timestamps) and timestamps[index] < epoch:
+                index += 1
+            if (
+                index == len(timestamps)
+                or timestamps[index] != epoch
+                or any(math.isnan(column[index]) for column in expected)
+            ):
+                missing.append(dt_util.utc_from_timestamp(epoch))
+        return missing
+
+    def trim(self, before: datetime) -> None:
+        """Drop the hours before the given time."""
+        if index := bisect_left(self.timestamps, _epoch(before)):
+            del self.timestamps[:index]
+            for column in self._columns():
+                del column[:index]
+
+
+class MeterSeries(_TimeSeries):
+    """Meter readings (total energy in Wh) ordered by time."""
+
+    __slots__ = ("values",)
+
+    def __init__(self) -> None:
+        """Initialize an empty series."""
+        super().__init__()
+        self.values = array("d")
+
+    @classmethod
+    def from_readings(cls, readings: Iterable[tuple[datetime, float]]) -> MeterSeries:
+        """Create a series from (timestamp, value) pairs ordered by time."""
+        series = cls()
+        for timestamp, value in readings:
+            series.timestamps.append(_epoch(timestamp))
+            series.values.append(value)
+        return series
+
+    @property
+    def latest_value(self) -> float | None:
+        """Return the newest meter reading."""
+        return self.values[-1] if self.values else None
+
+    @property
+    def power(self) -> float | None:
+        """Return the average power in W between the two newest readings."""
+        if len(self.values) < 2:
+            return None
+        if (seconds := self.timestamps[-1] - self.timestamps[-2]) <= 0:
+            return None
+        return (self.values[-1] - self.values[-2]) * 3600 / seconds
+
+    def readings(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> list[tuple[datetime, float]]:
+        """Return the readings from start up to (excluding) end."""
+        return [
+            (dt_util.utc_from_timestamp(self.timestamps[index]), self.values[index])
+            for index in self.index_range(start, end)
+        ]
+
+    def as_records(self) -> list[dict[str, Any]]:
+        """Return the readings in the layout of the backend responses."""
+        return [
+            {"timestamp": timestamp.isoformat(), "energy": value}
+            for timestamp, value in self.readings()
+        ]
+
+
+def parse_meter_series(payload: Any) -> MeterSeries:
+    """Parse a meter response into a series."""
+    return MeterSeries.from_readings(parse_meter_records(payload))
+
+
+_WHITESPACE = " \t\n\r"
+
+# States of the stream parser
+_START = "start"
+_OBJECT_KEY = "object_key"
+_OBJECT_NEXT = "object_next"
+_ARRAY_FIRST = "array_first"
+_ARRAY_NEXT = "array_next"
+_DONE = "done"
+
+
+class _Incomplete(Exception):
+    """More data is needed to parse the next token."""
+
+
+class HourlyStreamParser:
+    """Parse a historical-data response into an HourlySeries while it arrives.
+
+    Accepts the same layouts as parse_hourly_records: a list of records, or
+    an object holding it under one of RECORD_LIST_KEYS. Records are decoded
+    one at a time and merged into the series right away, so neither the
+    text nor the objects of the whole document are ever held in memory.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the parser."""
+        self.series = HourlySeries()
+        self.size = 0
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._final = False
+        self._state = _START
+
+    def feed(self, chunk: bytes) -> None:
+        """Parse the next chunk of the response body."""
+        self.size += len(chunk)
+        self._buffer = self._buffer[self._pos :] + self._text.decode(chunk)
+        self._pos = 0
+        self._parse()
+
+    def close(self) -> HourlySeries:
+        """Finish parsing and return the series.
+
+        Raises ValueError if the body is not a complete JSON document.
+        """
+        self._buffer = self._buffer[self._pos :] + self._text.decode(b"", final=True)
+        self._pos = 0
+        self._final = True
+        self._parse()
+        if self._state != _DONE:
+            raise ValueError("Incomplete JSON document")
+        return self.series
+
+    def _parse(self) -> None:
+        """Consume as many complete tokens of the buffer as possible."""
+        try:
+            while self._state != _DONE:
+                self._step()
+        except _Incomplete:
+            if self._final:
+                raise ValueError("Incomplete JSON document") from None
+
+    def _step(self) -> None:
+        """Consume the next token, committing the position only on success."""
+        pos = self._skip(self._pos)
+        char = self._peek(pos)
+        state = self._state
+
+        if state == _START:
+            if char == "[":
+                self._commit(pos + 1, _ARRAY_FIRST)
+            elif char == "{":
+                self._commit(pos + 1, _OBJECT_KEY)
+            else:
+                # Not a layout holding records
+                _, pos = self._decode(pos)
+                self._commit(pos, _DONE)
+
+        elif state in (_OBJECT_KEY, _OBJECT_NEXT):
+            if char == "}":
+                self._commit(pos + 1, _DONE)
+                return
+            if state == _OBJECT_NEXT:
+                if char != ",":
+                    raise ValueError(f"Expected ',' at {pos}")
+                pos = self._skip(pos + 1)
+            key, pos = self._decode(pos)
+            pos = self._skip(pos)
+            if self._peek(pos) != ":":
+                raise ValueError(f"Expected ':' at {pos}")
+            pos = self._skip(pos + 1)
+            if key in RECORD_LIST_KEYS and self._peek(pos) == "[":
+                self._commit(pos + 1, _ARRAY_FIRST)
+            else:
+                _, pos = self._decode(pos)
+                self._commit(pos, _OBJECT_NEXT)
+
+        else:
+            if char == "]":
+                self._commit(pos + 1, _DONE)
+                return
+            if state == _ARRAY_NEXT:
+                if char != ",":
+                    raise ValueError(f"Expected ',' at {pos}")
+                pos = self._skip(pos + 1)
+            record, pos = self._decode(pos)
+            self._add(record)
+            self._commit(pos, _ARRAY_NEXT)
+
+    def _skip(self, pos: int) -> int:
+        """Return the position after the whitespace at pos."""
+        buffer = self._buffer
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        return pos
+
+    def _peek(self, pos: int) -> str:
+        """Return the character at pos."""
+        if pos >= len(self._buffer):
+            raise _Incomplete
+        return self._buffer[pos]
+
+    def _decode(self, pos: int) -> tuple[Any, int]:
+        """Decode the JSON value at pos, return it and the position after it."""
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, pos)
+        except json.JSONDecodeError:
+            if self._final:
+                raise
+            raise _Incomplete from None
+        if end == len(self._buffer) and not self._final:
+            # A number might continue in the next chunk
+            raise _Incomplete
+        return value, end
+
+    def _commit(self, pos: int, state: str) -> None:
+        """Move past a consumed token."""
+        self._pos = pos
+        self._state = state
+
+    def _add(self, record: Any) -> None:
+        """Merge a decoded record into the series."""
+        if not isinstance(record, dict):
+            return
+        if (timestamp := _record_timestamp(record)) is None:
+            return
+        self.series.merge_hour(
+            timestamp.replace(minute=0, second=0, microsecond=0),
+            _hourly_measures(record),
+        )
@@ -0,0 +1,235 @@
+"""Tiered retention of the energy history of a device.
+
+Recent hours are kept as received. Hours older than the hourly tier are
+rolled up into the sums of their local days, days older than the daily tier
+into the sums of their local months, and months beyond the monthly tier are
+dropped. Only whole days and months are rolled up, so sums over periods
+starting on a local day or month boundary are the same whichever tier holds
+the data, and memory use is bounded by the size of the tiers.
+
+The sums are kept in the same columnar series as the hours, keyed by the
+(UTC) start of the local day or month.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+import math
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_DAILY_RETENTION,
+    CONF_HOURLY_RETENTION,
+    CONF_MONTHLY_RETENTION,
+    DEFAULT_DAILY_RETENTION,
+    DEFAULT_HOURLY_RETENTION,
+    DEFAULT_MONTHLY_RETENTION,
+)
+from .models import HOURLY_MEASURES, HourlySeries
+
+RESOLUTION_HOUR = "hour"
+RESOLUTION_DAY = "day"
+RESOLUTION_MONTH = "month"
+# From the finest to the coarsest
+RESOLUTIONS = (RESOLUTION_HOUR, RESOLUTION_DAY, RESOLUTION_MONTH)
+
+type HistoryRecord = tuple[datetime, str, dict[str, float]]
+
+
+@dataclass(frozen=True, slots=True)
+class RetentionPolicy:
+    """Size of the tiers of the energy history."""
+
+    # Days kept at hourly resolution
+    hourly_days: int = DEFAULT_HOURLY_RETENTION
+    # Days kept as daily sums once older than the hourly tier
+    daily_days: int = DEFAULT_DAILY_RETENTION
+    # Months kept as monthly sums once older than the daily tier
+    months: int = DEFAULT_MONTHLY_RETENTION
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> RetentionPolicy:
+        """Return the policy configured in the options of a config entry."""
+        return cls(
+            hourly_days=options.get(CONF_HOURLY_RETENTION, DEFAULT_HOURLY_RETENTION),
+            daily_days=options.get(CONF_DAILY_RETENTION, DEFAULT_DAILY_RETENTION),
+            months=options.get(CONF_MONTHLY_RETENTION, DEFAULT_MONTHLY_RETENTION),
+        )
+
+
+def _day_start(day: date) -> datetime:
+    """Return the (UTC) start of a local day."""
+    return dt_util.as_utc(dt_util.start_of_local_day(day))
+
+
+def _month_start(day: date) -> datetime:
+    """Return the (UTC) start of the local month of a day."""
+    return _day_start(day.replace(day=1))
+
+
+def _months_before(month: date, months: int) -> date:
+    """Return the first day of the month the given number of months earlier."""
+    month_index = month.year * 12 + month.month - 1 - months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _roll_up(
+    source: HourlySeries,
+    target: HourlySeries,
+    before: datetime,
+    bucket_start: Callable[[date], datetime],
+) -> None:
+    """Move the records before a boundary into the sums of their buckets."""
+    buckets: dict[datetime, dict[str, list[float]]] = {}
+    for start, measures in source.items_between(None, before):
+        bucket = buckets.setdefault(
+            bucket_start(dt_util.as_local(start).date()),
+            {measure: [] for measure in HOURLY_MEASURES},
+        )
+        for measure, value in measures.items():
+            bucket[measure].append(value)
+
+    for start, values in buckets.items():
+        # A bucket may hold records rolled up by an earlier call already
+        totals = target.get(start, {})
+        target.merge_hour(
+            start,
+            {
+                measure: math.fsum((totals.get(measure, 0.0), *measure_values))
+                for measure, measure_values in values.items()
+                if measure_values
+            },
+        )
+    source.trim(before)
+
+
+class EnergyHistory:
+    """Energy measures of a device at hourly, daily and monthly resolution.
+
+    The tiers cover consecutive time ranges: monthly sums before daily sums
+    before hours. Hours before rolled_until were rolled up already and are
+    not merged again, they would be counted twice.
+    """
+
+    __slots__ = ("daily", "hourly", "monthly", "rolled_until")
+
+    def __init__(self) -> None:
+        """Initialize an empty history."""
+        self.hourly = HourlySeries()
+        self.daily = HourlySeries()
+        self.monthly = HourlySeries()
+        self.rolled_until: datetime | None = None
+
+    def __len__(self) -> int:
+        """Return the number of records in all tiers."""
+        return len(self.hourly) + len(self.daily) + len(self.monthly)
+
+    def merge(
+        self, records: Mapping[datetime, Mapping[str, float]]
+    ) -> dict[datetime, dict[str, float]]:
+        """Merge hourly measures, returning the changes like HourlySeries.merge."""
+        if (rolled_until := self.rolled_until) is not None:
+            records = {
+                hour: measures
+                for hour, measures in records.items()
+                if hour >= rolled_until
+            }
+        return self.hourly.merge(records)
+
+    def roll_up(self, now: datetime, policy: RetentionPolicy) -> None:
+        """Roll up the records that fell out of their tier."""
+        today = dt_util.as_local(now).date()
+        hours_before = _day_start(today - timedelta(days=policy.hourly_days))
+        _roll_up(self.hourly, self.daily, hours_before, _day_start)
+        if self.rolled_until is None or self.rolled_until < hours_before:
+            self.rolled_until = hours_before
+
+        month = (
+            today - timedelta(days=policy.hourly_days + policy.daily_days)
+        ).replace(day=1)
+        _roll_up(self.daily, self.monthly, _day_start(month), _month_start)
+        self.monthly.trim(_day_start(_months_before(month, policy.months)))
+
+    def sum_between(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> dict[str, float]:
+        """Return the sum of every measure from start up to (excluding) end.
+
+        Daily and monthly sums are included if they begin in the range.
+        """
+        sums = [
+            tier.sum_between(start, end)
+            for tier in (self.monthly, self.daily, self.hourly)
+        ]
+        return {
+            measure: math.fsum(tier_sums[measure] for tier_sums in sums)
+            for measure in HOURLY_MEASURES
+        }
+
+    def query(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> Iterator[HistoryRecord]:
+        """Yield the records from start up to end in the finest resolution held.
+
+        Every record is the (UTC) start of its hour, day or month, the
+        resolution and the measures; daily and monthly sums are included if
+        they begin in the range.
+        """
+        for tier, resolution in (
+            (self.monthly, RESOLUTION_MONTH),
+            (self.daily, RESOLUTION_DAY),
+            (self.hourly, RESOLUTION_HOUR),
+        ):
+            for record_start, measures in tier.items_between(start, end):
+                yield record_start, resolution, measures
+
+    def resample(
+        self, start: datetime | None, end: datetime | None, resolution: str
+    ) -> list[HistoryRecord]:
+        """Return the records from start up to end summed up per resolution.
+
+        Hours are summed up into their local days or months and days into
+        their months; records only held at a coarser resolution, e.g. the
+        months of the monthly tier when asking for days, are returned as
+        they are.
+        """
+        bucket_start = {RESOLUTION_DAY: _day_start, RESOLUTION_MONTH: _month_start}.get(
+            resolution
+        )
+        rank = RESOLUTIONS.index(resolution)
+        buckets: dict[tuple[datetime, str], dict[str, list[float]]] = {}
+        for record_start, record_resolution, measures in self.query(start, end):
+            if bucket_start is not None and RESOLUTIONS.index(record_resolution) < rank:
+                record_start = bucket_start(dt_util.as_local(record_start).date())
+                record_resolution = resolution
+            bucket = buckets.setdefault((record_start, record_resolution), {})
+            for measure, value in measures.items():
+                bucket.setdefault(measure, []).append(value)
+        return [
+            (
+                bucket,
+                bucket_resolution,
+                {measure: math.fsum(values) for measure, values in measures.items()},
+            )
+            for (bucket, bucket_resolution), measures in sorted(buckets.items())
+        ]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the size of the tiers for diagnostics."""
+        return {
+            tier: {
+                "records": len(series),
+                "first": series.first_time.isoformat() if series.first_time else None,
+            }
+            for tier, series in (
+                ("hourly", self.hourly),
+                ("daily", self.daily),
+                ("monthly", self.monthly),
+            )
+        } | {
+            "rolled_until": self.rolled_until.isoformat() if self.rolled_until else None
+        }
@@ -0,0 +1,110 @@
+"""Adaptive polling schedule for Obi EnergyTracker."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+# Weight of a new observation in the learned period and publication delay
+SMOOTHING = 0.3
+# Poll this long after the expected publication to not arrive too early
+PUBLISH_MARGIN = timedelta(seconds=20)
+# Upper bound of the exponent used while expected data is overdue
+MAX_BACKOFF_EXPONENT = 6
+
+
+@dataclass(slots=True)
+class _Cadence:
+    """Learned publication rhythm of one data stream."""
+
+    latest: datetime | None = None
+    # Seconds between two records
+    period: float | None = None
+    # Seconds from a record's timestamp until it was first seen
+    delay: float | None = None
+    # Polls since the stream last advanced
+    unchanged_polls: int = 0
+
+
+def _smooth(current: float | None, observed: float) -> float:
+    """Return the exponentially smoothed value."""
+    if current is None:
+        return observed
+    return current + SMOOTHING * (observed - current)
+
+
+class AdaptivePollScheduler:
+    """Plan the next poll from the timestamps of the published records.
+
+    Every stream (e.g. the meter readings or the hourly records of a device)
+    reports its newest record timestamp after each poll. From consecutive
+    timestamps the scheduler learns how often a stream publishes and how late
+    records become visible, then polls shortly after the next record is
+    expected. While an expected record is overdue, the interval backs off
+    exponentially from the minimum.
+    """
+
+    def __init__(
+        self,
+        min_interval: timedelta,
+        max_interval: timedelta,
+        default_interval: timedelta,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.default_interval = default_interval
+        self._streams: dict[str, _Cadence] = {}
+
+    def record(self, stream: str, latest: datetime | None, now: datetime) -> None:
+        """Record the newest record timestamp of a stream seen at now."""
+        cadence = self._streams.setdefault(stream, _Cadence())
+        if latest is None:
+            return
+
+        if cadence.latest is None:
+            cadence.latest = latest
+            return
+
+        if latest <= cadence.latest:
+            cadence.unchanged_polls += 1
+            return
+
+        step = (latest - cadence.latest).total_seconds()
+        if cadence.period and step > 1.5 * cadence.period:
+            # Several records were published between two polls
+            step /= round(step / cadence.period)
+        cadence.period = _smooth(cadence.period, step)
+        cadence.delay = _smooth(cadence.delay, max(0.0, (now - latest).total_seconds()))
+        cadence.latest = latest
+        cadence.unchanged_polls = 0
+
+    def next_interval(self, now: datetime) -> timedelta:
+        """Return the time until the next poll."""
+        waits: list[timedelta] = []
+        for cadence in self._streams.values():
+            if cadence.latest is None or cadence.period is None:
+                continue
+            expected = cadence.latest + timedelta(
+                seconds=cadence.period + (cadence.delay or 0)
+            )
+            if expected > now:
+                waits.append(expected - now + PUBLISH_MARGIN)
+            else:
+                exponent = min(cadence.unchanged_polls, MAX_BACKOFF_EXPONENT)
+                waits.append(self.min_interval * 2**exponent)
+
+        interval = min(waits, default=self.default_interval)
+        return max(self.min_interval, min(interval, self.max_interval))
+
+    def as_dict(self) -> dict[str, dict[str, float | int | str | None]]:
+        """Return the learned cadences."""
+        return {
+            stream: {
+                "latest": cadence.latest.isoformat() if cadence.latest else None,
+                "period": cadence.period,
+                "delay": cadence.delay,
+                "unchanged_polls": cadence.unchanged_polls,
+            }
+            for stream, cadence in self._streams.items()
+        }
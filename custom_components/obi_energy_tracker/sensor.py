@@ -2,25 +2,94 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
 import logging
+from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    EntityCategory,
+    UnitOfEnergy,
+    UnitOfPower,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import ObiEnergyTrackerConfigEntry
-from .const import DOMAIN
-from .coordinator import ObiEnergyTrackerCoordinator
+from .consumption import PERIOD_DAY, PERIOD_MONTH, PERIOD_WEEK
+from .coordinator import (
+    ObiDeviceData,
+    ObiEnergyTrackerCoordinator,
+    ObiMeterCoordinator,
+    ObiTierCoordinator,
+)
+from .entity import ObiEntity
+from .models import ObiDevice
 
 _LOGGER = logging.getLogger(__name__)
 
 PARALLEL_UPDATES = 0
 
+# Translation key of the period total sensors by measure and period
+PERIOD_SENSORS = {
+    ("energy", PERIOD_DAY): "consumption_today",
+    ("energy", PERIOD_WEEK): "consumption_this_week",
+    ("energy", PERIOD_MONTH): "consumption_this_month",
+    ("negative_energy", PERIOD_DAY): "export_today",
+    ("negative_energy", PERIOD_WEEK): "export_this_week",
+    ("negative_energy", PERIOD_MONTH): "export_this_month",
+}
+
+
+@dataclass(frozen=True, kw_only=True)
+class ObiMetricSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor showing a request or refresh metric."""
+
+    value_fn: Callable[[ObiEnergyTrackerCoordinator], float | datetime | None]
+
+
+METRIC_SENSORS: tuple[ObiMetricSensorEntityDescription, ...] = (
+    ObiMetricSensorEntityDescription(
+        key="cloud_latency",
+        translation_key="cloud_latency",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        value_fn=lambda coordinator: coordinator.api.metrics.recent_latency(),
+    ),
+    ObiMetricSensorEntityDescription(
+        key="refresh_duration",
+        translation_key="refresh_duration",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=2,
+        value_fn=lambda coordinator: coordinator.refresh_metrics.last_duration,
+    ),
+    ObiMetricSensorEntityDescription(
+        key="request_errors",
+        translation_key="request_errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.api.metrics.error_count,
+    ),
+    ObiMetricSensorEntityDescription(
+        key="last_successful_refresh",
+        translation_key="last_successful_refresh",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda coordinator: coordinator.refresh_metrics.last_success,
+    ),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -28,34 +97,55 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up sensors from a config entry."""
-    coordinator = config_entry.runtime_data
-
-    sensors = [
-        ObiMeterReadingSensor(coordinator),
-    ]
+    coordinator = config_entry.runtime_data.hourly
+    meter_coordinator = config_entry.runtime_data.meter
+
+    sensors: list[ObiEnergySensorBase[Any]] = []
+    for data in coordinator.devices.values():
+        sensors.append(ObiMeterReadingSensor(meter_coordinator, data.device))
+        sensors.append(ObiPowerSensor(meter_coordinator, data.device))
+        sensors.extend(
+            ObiPeriodEnergySensor(coordinator, data.device, measure, period)
+            for measure, period in PERIOD_SENSORS
+        )
+    if coordinator.devices:
+        # Metrics are kept per account, they are attached to its first device
+        first_device = next(iter(coordinator.devices.values())).device
+        sensors.extend(
+            ObiMetricSensor(coordinator, first_device, description)
+            for description in METRIC_SENSORS
+        )
 
     async_add_entities(sensors)
 
 
-class ObiEnergySensorBase(CoordinatorEntity[ObiEnergyTrackerCoordinator], SensorEntity):
+class ObiEnergySensorBase[CoordinatorT: ObiTierCoordinator](
+    ObiEntity[CoordinatorT], SensorEntity
+):
     """Base class for Obi EnergyTracker sensors."""
 
-    _attr_has_entity_name = True
+    _written_state: tuple[bool, tuple[Any, ...] | None] | None = None
 
-    def __init__(self, coordinator: ObiEnergyTrackerCoordinator) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, "obi_energy_tracker")},
-            "name": "Obi EnergyTracker",
-            "manufacturer": "Obi",
-        }
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if the data of this sensor's device changed."""
+        state = (self.available, self.coordinator.fingerprints.get(self.device_id))
+        if state == self._written_state:
+            return
+        self._written_state = state
+        super()._handle_coordinator_update()
+
+    @property
+    def device_data(self) -> ObiDeviceData | None:
+        """Return the coordinator data of this sensor's device."""
+        if not self.coordinator.data:
+            return None
+        return self.coordinator.data.get(self.device_id)
 
 
-class ObiMeterReadingSensor(ObiEnergySensorBase):
+class ObiMeterReadingSensor(ObiEnergySensorBase[ObiMeterCoordinator]):
     """Sensor for total meter reading (Zählerstand)."""
 
-    _attr_unique_id = "obi_meter_reading"
     _attr_device_class = SensorDeviceClass.ENERGY
     _attr_state_class = SensorStateClass.TOTAL_INCREASING
     _attr_translation_key = "meter_reading"
@@ -64,31 +154,101 @@ class ObiMeterReadingSensor(ObiEnergySensorBase):
     @property
     def native_value(self) -> float | None:
         """Return the meter reading value."""
-        _LOGGER.debug(
-            "ObiMeterReadingSensor native_value called. Data: %s",
-            self.coordinator.data,
+        if (device_data := self.device_data) is None:
+            return None
+        return device_data.meter.latest_value
+
+
+class ObiPowerSensor(ObiEnergySensorBase[ObiMeterCoordinator]):
+    """Sensor for the power estimated from the two newest meter readings."""
+
+    _attr_device_class = SensorDeviceClass.POWER
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_translation_key = "power"
+    _attr_native_unit_of_measurement = UnitOfPower.WATT
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the average power between the newest meter readings."""
+        if (device_data := self.device_data) is None:
+            return None
+        if (power := device_data.meter.power) is None:
+            return None
+        return round(power, 1)
+
+
+class ObiPeriodEnergySensor(ObiEnergySensorBase[ObiEnergyTrackerCoordinator]):
+    """Sensor for the energy imported or exported in the current period."""
+
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_state_class = SensorStateClass.TOTAL
+    _attr_native_unit_of_measurement = UnitOfEnergy.WATT_HOUR
+
+    def __init__(
+        self,
+        coordinator: ObiEnergyTrackerCoordinator,
+        device: ObiDevice,
+        measure: str,
+        period: str,
+    ) -> None:
+        """Initialize the sensor."""
+        self._attr_translation_key = PERIOD_SENSORS[measure, period]
+        super().__init__(coordinator, device)
+        self.measure = measure
+        self.period = period
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the total of the current period."""
+        if (device_data := self.device_data) is None:
+            return None
+        return device_data.totals.get(self.period, self.measure)
+
+    @property
+    def last_reset(self) -> datetime | None:
+        """Return the start of the current period."""
+        if (device_data := self.device_data) is None:
+            return None
+        return device_data.totals.starts.get(self.period)
+
+
+class ObiMetricSensor(ObiEnergySensorBase[ObiEnergyTrackerCoordinator]):
+    """Diagnostic sensor for a request or refresh metric."""
+
+    entity_description: ObiMetricSensorEntityDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: ObiEnergyTrackerCoordinator,
+        device: ObiDevice,
+        description: ObiMetricSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self._attr_translation_key = description.key
+        super().__init__(coordinator, device)
+        self.entity_description = description
+
+    async def async_added_to_hass(self) -> None:
+        """Update the metric after every refresh, changed data or not."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, self.coordinator.refresh_signal, self.async_write_ha_state
+            )
         )
-        if (
-            self.coordinator.data
-            and "meter" in self.coordinator.data
-            and self.coordinator.data["meter"]
-        ):
-            meter_data = self.coordinator.data["meter"]
-
-            # If it's a list, get the latest record
-            if isinstance(meter_data, list) and len(meter_data) > 0:
-                meter_data = meter_data[-1]
-
-            if not isinstance(meter_data, dict):
-                return None
-
-            # Look for "value" (if measure is energy) or "energy" directly
-            if "energy" in meter_data:
-                return meter_data["energy"]
-            if "value" in meter_data and meter_data.get("measure") == "energy":
-                return meter_data["value"]
-            # Fallback to "value" if present
-            if "value" in meter_data:
-                return meter_data["value"]
-
-        return None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Do nothing, the state is written after every refresh instead."""
+
+    @property
+    def available(self) -> bool:
+        """Return True, the metrics are most useful while refreshes fail."""
+        return True
+
+    @property
+    def native_value(self) -> float | datetime | None:
+        """Return the current value of the metric."""
+        return self.entity_description.value_fn(self.coordinator)
@@ -0,0 +1,138 @@
+"""Services of the Obi EnergyTracker integration."""
+
+from __future__ import annotations
+
+import math
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .coordinator import ObiEnergyTrackerCoordinator, ObiRuntimeData
+from .history import HISTORY_MAX_RANGE
+from .models import HOURLY_MEASURES
+from .retention import RESOLUTION_DAY, RESOLUTION_HOUR, RESOLUTION_MONTH
+
+SERVICE_GET_HISTORY = "get_history"
+
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_RESOLUTION = "resolution"
+
+GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Required(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_RESOLUTION, default=RESOLUTION_HOUR): vol.In(
+            [RESOLUTION_HOUR, RESOLUTION_DAY, RESOLUTION_MONTH]
+        ),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    async def _async_get_history(call: ServiceCall) -> ServiceResponse:
+        """Return the energy measures of a device for a time range."""
+        coordinator, device_id = _coordinator_of_device(hass, call.data[ATTR_DEVICE_ID])
+        start = dt_util.as_utc(call.data[ATTR_START])
+        end = dt_util.as_utc(call.data.get(ATTR_END) or dt_util.utcnow())
+        if start >= end:
+            raise ServiceValidationError("The start must be before the end")
+
+        if (resolution := call.data[ATTR_RESOLUTION]) != RESOLUTION_HOUR:
+            # Daily and monthly sums are answered from the retained history
+            sums = coordinator.get_history_sums(device_id, start, end, resolution)
+            return {
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                **{
+                    measure: math.fsum(
+                        measures.get(measure, 0.0) for _, _, measures in sums
+                    )
+                    for measure in HOURLY_MEASURES
+                },
+                "records": [
+                    {
+                        "start": record_start.isoformat(),
+                        "resolution": record_resolution,
+                        **measures,
+                    }
+                    for record_start, record_resolution, measures in sums
+                ],
+            }
+
+        if end - start > HISTORY_MAX_RANGE:
+            raise ServiceValidationError(
+                f"The range must not be longer than {HISTORY_MAX_RANGE.days} days"
+            )
+
+        records = await coordinator.async_get_history(device_id, start, end)
+        if records is None:
+            raise HomeAssistantError("Failed to fetch the history from the OBI cloud")
+
+        return {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            **{
+                measure: math.fsum(
+                    measures.get(measure, 0.0) for measures in records.values()
+                )
+                for measure in HOURLY_MEASURES
+            },
+            "hours": [
+                {"start": hour.isoformat(), **measures}
+                for hour, measures in records.items()
+            ],
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        _async_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+def _coordinator_of_device(
+    hass: HomeAssistant, device_id: str
+) -> tuple[ObiEnergyTrackerCoordinator, str]:
+    """Return the hourly coordinator and the tracker ID of a device registry entry."""
+    if (device := dr.async_get(hass).async_get(device_id)) is None:
+        raise ServiceValidationError(f"Unknown device {device_id}")
+    tracker_id = next(
+        (identifier for domain, identifier in device.identifiers if domain == DOMAIN),
+        None,
+    )
+    for entry_id in device.config_entries:
+        entry = hass.config_entries.async_get_entry(entry_id)
+        if (
+            entry is None
+            or entry.domain != DOMAIN
+            or entry.state is not ConfigEntryState.LOADED
+        ):
+            continue
+        runtime_data: ObiRuntimeData = entry.runtime_data
+        coordinator = runtime_data.hourly
+        if tracker_id in coordinator.devices:
+            return coordinator, tracker_id
+    raise ServiceValidationError(
+        f"Device {device.name or device_id} is not an Obi EnergyTracker "
+        "of a loaded account"
+    )
@@ -0,0 +1,329 @@
+"""Long-term statistics import for Obi EnergyTracker."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+import logging
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+    statistics_during_period,
+)
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util, slugify
+from homeassistant.util.unit_conversion import EnergyConverter
+
+from .api import ObiEnergyTrackerAPI
+from .const import DOMAIN
+from .models import HOURLY_MEASURES, HourlySeries, ObiDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+# Statistic suffix and name per hourly measure
+STATISTICS = {
+    "energy": ("energy_consumption", "Energy consumption"),
+    "negative_energy": ("energy_return", "Energy return"),
+}
+
+# Backfill is fetched in windows of this size, a few windows at a time
+BACKFILL_WINDOW = timedelta(days=7)
+BACKFILL_CONCURRENCY = 3
+# Oldest history that is looked for on first setup
+BACKFILL_MAX_AGE = timedelta(days=730)
+# Consecutive empty windows that mark the start of the available history
+BACKFILL_EMPTY_WINDOWS = 2
+# Wait this long before retrying a failed backfill
+BACKFILL_RETRY_DELAY = timedelta(minutes=30)
+# How far back the statistic before a re-imported hour is looked for, the
+# whole history only if the first window holds none
+REIMPORT_LOOKBACKS = (BACKFILL_WINDOW, BACKFILL_MAX_AGE)
+
+ONE_HOUR = timedelta(hours=1)
+
+type HourlyRecords = Mapping[datetime, Mapping[str, float]]
+
+
+def _first_hour(records: HourlyRecords) -> datetime | None:
+    """Return the oldest hour of the records."""
+    if isinstance(records, HourlySeries):
+        return records.first_time
+    return min(records, default=None)
+
+
+class ObiStatisticsImporter:
+    """Import the hourly energy measures of a device as external statistics."""
+
+    def __init__(
+        self, hass: HomeAssistant, api: ObiEnergyTrackerAPI, device: ObiDevice
+    ) -> None:
+        """Initialize the importer."""
+        self.hass = hass
+        self.api = api
+        self.device = device
+        self.device_id = device.device_id
+        self.statistic_ids = {
+            measure: f"{DOMAIN}:{slugify(device.device_id)}_{suffix}"
+            for measure, (suffix, _) in STATISTICS.items()
+        }
+        self._initialized = False
+        # Hours of a measure before this point are imported, None if nothing
+        # of it is imported yet
+        self._imported: dict[str, datetime | None] = dict.fromkeys(HOURLY_MEASURES)
+        self._sums = dict.fromkeys(HOURLY_MEASURES, 0.0)
+        self._retry_after: datetime | None = None
+        # Earliest imported hour that changed since, imported again next time
+        self._reimport_from: datetime | None = None
+
+    @property
+    def imported_until(self) -> datetime | None:
+        """Return the point before which the hours of all measures are imported.
+
+        Measures without any statistic yet are ignored, None if nothing is
+        imported at all.
+        """
+        return min(
+            (until for until in self._imported.values() if until is not None),
+            default=None,
+        )
+
+    def invalidate(self, since: datetime) -> None:
+        """Import the hours from since again, e.g. after missing ones were filled."""
+        if self._reimport_from is None or since < self._reimport_from:
+            self._reimport_from = since
+
+    async def async_sync(
+        self, hourly: HourlyRecords, finalized_until: datetime
+    ) -> None:
+        """Import all finalized hours that are not imported yet.
+
+        Hours still held in memory are imported from there; anything older
+        (first setup or a long downtime) is backfilled from the backend.
+        """
+        if not self._initialized:
+            await self._async_load_last_statistics()
+
+        if self._retry_after and dt_util.utcnow() < self._retry_after:
+            return
+
+        if self._reimport_from is not None:
+            await self._async_rewind(self._reimport_from)
+            self._reimport_from = None
+
+        if self.imported_until is None or (
+            (first := _first_hour(hourly)) is not None and self.imported_until < first
+        ):
+            await self._async_backfill(hourly, finalized_until)
+            return
+
+        self._import(hourly, finalized_until)
+
+    async def _async_load_last_statistics(self) -> None:
+        """Resume every measure from its last imported hour and running sum."""
+        for measure, statistic_id in self.statistic_ids.items():
+            last_stats = await get_instance(self.hass).async_add_executor_job(
+                get_last_statistics, self.hass, 1, statistic_id, True, {"sum"}
+            )
+            if not (rows := last_stats.get(statistic_id)):
+                continue
+            self._sums[measure] = rows[0].get("sum") or 0.0
+            self._imported[measure] = (
+                dt_util.utc_from_timestamp(rows[0]["start"]) + ONE_HOUR
+            )
+        self._initialized = True
+
+    async def _async_rewind(self, since: datetime) -> None:
+        """Restart the import of every measure imported past since at since.
+
+        The running sums of the later hours include the old values, so they
+        are recomputed from the sum of the last statistic before since.
+        """
+        pending = {
+            measure
+            for measure, until in self._imported.items()
+            if until is not None and until > since
+        }
+        for lookback in REIMPORT_LOOKBACKS:
+            if not pending:
+                break
+            stats = await get_instance(self.hass).async_add_executor_job(
+                statistics_during_period,
+                self.hass,
+                since - lookback,
+                since,
+                {self.statistic_ids[measure] for measure in pending},
+                "hour",
+                None,
+                {"sum"},
+            )
+            for measure in list(pending):
+                if rows := stats.get(self.statistic_ids[measure]):
+                    self._sums[measure] = rows[-1].get("sum") or 0.0
+                    self._imported[measure] = since
+                    pending.discard(measure)
+
+        for measure in pending:
+            # Nothing imported before since, the sum starts over
+            self._sums[measure] = 0.0
+            self._imported[measure] = since
+        _LOGGER.debug(
+            "Importing the statistics of device %s again from %s",
+            self.device_id,
+            since,
+        )
+
+    async def _async_backfill(self, hourly: HourlyRecords, until: datetime) -> None:
+        """Fetch and import the history that is not held in memory."""
+        # The hours held in memory are not fetched again
+        known_start = _first_hour(hourly) or until
+        if self.imported_until is None:
+            _LOGGER.debug("Backfilling statistics for device %s", self.device_id)
+            records = await self._async_fetch_history(known_start)
+        else:
+            _LOGGER.debug(
+                "Backfilling statistics for device %s since %s",
+                self.device_id,
+                self.imported_until,
+            )
+            records = await self._async_fetch_range(self.imported_until, known_start)
+
+        if records is None:
+            _LOGGER.warning(
+                "Failed to backfill statistics for device %s, retrying in %s",
+                self.device_id,
+                BACKFILL_RETRY_DELAY,
+            )
+            self._retry_after = dt_util.utcnow() + BACKFILL_RETRY_DELAY
+            return
+
+        self._retry_after = None
+        records.merge(hourly)
+        self._import(records, until)
+        if self.imported_until is None:
+            # No history published yet, look again later
+            self._retry_after = dt_util.utcnow() + BACKFILL_RETRY_DELAY
+
+    async def _async_fetch_history(self, until: datetime) -> HourlySeries | None:
+        """Walk back from until in windows until the history runs out."""
+        records = HourlySeries()
+        semaphore = asyncio.Semaphore(BACKFILL_CONCURRENCY)
+        oldest = until - BACKFILL_MAX_AGE
+        window_end = until
+        empty_windows = 0
+
+        while window_end > oldest and empty_windows < BACKFILL_EMPTY_WINDOWS:
+            windows = []
+            for _ in range(BACKFILL_CONCURRENCY):
+                if window_end <= oldest:
+                    break
+                window_start = max(window_end - BACKFILL_WINDOW, oldest)
+                windows.append((window_start, window_end))
+                window_end = window_start
+
+            results = await asyncio.gather(
+                *(self._async_fetch_window(semaphore, *window) for window in windows)
+            )
+            # Windows are ordered from the newest to the oldest
+            for result in results:
+                if result is None:
+                    return None
+                if result:
+                    empty_windows = 0
+                    records.merge(result)
+                else:
+                    empty_windows += 1
+                    if empty_windows >= BACKFILL_EMPTY_WINDOWS:
+                        break
+
+        return records
+
+    async def _async_fetch_range(
+        self, start: datetime, end: datetime
+    ) -> HourlySeries | None:
+        """Fetch all hours between start and end in concurrent windows."""
+        semaphore = asyncio.Semaphore(BACKFILL_CONCURRENCY)
+        windows = []
+        while start < end:
+            windows.append((start, min(start + BACKFILL_WINDOW, end)))
+            start += BACKFILL_WINDOW
+
+        records = HourlySeries()
+        for result in await asyncio.gather(
+            *(self._async_fetch_window(semaphore, *window) for window in windows)
+        ):
+            if result is None:
+                return None
+            records.merge(result)
+        return records
+
+    async def _async_fetch_window(
+        self, semaphore: asyncio.Semaphore, start: datetime, end: datetime
+    ) -> dict[datetime, dict[str, float]] | None:
+        """Fetch one backfill window."""
+        async with semaphore:
+            series = await self.api.async_get_hourly_series(start, end, self.device)
+        if series is None:
+            return None
+        return dict(series.items_between(start, end))
+
+    def _import(self, records: HourlyRecords, until: datetime) -> None:
+        """Add the hours between the last imported hour and until."""
+        start = self.imported_until
+        hours = sorted(
+            hour
+            for hour in records
+            if hour < until and (start is None or hour >= start)
+        )
+        if not hours:
+            return
+
+        statistics: dict[str, list[StatisticData]] = {
+            measure: [] for measure in HOURLY_MEASURES
+        }
+        for hour in hours:
+            for measure in HOURLY_MEASURES:
+                # A measure may be imported further than the other one, its
+                # hours must not be added to the running sum twice
+                imported = self._imported[measure]
+                if imported is not None and hour < imported:
+                    continue
+                if (value := records[hour].get(measure)) is None:
+                    continue
+                self._sums[measure] += value
+                statistics[measure].append(
+                    StatisticData(start=hour, state=value, sum=self._sums[measure])
+                )
+
+        for measure, rows in statistics.items():
+            if not rows:
+                continue
+            suffix_name = STATISTICS[measure][1]
+            metadata = StatisticMetaData(
+                mean_type=StatisticMeanType.NONE,
+                has_sum=True,
+                name=f"Obi EnergyTracker {self.device.label} {suffix_name.lower()}",
+                source=DOMAIN,
+                statistic_id=self.statistic_ids[measure],
+                unit_class=EnergyConverter.UNIT_CLASS,
+                unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+            )
+            async_add_external_statistics(self.hass, metadata, rows)
+
+        for measure, imported in self._imported.items():
+            if imported is None or imported <= hours[-1]:
+                self._imported[measure] = hours[-1] + ONE_HOUR
+        _LOGGER.debug(
+            "Imported %d hours of statistics for device %s up to %s",
+            len(hours),
+            self.device_id,
+            self.imported_until,
+        )
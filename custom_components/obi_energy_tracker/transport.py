@@ -0,0 +1,172 @@
+"""HTTP transport shared by everything talking to the OBI backends.
+
+The config flow, the API clients of all config entries and the connectivity
+probe send their requests through one client session owned by the
+integration. Its connector keeps the connections to the login and energy
+tracking hosts alive between requests, caches DNS lookups and limits the
+connections per host, so polling reuses connections instead of paying for
+a TCP and TLS handshake on every request.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import (
+    ClientSession,
+    TCPConnector,
+    TraceConfig,
+    TraceConnectionCreateEndParams,
+    TraceConnectionReuseconnParams,
+    TraceDnsCacheHitParams,
+    TraceDnsCacheMissParams,
+)
+from aiohttp.hdrs import ACCEPT_ENCODING, USER_AGENT
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+from homeassistant.util import ssl as ssl_util
+from homeassistant.util.hass_dict import HassKey
+
+from .api import REQUEST_TIMEOUT
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Connections to all hosts and to a single host; a config entry uses at
+# most max_connections of them at once
+TRANSPORT_LIMIT = 20
+TRANSPORT_LIMIT_PER_HOST = 10
+# Seconds a resolved address is reused
+DNS_CACHE_TTL = 300
+# Seconds an idle connection is kept open for the next request
+KEEPALIVE_TIMEOUT = 60.0
+
+
+@dataclass(slots=True)
+class TransportMetrics:
+    """Connection and DNS cache counters of the transport."""
+
+    connections_created: int = 0
+    connections_reused: int = 0
+    dns_cache_hits: int = 0
+    dns_cache_misses: int = 0
+
+    def trace_config(self) -> TraceConfig:
+        """Return a trace config counting into these metrics."""
+
+        async def on_connection_create_end(
+            session: ClientSession,
+            context: SimpleNamespace,
+            params: TraceConnectionCreateEndParams,
+        ) -> None:
+            self.connections_created += 1
+
+        async def on_connection_reuseconn(
+            session: ClientSession,
+            context: SimpleNamespace,
+            params: TraceConnectionReuseconnParams,
+        ) -> None:
+            self.connections_reused += 1
+
+        async def on_dns_cache_hit(
+            session: ClientSession,
+            context: SimpleNamespace,
+            params: TraceDnsCacheHitParams,
+        ) -> None:
+            self.dns_cache_hits += 1
+
+        async def on_dns_cache_miss(
+            session: ClientSession,
+            context: SimpleNamespace,
+            params: TraceDnsCacheMissParams,
+        ) -> None:
+            self.dns_cache_misses += 1
+
+        trace_config = TraceConfig()
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace_config
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        requests = self.connections_created + self.connections_reused
+        return {
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": round(self.connections_reused / requests, 3)
+            if requests
+            else None,
+            "dns_cache_hits": self.dns_cache_hits,
+            "dns_cache_misses": self.dns_cache_misses,
+        }
+
+
+class ObiTransport:
+    """Client session with a connector tuned for the OBI backends."""
+
+    def __init__(
+        self,
+        limit: int = TRANSPORT_LIMIT,
+        limit_per_host: int = TRANSPORT_LIMIT_PER_HOST,
+    ) -> None:
+        """Create the session; must be called from the event loop."""
+        self.metrics = TransportMetrics()
+        self.connector = TCPConnector(
+            limit=limit,
+            limit_per_host=limit_per_host,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+            ssl=ssl_util.get_default_context(),
+        )
+        self.session = ClientSession(
+            connector=self.connector,
+            timeout=REQUEST_TIMEOUT,
+            headers={USER_AGENT: SERVER_SOFTWARE, ACCEPT_ENCODING: "gzip, deflate"},
+            auto_decompress=True,
+            trace_configs=[self.metrics.trace_config()],
+        )
+
+    async def async_close(self) -> None:
+        """Close the session and all its connections."""
+        await self.session.close()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the transport settings and metrics for diagnostics."""
+        return {
+            "limit": self.connector.limit,
+            "limit_per_host": self.connector.limit_per_host,
+            "dns_cache_ttl": DNS_CACHE_TTL,
+            "keepalive_timeout": KEEPALIVE_TIMEOUT,
+            **self.metrics.as_dict(),
+        }
+
+
+DATA_TRANSPORT: HassKey[ObiTransport] = HassKey(f"{DOMAIN}_transport")
+
+
+@callback
+def async_get_transport(hass: HomeAssistant) -> ObiTransport:
+    """Return the transport of the integration, creating it on first use.
+
+    It lives until Home Assistant closes, reloading config entries keeps the
+    connections that are already open.
+    """
+    if (transport := hass.data.get(DATA_TRANSPORT)) is not None:
+        return transport
+
+    transport = hass.data[DATA_TRANSPORT] = ObiTransport()
+
+    async def _async_close(event: Event) -> None:
+        hass.data.pop(DATA_TRANSPORT, None)
+        await transport.async_close()
+        _LOGGER.debug("Closed the transport: %s", transport.metrics.as_dict())
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close)
+    return transport
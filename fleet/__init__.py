@@ -0,0 +1,8 @@
+"""Headless poller for many Obi EnergyTracker accounts.
+
+Polls the meter readings and hourly history of a list of accounts with the
+API client of the integration, without Home Assistant running, and writes
+them to a local file:
+
+    python -m fleet accounts.json --sink fleet.sqlite
+"""
@@ -0,0 +1,144 @@
+"""Command line entry point of the fleet poller.
+
+    python -m fleet accounts.json --sink fleet.sqlite --rate 20 --account-rate 2
+
+accounts.json holds a list of objects with email, password and optionally
+country. The sink is chosen by its suffix: .sqlite, .sqlite3 or .db for a
+SQLite database, .jsonl or .ndjson for an append-only JSON lines file. With
+--once every account is polled a single time and the throughput is printed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import timedelta
+import json
+import logging
+from pathlib import Path
+import time
+
+from custom_components.obi_energy_tracker.const import DEFAULT_MAX_CONNECTIONS
+from custom_components.obi_energy_tracker.transport import TRANSPORT_LIMIT, ObiTransport
+
+from .accounts import load_accounts
+from .poller import (
+    DEFAULT_ACCOUNT_RATE,
+    DEFAULT_HISTORY,
+    DEFAULT_HOURLY_INTERVAL,
+    DEFAULT_METER_INTERVAL,
+    DEFAULT_RATE,
+    FleetPoller,
+)
+from .sinks import open_sink
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_main(args: argparse.Namespace) -> None:
+    """Poll the accounts until interrupted, or once with --once."""
+    accounts = load_accounts(args.accounts)
+    sink = open_sink(args.sink)
+    transport = ObiTransport(limit=args.connections, limit_per_host=args.connections)
+    poller = FleetPoller(
+        accounts,
+        sink,
+        transport,
+        rate=args.rate,
+        account_rate=args.account_rate,
+        account_connections=args.account_connections,
+        history=timedelta(hours=args.history_hours),
+        meter_interval=timedelta(seconds=args.meter_interval),
+        hourly_interval=timedelta(seconds=args.hourly_interval),
+    )
+    _LOGGER.info("Polling %d accounts into %s", len(accounts), args.sink)
+    try:
+        if args.once:
+            start = time.monotonic()
+            polled = await poller.async_poll_once()
+            elapsed = time.monotonic() - start
+            _LOGGER.info(
+                "Polled %d of %d accounts in %.1fs, %.0f accounts per minute",
+                polled,
+                len(accounts),
+                elapsed,
+                len(accounts) / elapsed * 60 if elapsed else 0,
+            )
+        else:
+            await poller.async_run()
+    finally:
+        await sink.async_close()
+        await transport.async_close()
+        print(json.dumps(poller.as_dict(), indent=2))  # noqa: T201
+
+
+def main() -> None:
+    """Parse arguments and run the poller."""
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("accounts", type=Path, help="JSON file listing the accounts")
+    parser.add_argument(
+        "--sink", type=Path, required=True, help="SQLite or JSON lines file"
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=DEFAULT_RATE,
+        help="requests per second of all accounts, 0 for no limit",
+    )
+    parser.add_argument(
+        "--account-rate",
+        type=float,
+        default=DEFAULT_ACCOUNT_RATE,
+        help="requests per second of a single account, 0 for no limit",
+    )
+    parser.add_argument(
+        "--connections",
+        type=int,
+        default=TRANSPORT_LIMIT,
+        help="connections of the shared pool",
+    )
+    parser.add_argument(
+        "--account-connections",
+        type=int,
+        default=DEFAULT_MAX_CONNECTIONS,
+        help="concurrent requests of a single account",
+    )
+    parser.add_argument(
+        "--history-hours",
+        type=int,
+        default=int(DEFAULT_HISTORY.total_seconds() // 3600),
+        help="hours of history fetched on the first poll of a device",
+    )
+    parser.add_argument(
+        "--meter-interval",
+        type=float,
+        default=DEFAULT_METER_INTERVAL.total_seconds(),
+        help="seconds between two polls of the meter readings",
+    )
+    parser.add_argument(
+        "--hourly-interval",
+        type=float,
+        default=DEFAULT_HOURLY_INTERVAL.total_seconds(),
+        help="seconds between two polls of the hourly history",
+    )
+    parser.add_argument("--once", action="store_true", help="poll every account once")
+    parser.add_argument("--verbose", action="store_true", help="log debug messages")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    try:
+        asyncio.run(async_main(args))
+    except KeyboardInterrupt:
+        pass
+    except (OSError, TypeError, ValueError) as err:
+        parser.error(str(err))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Accounts polled by the fleet poller."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+from pathlib import Path
+from typing import Any
+
+from custom_components.obi_energy_tracker.const import DEFAULT_COUNTRY
+
+
+@dataclass(frozen=True, slots=True)
+class FleetAccount:
+    """Credentials of an OBI account."""
+
+    email: str
+    password: str
+    country: str = DEFAULT_COUNTRY
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> FleetAccount:
+        """Create an account from an entry of the accounts file."""
+        return cls(
+            email=data["email"],
+            password=data["password"],
+            country=data.get("country", DEFAULT_COUNTRY),
+        )
+
+
+def load_accounts(path: Path) -> list[FleetAccount]:
+    """Load the accounts from a JSON file.
+
+    The file holds a list of objects with email, password and optionally
+    country; an account listed twice is polled once.
+    """
+    entries = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(entries, list):
+        raise TypeError(f"{path} must hold a list of accounts")
+
+    accounts: dict[tuple[str, str], FleetAccount] = {}
+    for index, entry in enumerate(entries):
+        try:
+            account = FleetAccount.from_dict(entry)
+        except (KeyError, TypeError) as err:
+            raise ValueError(f"Invalid account #{index + 1} in {path}: {err}") from err
+        accounts.setdefault((account.email.casefold(), account.country), account)
+    return list(accounts.values())
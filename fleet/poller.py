@@ -0,0 +1,245 @@
+"""Polling of all accounts of the fleet."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+import random
+import time
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.obi_energy_tracker.api import ObiEnergyTrackerAPI
+from custom_components.obi_energy_tracker.const import (
+    DEFAULT_MAX_CONNECTIONS,
+    HOURLY_FINALIZATION_DELAY,
+)
+from custom_components.obi_energy_tracker.models import (
+    HourlySeries,
+    ObiDevice,
+    parse_meter_series,
+)
+from custom_components.obi_energy_tracker.transport import ObiTransport
+
+from .accounts import FleetAccount
+from .ratelimit import RateLimiter
+from .sinks import RecordSink, hourly_rows, meter_rows
+
+_LOGGER = logging.getLogger(__name__)
+
+# Requests per second of all accounts together and of a single account
+DEFAULT_RATE = 20.0
+DEFAULT_ACCOUNT_RATE = 2.0
+DEFAULT_METER_INTERVAL = timedelta(minutes=1)
+DEFAULT_HOURLY_INTERVAL = timedelta(hours=1)
+# Hours fetched on the first poll of a device
+DEFAULT_HISTORY = timedelta(days=1)
+
+
+@dataclass(slots=True)
+class _DeviceState:
+    """What was fetched of a device so far."""
+
+    device: ObiDevice
+    # Start of the hours requested with the next poll of the hourly history
+    hourly_from: datetime | None = None
+    # Time of the newest meter reading written
+    meter_until: datetime | None = None
+
+
+@dataclass(slots=True)
+class _Account:
+    """An account being polled, with its own client and rate limit."""
+
+    account: FleetAccount
+    api: ObiEnergyTrackerAPI
+    limiter: RateLimiter
+    devices: list[_DeviceState] | None = None
+    polls: int = 0
+    failures: int = 0
+
+
+class FleetPoller:
+    """Poll the meter readings and hourly history of many accounts.
+
+    Every account has its own API client, with its own token, circuit breaker
+    and response cache, and all clients send their requests through one
+    transport. Before every request a client waits for the rate limiter of
+    its account and then for the global one, so a single busy account cannot
+    use more than its share of the global rate.
+    """
+
+    def __init__(
+        self,
+        accounts: list[FleetAccount],
+        sink: RecordSink,
+        transport: ObiTransport,
+        *,
+        rate: float = DEFAULT_RATE,
+        account_rate: float = DEFAULT_ACCOUNT_RATE,
+        account_connections: int = DEFAULT_MAX_CONNECTIONS,
+        history: timedelta = DEFAULT_HISTORY,
+        meter_interval: timedelta = DEFAULT_METER_INTERVAL,
+        hourly_interval: timedelta = DEFAULT_HOURLY_INTERVAL,
+    ) -> None:
+        """Initialize the poller; rates are requests per second, 0 for no limit."""
+        self.sink = sink
+        self.transport = transport
+        # Bursts of up to a second's worth of requests
+        self.limiter = RateLimiter(rate, burst=round(rate))
+        self.history = history
+        self.meter_interval = meter_interval
+        self.hourly_interval = hourly_interval
+        self.accounts = [
+            self._create_account(account, account_rate, account_connections)
+            for account in accounts
+        ]
+
+    def _create_account(
+        self, account: FleetAccount, rate: float, connections: int
+    ) -> _Account:
+        """Return the client and limiter of an account."""
+        limiter = RateLimiter(rate, burst=connections)
+
+        async def _async_throttle() -> None:
+            await limiter.async_acquire()
+            await self.limiter.async_acquire()
+
+        api = ObiEnergyTrackerAPI(
+            self.transport.session,
+            email=account.email,
+            password=account.password,
+            country=account.country,
+            max_connections=connections,
+            throttle=_async_throttle,
+        )
+        return _Account(account, api, limiter)
+
+    async def async_poll_once(self) -> int:
+        """Poll the meter readings and hourly history of all accounts once.
+
+        Returns the number of accounts whose data could be fetched completely.
+        """
+        results = await asyncio.gather(
+            *(self._async_poll(account, hourly=True) for account in self.accounts)
+        )
+        return sum(results)
+
+    async def async_run(self) -> None:
+        """Poll all accounts on their intervals until cancelled."""
+        await asyncio.gather(
+            *(self._async_run_account(account) for account in self.accounts)
+        )
+
+    async def _async_run_account(self, account: _Account) -> None:
+        """Poll an account every meter interval, its history less often."""
+        interval = self.meter_interval.total_seconds()
+        # Spread the accounts over the interval instead of starting all at once
+        await asyncio.sleep(random.uniform(0, interval))
+        next_hourly = 0.0
+        while True:
+            started = time.monotonic()
+            hourly = started >= next_hourly
+            if hourly:
+                next_hourly = started + self.hourly_interval.total_seconds()
+            await self._async_poll(account, hourly)
+            await asyncio.sleep(max(0.0, started + interval - time.monotonic()))
+
+    async def _async_poll(self, account: _Account, hourly: bool) -> bool:
+        """Poll an account, returning True if all of its data was fetched."""
+        account.polls += 1
+        if not (success := await self._async_poll_devices(account, hourly)):
+            account.failures += 1
+        return success
+
+    async def _async_poll_devices(self, account: _Account, hourly: bool) -> bool:
+        """Log in if needed and fetch the data of all devices of an account."""
+        api = account.api
+        if not await api.async_ensure_token():
+            _LOGGER.warning("Failed to log in to %s", api.email)
+            return False
+        if account.devices is None:
+            if (devices := await api.async_get_devices()) is None:
+                _LOGGER.warning("Failed to get the devices of %s", api.email)
+                return False
+            _LOGGER.debug("Devices of %s: %s", api.email, devices)
+            account.devices = [_DeviceState(device) for device in devices]
+
+        results = await asyncio.gather(
+            *(
+                self._async_poll_device(account, state, hourly)
+                for state in account.devices
+            )
+        )
+        return all(results)
+
+    async def _async_poll_device(
+        self, account: _Account, state: _DeviceState, hourly: bool
+    ) -> bool:
+        """Fetch and write the new data of a device.
+
+        Returns True if all requested data could be fetched.
+        """
+        api = account.api
+        device = state.device
+        current_hour = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+        start = state.hourly_from or current_hour - self.history
+
+        series: HourlySeries | None = None
+        if hourly:
+            meter, series = await asyncio.gather(
+                api.async_get_meter_data(device),
+                api.async_get_hourly_series(
+                    start, current_hour + timedelta(hours=1), device
+                ),
+            )
+        else:
+            meter = await api.async_get_meter_data(device)
+
+        readings: list[tuple[datetime, float]] = []
+        if meter is not None:
+            # The meter window overlaps the last one, only new readings are kept
+            readings = parse_meter_series(meter).readings(
+                state.meter_until + timedelta(seconds=1) if state.meter_until else None
+            )
+            if readings:
+                state.meter_until = readings[-1][0]
+
+        if series is not None:
+            # Hours the backend may still revise are requested again next time
+            finalized_until = current_hour - HOURLY_FINALIZATION_DELAY
+            if (latest := series.latest_time) is not None:
+                finalized_until = min(finalized_until, latest + timedelta(hours=1))
+            else:
+                finalized_until = start
+            state.hourly_from = max(finalized_until, start)
+
+        email = account.account.email
+        await self.sink.async_write(
+            hourly_rows(email, device, series) if series is not None else [],
+            meter_rows(email, device, readings),
+        )
+        return meter is not None and (series is not None or not hourly)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the poller, without credentials."""
+        return {
+            "accounts": len(self.accounts),
+            "polls": sum(account.polls for account in self.accounts),
+            "failures": sum(account.failures for account in self.accounts),
+            "requests": sum(
+                endpoint.latency.count
+                for account in self.accounts
+                for endpoint in account.api.metrics.endpoints.values()
+            ),
+            "logins": sum(account.api.metrics.logins for account in self.accounts),
+            "rate_limit": self.limiter.as_dict(),
+            "account_rate_limit_waited_seconds": round(
+                sum(account.limiter.waited for account in self.accounts), 3
+            ),
+            "transport": self.transport.as_dict(),
+            "sink": self.sink.as_dict(),
+        }
@@ -0,0 +1,55 @@
+"""Rate limits of the requests sent by the fleet poller."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+
+class RateLimiter:
+    """Token bucket letting through rate requests per second on average.
+
+    Up to burst requests pass at once after a quiet period, further ones wait
+    for their turn in order of arrival. A rate of 0 means no limit.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """Initialize the limiter with a full bucket."""
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.acquired = 0
+        # Seconds requests spent waiting for the limiter
+        self.waited = 0.0
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last update."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def async_acquire(self) -> None:
+        """Wait until a request may be sent."""
+        self.acquired += 1
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                delay = (1 - self._tokens) / self.rate
+                self.waited += delay
+                await asyncio.sleep(delay)
+                self._refill()
+            self._tokens -= 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the settings and counters of the limiter."""
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "acquired": self.acquired,
+            "waited_seconds": round(self.waited, 3),
+        }
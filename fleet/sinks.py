@@ -0,0 +1,208 @@
+"""Local files the fleet poller writes the records to.
+
+Records are normalized to one row per hour or meter reading, naming the
+account, bridge and device, with UTC timestamps in ISO 8601. Files are
+written by a worker thread, one batch per device and poll, so the event
+loop keeps polling while a batch is written.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import json
+from pathlib import Path
+import sqlite3
+from typing import IO, Any
+
+from custom_components.obi_energy_tracker.models import (
+    HOURLY_MEASURES,
+    HourlySeries,
+    ObiDevice,
+)
+
+type Row = dict[str, Any]
+
+SQLITE_SUFFIXES = frozenset({".db", ".sqlite", ".sqlite3"})
+JSONL_SUFFIXES = frozenset({".jsonl", ".ndjson"})
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hourly (
+    account TEXT NOT NULL,
+    bridge_id TEXT NOT NULL,
+    device_id TEXT NOT NULL,
+    start TEXT NOT NULL,
+    energy REAL,
+    negative_energy REAL,
+    PRIMARY KEY (account, device_id, start)
+);
+CREATE TABLE IF NOT EXISTS meter (
+    account TEXT NOT NULL,
+    bridge_id TEXT NOT NULL,
+    device_id TEXT NOT NULL,
+    time TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (account, device_id, time)
+);
+"""
+
+
+def hourly_rows(account: str, device: ObiDevice, series: HourlySeries) -> list[Row]:
+    """Return the normalized rows of hourly records."""
+    return [
+        {
+            "account": account,
+            "bridge_id": device.bridge_id,
+            "device_id": device.device_id,
+            "start": start.isoformat(),
+            **{measure: measures.get(measure) for measure in HOURLY_MEASURES},
+        }
+        for start, measures in series.items()
+    ]
+
+
+def meter_rows(
+    account: str, device: ObiDevice, readings: list[tuple[datetime, float]]
+) -> list[Row]:
+    """Return the normalized rows of meter readings."""
+    return [
+        {
+            "account": account,
+            "bridge_id": device.bridge_id,
+            "device_id": device.device_id,
+            "time": timestamp.isoformat(),
+            "value": value,
+        }
+        for timestamp, value in readings
+    ]
+
+
+class RecordSink(ABC):
+    """Base of the sinks, writing batches of rows from a worker thread."""
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the sink, the file is opened by the first write."""
+        self.path = path
+        self.hourly_rows = 0
+        self.meter_rows = 0
+        # A single thread, the files are written in the order of the batches
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="obi_fleet_sink"
+        )
+
+    async def async_write(self, hourly: list[Row], meter: list[Row]) -> None:
+        """Write a batch of hourly and meter rows."""
+        if not hourly and not meter:
+            return
+        await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._write, hourly, meter
+        )
+        self.hourly_rows += len(hourly)
+        self.meter_rows += len(meter)
+
+    async def async_close(self) -> None:
+        """Write everything pending and close the file."""
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._close)
+        self._executor.shutdown()
+
+    @abstractmethod
+    def _write(self, hourly: list[Row], meter: list[Row]) -> None:
+        """Write a batch, called in the worker thread."""
+
+    @abstractmethod
+    def _close(self) -> None:
+        """Close the file, called in the worker thread."""
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return what was written."""
+        return {
+            "path": str(self.path),
+            "hourly_rows": self.hourly_rows,
+            "meter_rows": self.meter_rows,
+        }
+
+
+class JsonlSink(RecordSink):
+    """Append-only file with one JSON object per line.
+
+    Every row carries its type, "hourly" or "meter". Hours revised by the
+    backend are appended again, the last row of an hour is the valid one.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the sink."""
+        super().__init__(path)
+        self._file: IO[str] | None = None
+
+    def _write(self, hourly: list[Row], meter: list[Row]) -> None:
+        """Append a batch and flush it."""
+        if self._file is None:
+            self._file = self.path.open("a", encoding="utf-8")
+        self._file.writelines(
+            [json.dumps({"type": "hourly", **row}) + "\n" for row in hourly]
+            + [json.dumps({"type": "meter", **row}) + "\n" for row in meter]
+        )
+        self._file.flush()
+
+    def _close(self) -> None:
+        """Close the file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SqliteSink(RecordSink):
+    """SQLite database with a table of hourly records and one of meter readings.
+
+    Rows are keyed by account, device and time; hours revised by the backend
+    replace the earlier row.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the sink."""
+        super().__init__(path)
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the connection of the worker thread, creating the tables."""
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path)
+            # Readers of the database do not block the poller
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(SQLITE_SCHEMA)
+        return self._connection
+
+    def _write(self, hourly: list[Row], meter: list[Row]) -> None:
+        """Insert or replace a batch in one transaction."""
+        connection = self._connect()
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO hourly VALUES "
+                "(:account, :bridge_id, :device_id, :start, :energy, :negative_energy)",
+                hourly,
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO meter VALUES "
+                "(:account, :bridge_id, :device_id, :time, :value)",
+                meter,
+            )
+
+    def _close(self) -> None:
+        """Close the database."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def open_sink(path: Path) -> RecordSink:
+    """Return the sink for a path, chosen by its suffix."""
+    if path.suffix in SQLITE_SUFFIXES:
+        return SqliteSink(path)
+    if path.suffix in JSONL_SUFFIXES:
+        return JsonlSink(path)
+    raise ValueError(
+        f"Unknown sink {path.name}, use one of "
+        f"{', '.join(sorted(SQLITE_SUFFIXES | JSONL_SUFFIXES))}"
+    )